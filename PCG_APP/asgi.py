@@ -2,6 +2,10 @@
 ASGI config for PCG_APP project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The read-only JSON endpoints (events:api_events, groups:groups_api,
+notifications:unread_count) are async views; served from here, e.g.
+``uvicorn PCG_APP.asgi:application``, one process handles many of them
+concurrently. Compare deployments with ``manage.py bench_concurrency``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -14,3 +18,6 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'PCG_APP.settings')
 
 application = get_asgi_application()
+
+# Vercel serverless function entry point
+app = application
@@ -42,29 +42,34 @@ INSTALLED_APPS = [
     'core',
     'accounts',
     'announcements',
-    'chat',
-    'church_platform',
-    'dashboard',
-    'donations',
     'events',
     'groups',
     'notifications',
+    'search',
+    'chat',
+    'donations',
     'prayer',
     'sermons',
-    'volunteers',
+    # church_platform, dashboard and volunteers are empty placeholders; add
+    # each here once it has code, as every installed app is imported on each
+    # serverless cold start.
     # Third-party
     'widget_tweaks',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
+    'core.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise static files, async-capable for ASGI
+    'core.middleware.CompressionMiddleware',  # Brotli/gzip for dynamic responses
+    'core.middleware.QueryInspectorMiddleware',  # No-op unless QUERY_INSPECTOR is on
+    'core.middleware.ReplicaStickinessMiddleware',  # No-op unless a replica is configured
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ProfilerMiddleware',  # Keep last; no-op unless PROFILER_ENABLED
 ]
 
 ROOT_URLCONF = 'PCG_APP.urls'
@@ -101,6 +106,51 @@ DATABASES = {
     }
 }
 
+# Production profile for SQLite. WAL lets readers run alongside the single
+# writer, and BEGIN IMMEDIATE takes the write lock when a transaction starts,
+# so concurrent writers wait up to busy_timeout instead of failing with
+# "database is locked" when a read lock cannot be upgraded. Run
+# `manage.py sqlite_maintenance` periodically to checkpoint and optimize.
+SQLITE_PRODUCTION = config('SQLITE_PRODUCTION', default=False, cast=bool)
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int)
+SQLITE_CACHE_SIZE_KB = config('SQLITE_CACHE_SIZE_KB', default=64 * 1024, cast=int)
+SQLITE_PRODUCTION_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}',
+        f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}',
+        # Negative cache_size is in KiB rather than pages
+        f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}',
+        'PRAGMA temp_store=MEMORY',
+    ]),
+}
+if SQLITE_PRODUCTION and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = SQLITE_PRODUCTION_OPTIONS
+
+# Optional read replica (see core.routers). Views decorated with use_replica
+# read from it; for local testing point DB_REPLICA_NAME at a second SQLite
+# file and refresh it with `manage.py sync_replica`.
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+REPLICA_DATABASE = 'replica' if (DB_REPLICA_NAME or DB_REPLICA_HOST) else None
+if REPLICA_DATABASE:
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Seconds a client's reads stay on the primary after it writes
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+REPLICA_STICKY_COOKIE = 'pcg_primary'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -120,6 +170,11 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Sign in with username or email (single indexed lookup)
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.EmailOrUsernameBackend',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -142,16 +197,26 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
-# In production, serve static files directly with WhiteNoise finders
-if not DEBUG:
-    STATIC_ROOT = None  # Don't use STATIC_ROOT with finders
-    WHITENOISE_USE_FINDERS = True
-    WHITENOISE_AUTOREFRESH = True
-else:
-    STATIC_ROOT = BASE_DIR / 'staticfiles'
+# `collectstatic` (run by build.sh) writes content-hashed, gzip- and
+# Brotli-compressed copies plus a manifest here; WhiteNoise serves them
+# with year-long `immutable` caching. `manage.py check_static_assets`
+# fails the build if a template points at an asset missing from the manifest.
+STATIC_ROOT = config('STATIC_ROOT', default=BASE_DIR / 'staticfiles')
 
-# WhiteNoise configuration for production static file serving
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Tests render pages without running collectstatic; the runner swaps in plain static storage
+TEST_RUNNER = 'core.testing.TestRunner'
+
+# Cache lifetime for the few files served without a hash in their name
+WHITENOISE_MAX_AGE = config('WHITENOISE_MAX_AGE', default=3600, cast=int)
 
 # Media uploads (user-uploaded files like avatars)
 MEDIA_URL = config('MEDIA_URL', default='/media/')
@@ -162,6 +227,125 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache backend: "locmem" (default, per process), "file" (shared by processes
+# on one host), or "redis"/"memcached" via CACHE_URL. Without CACHE_URL the
+# external backends fall back to locmem so local runs need no extra service.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_BACKEND in ('redis', 'memcached') and not CACHE_URL:
+    CACHE_BACKEND = 'locmem'
+CACHES = {
+    'default': {
+        'BACKEND': {
+            'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+            'file': 'django.core.cache.backends.filebased.FileBasedCache',
+            'redis': 'django.core.cache.backends.redis.RedisCache',
+            'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        }[CACHE_BACKEND],
+        'LOCATION': {
+            'locmem': 'pcg-app',
+            'file': config('CACHE_DIR', default=str(BASE_DIR / '.cache')),
+        }.get(CACHE_BACKEND, CACHE_URL),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'KEY_PREFIX': 'pcg',
+        'OPTIONS': {'MAX_ENTRIES': 5000} if CACHE_BACKEND in ('locmem', 'file') else {},
+    }
+}
+# Record per-namespace hit/miss counters (see core.caching, `manage.py cache_stats`)
+CACHE_STATS = config('CACHE_STATS', default=True, cast=bool)
+
+# Brotli/gzip for dynamic responses (core.middleware.CompressionMiddleware).
+# On the groups list page Brotli quality 5 comes out ~7% smaller than gzip -9
+# for about the same CPU; quality 11 is ~40x slower for another ~10%.
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=512, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+# Count bytes in/out per encoding (`manage.py compression_stats`)
+COMPRESSION_STATS = config('COMPRESSION_STATS', default=True, cast=bool)
+
+# Full-page cache for anonymous visitors (seconds); see core.pagecache
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Sessions: "db" (default), "cached_db" (cache in front of the DB) or
+# "signed_cookies" (no server-side storage; suits serverless deployments)
+SESSION_STRATEGY = config('SESSION_STRATEGY', default='db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_STRATEGY]
+
+# Seconds to cache the signed-in user + profile snapshot (0 disables);
+# see accounts.middleware.CachedAuthenticationMiddleware. Off by default with
+# the per-process locmem cache: a save clears only the writing process's
+# copy, so other workers would keep a changed password, role or is_active
+# for the whole timeout.
+IDENTITY_CACHE_TIMEOUT = config(
+    'IDENTITY_CACHE_TIMEOUT', default=0 if CACHE_BACKEND == 'locmem' else 300, cast=int
+)
+
+# Per-request query inspector (core.middleware.QueryInspectorMiddleware).
+# Strict mode turns exceeded @query_budget declarations into errors; enable it
+# when running the test suite.
+QUERY_INSPECTOR = config('QUERY_INSPECTOR', default=DEBUG, cast=bool)
+QUERY_INSPECTOR_STRICT = config('QUERY_INSPECTOR_STRICT', default=False, cast=bool)
+QUERY_REPEAT_THRESHOLD = config('QUERY_REPEAT_THRESHOLD', default=5, cast=int)
+
+# On-demand cProfile of views (core.middleware.ProfilerMiddleware). Admins
+# trigger it with the header or query parameter; PROFILER_SAMPLE_RATE also
+# profiles a random fraction of all requests. Results: admin > Request profiles.
+PROFILER_ENABLED = config('PROFILER_ENABLED', default=False, cast=bool)
+PROFILER_HEADER = 'X-Profile'
+PROFILER_PARAM = '_profile'
+PROFILER_SAMPLE_RATE = config('PROFILER_SAMPLE_RATE', default=0.0, cast=float)
+PROFILER_KEEP = config('PROFILER_KEEP', default=50, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'pcg': {
+            'handlers': ['console'],
+            'level': config('LOG_LEVEL', default='INFO'),
+        },
+    },
+}
+
+# Group chat (chat app). Live delivery holds a request open, so these bound
+# it; on serverless hosts keep CHAT_STREAM_SECONDS under the function's
+# maximum duration. The browser reconnects and resumes where it left off.
+CHAT_LONG_POLL_SECONDS = config('CHAT_LONG_POLL_SECONDS', default=25, cast=int)
+CHAT_HEARTBEAT_SECONDS = config('CHAT_HEARTBEAT_SECONDS', default=15, cast=int)
+CHAT_STREAM_SECONDS = config('CHAT_STREAM_SECONDS', default=300, cast=int)
+
+# Shown before amounts on giving pages (donations app)
+DONATIONS_CURRENCY = config('DONATIONS_CURRENCY', default='GH₵')
+
+# Sermon media (sermons app). Uploads arrive in chunks of at most
+# SERMON_UPLOAD_CHUNK_SIZE bytes (keep it under the proxy's body limit, e.g.
+# nginx client_max_body_size) and are assembled in SERMON_UPLOAD_DIR, which
+# must persist between requests. SERMON_MEDIA_OFFLOAD hands playback to the
+# web server: "x-accel" (nginx; map SERMON_ACCEL_PREFIX to MEDIA_ROOT as an
+# internal location) or "x-sendfile" (Apache/lighttpd); blank serves it here.
+SERMON_UPLOAD_DIR = config('SERMON_UPLOAD_DIR', default=str(BASE_DIR / 'media_uploads'))
+SERMON_UPLOAD_CHUNK_SIZE = config('SERMON_UPLOAD_CHUNK_SIZE', default=4 * 1024 * 1024, cast=int)
+SERMON_UPLOAD_MAX_SIZE = config('SERMON_UPLOAD_MAX_SIZE', default=4 * 1024 ** 3, cast=int)
+SERMON_MEDIA_OFFLOAD = config('SERMON_MEDIA_OFFLOAD', default='')
+SERMON_ACCEL_PREFIX = config('SERMON_ACCEL_PREFIX', default='/protected-media/')
+# Seconds shared caches may keep published media before revalidating
+SERMON_MEDIA_MAX_AGE = config('SERMON_MEDIA_MAX_AGE', default=300, cast=int)
+PODCAST_TITLE = config('PODCAST_TITLE', default='PCG - A.N.T Sermons')
+PODCAST_AUTHOR = config('PODCAST_AUTHOR', default='PCG - A.N.T')
+PODCAST_CACHE_SECONDS = config('PODCAST_CACHE_SECONDS', default=900, cast=int)
+
+# Cold-start budget for the WSGI entry point, checked by core.tests and
+# `manage.py profile_startup`
+COLD_START_BUDGET_MS = config('COLD_START_BUDGET_MS', default=1000, cast=int)
+
 # Auth redirects
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
@@ -26,6 +26,11 @@ urlpatterns = [
     path('groups/', include('groups.urls')),
     path('notifications/', include('notifications.urls')),
     path('events/', include('events.urls')),
+    path('search/', include('search.urls')),
+    path('chat/', include('chat.urls')),
+    path('donations/', include('donations.urls')),
+    path('prayer/', include('prayer.urls')),
+    path('sermons/', include('sermons.urls')),
 ]
 
 if settings.DEBUG:
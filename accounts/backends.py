@@ -0,0 +1,44 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """Authenticate with either a username or an email address.
+
+    The user is fetched with a single query that matches the username or the
+    indexed LOWER(email); an email match wins over a username match.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        lookup = Q(username=username)
+        if "@" in username:
+            lookup |= Q(email_lower=username.lower())
+        candidates = list(User._default_manager.annotate(email_lower=Lower("email")).filter(lookup))
+        if not candidates:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            User().set_password(password)
+            return None
+        candidates.sort(key=lambda u: u.username == username)
+        for user in candidates:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
+
+    def get_user(self, user_id):
+        # Load the profile alongside the user; every page renders it
+        try:
+            user = User._default_manager.select_related("profile").get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        return await sync_to_async(self.authenticate)(request, username=username, password=password, **kwargs)
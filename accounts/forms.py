@@ -1,12 +1,16 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.db import transaction
+from core.caching import bump
 from groups.models import Group
-from groups.utils import sync_user_role_groups
+from groups.utils import application_recipients, deferred_role_sync
 from django.urls import reverse
 from notifications.models import Notification
+from notifications.utils import notify_many
 from groups.models import GroupMembership, GroupApplication
 from .models import Profile
+from .utils import users_with_email
 
 
 class SignupForm(UserCreationForm):
@@ -39,59 +43,58 @@ class SignupForm(UserCreationForm):
         user.first_name = self.cleaned_data.get('first_name', '')
         user.last_name = self.cleaned_data.get('last_name', '')
         user.email = self.cleaned_data.get('email', '')
-        if commit:
+        if not commit:
+            return user
+
+        # One transaction; the User/Profile/GroupMembership signals all ask for a
+        # role sync, which deferred_role_sync collapses into a single sync at the end
+        with transaction.atomic(), deferred_role_sync():
             user.save()
+            self._save_profile(user)
+            self._apply_to_groups(user, list(self.cleaned_data.get('groups') or []))
+
+            # Always add default base membership to Members
+            members_group, _ = Group.objects.get_or_create(name="Members")
+            GroupMembership.objects.create(user=user, group=members_group)
 
-        # Ensure profile exists
+        return user
+
+    def _save_profile(self, user):
+        # The post_save signal on User has just inserted the profile and cached it
+        # on user.profile, so this is a single UPDATE
         profile = getattr(user, 'profile', None)
         if profile is None:
-            from .models import Profile
             profile, _ = Profile.objects.get_or_create(user=user)
-
-        # Assign profile fields
         profile.age = self.cleaned_data.get('age')
         profile.date_of_birth = self.cleaned_data.get('date_of_birth')
         profile.phone = self.cleaned_data.get('phone', '')
         avatar = self.cleaned_data.get('avatar')
         if avatar:
             profile.avatar = avatar
-        if commit:
-            profile.save()
+        profile.save()
 
+    def _apply_to_groups(self, user, selected_groups):
         # Instead of direct membership, create applications for selected groups
-        selected_groups = self.cleaned_data.get('groups')
-        if selected_groups:
-            for g in selected_groups:
-                app, created = GroupApplication.objects.get_or_create(
-                    user=user,
-                    group=g,
-                    status=GroupApplication.Status.PENDING,
-                    defaults={"message": ""},
-                )
-                if created:
-                    # Notify group leaders and Admins
-                    leader_ids = list(GroupMembership.objects.filter(group=g, is_leader=True).values_list("user_id", flat=True))
-                    admin_ids = list(GroupMembership.objects.filter(group__name="Admin").values_list("user_id", flat=True))
-                    recipients = set(leader_ids + admin_ids)
-                    for rid in recipients:
-                        Notification.objects.create(
-                            actor=user,
-                            recipient_id=rid,
-                            text=f"{user.get_username()} applied to join {g.name}",
-                            url=reverse('groups:group_applications', kwargs={'group_pk': g.pk}),
-                        )
-
-        # Always add default base membership to Members
-        members_group, _ = Group.objects.get_or_create(name="Members")
-        GroupMembership.objects.get_or_create(user=user, group=members_group)
-
-        # Sync Django auth groups to reflect domain memberships/roles
-        try:
-            sync_user_role_groups(user)
-        except Exception:
-            pass
-
-        return user
+        if not selected_groups:
+            return
+        GroupApplication.objects.bulk_create([
+            GroupApplication(user=user, group=g, status=GroupApplication.Status.PENDING, message="")
+            for g in selected_groups
+        ])
+        # Notify group leaders and Admins
+        recipients = application_recipients(g.pk for g in selected_groups)
+        # bulk_create sends no signals; invalidate cached group lists by hand
+        bump("groups")
+        notify_many([
+            Notification(
+                actor=user,
+                recipient_id=rid,
+                text=f"{user.get_username()} applied to join {g.name}",
+                url=reverse('groups:group_applications', kwargs={'group_pk': g.pk}),
+            )
+            for g in selected_groups
+            for rid in recipients[g.pk]
+        ])
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -103,7 +106,7 @@ class SignupForm(UserCreationForm):
 
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if email and User.objects.filter(email__iexact=email).exists():
+        if email and users_with_email(email).exists():
             raise forms.ValidationError("A user with this email already exists.")
         return email
 
@@ -141,7 +144,7 @@ class ProfileEditForm(forms.ModelForm):
         email = self.cleaned_data.get('email')
         if email and self.user:
             # Check if email exists for other users
-            if User.objects.filter(email__iexact=email).exclude(pk=self.user.pk).exists():
+            if users_with_email(email).exclude(pk=self.user.pk).exists():
                 raise forms.ValidationError("A user with this email already exists.")
         return email
     
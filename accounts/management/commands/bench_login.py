@@ -0,0 +1,87 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from accounts.backends import EmailOrUsernameBackend
+from accounts.utils import users_with_email
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def _percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={p50 * 1000:.3f}ms p95={p95 * 1000:.3f}ms"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark email login lookups against a large auth_user table. "
+        "Users are inserted inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--logins", type=int, default=500)
+        parser.add_argument(
+            "--real-hasher",
+            action="store_true",
+            help="Use the configured password hashers; by default MD5 is used so the lookup cost is visible.",
+        )
+
+    def handle(self, *args, **options):
+        n_users = options["users"]
+        n_logins = options["logins"]
+        hashers = None if options["real_hasher"] else FAST_HASHERS
+        with override_settings(**({"PASSWORD_HASHERS": hashers} if hashers else {})), transaction.atomic():
+            password = "bench-password"
+            hashed = make_password(password)
+            self.stdout.write(f"Inserting {n_users} users...")
+            User.objects.bulk_create(
+                (
+                    User(username=f"bench{i}", email=f"Bench.User{i}@Example.org", password=hashed)
+                    for i in range(n_users)
+                ),
+                batch_size=2000,
+            )
+            if connection.vendor in ("sqlite", "postgresql"):
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE auth_user")
+
+            emails = [f"bench.user{random.randrange(n_users)}@example.org" for _ in range(n_logins)]
+            backend = EmailOrUsernameBackend()
+
+            legacy, lookup, auth = [], [], []
+            for email in emails:
+                start = time.perf_counter()
+                User.objects.filter(email__iexact=email).first()
+                legacy.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                users_with_email(email).first()
+                lookup.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                user = backend.authenticate(None, username=email, password=password)
+                auth.append(time.perf_counter() - start)
+                if user is None:
+                    self.stderr.write(f"Login failed for {email}")
+
+            self.stdout.write(f"email__iexact lookup:     {_percentiles(legacy)}")
+            self.stdout.write(f"LOWER(email) lookup:      {_percentiles(lookup)}")
+            self.stdout.write(f"authenticate() by email:  {_percentiles(auth)}")
+
+            sql, params = users_with_email(emails[0]).query.sql_with_params()
+            explain = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+            with connection.cursor() as cursor:
+                cursor.execute(explain + sql, params)
+                for row in cursor.fetchall():
+                    self.stdout.write(f"plan: {row}")
+            transaction.set_rollback(True)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+from accounts.thumbnails import generate_avatar_thumbnails
+from accounts.utils import invalidate_identity
+
+
+class Command(BaseCommand):
+    help = "Generate missing or stale avatar thumbnails for every profile with an avatar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate even if thumbnails are up to date.")
+
+    def handle(self, *args, **options):
+        done = failed = 0
+        for profile in Profile.objects.exclude(avatar="").exclude(avatar=None).iterator():
+            if not options["force"] and profile.avatar_thumbnails.get("source") == profile.avatar.name:
+                continue
+            try:
+                thumbs = generate_avatar_thumbnails(profile)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"{profile.user_id}: {exc}")
+                continue
+            Profile.objects.filter(pk=profile.pk).update(avatar_thumbnails=thumbs)
+            invalidate_identity(profile.user_id)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated thumbnails for {done} profiles ({failed} failed)."))
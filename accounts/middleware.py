@@ -0,0 +1,85 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+from .utils import identity_cache_key
+
+
+def _load_user(request):
+    """Resolve request.user from the cache when possible, else via django.contrib.auth.
+
+    The cached object is the user with its profile already attached, so a warm
+    request needs no auth_user or accounts_profile query. The session auth hash
+    is still checked against the cached user, and saving a User or Profile
+    deletes the entry, so password changes log out other sessions as they do
+    without the cache. That only holds when every process shares the cache,
+    which is why IDENTITY_CACHE_TIMEOUT defaults to 0 with locmem.
+    """
+    try:
+        user_id = User._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    timeout = settings.IDENTITY_CACHE_TIMEOUT
+    if not timeout or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    key = identity_cache_key(user_id)
+    user = cache.get(key)
+    if user is not None:
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(session_hash, user.get_session_auth_hash()):
+            user.backend = backend_path
+            return user
+        # Stale or tampered session; let Django verify and flush it
+        return auth.get_user(request)
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        try:
+            user.profile
+        except Profile.DoesNotExist:
+            pass
+        cache.set(key, user, timeout)
+    return user
+
+
+def get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = _load_user(request)
+    return request._cached_user
+
+
+async def aget_cached_user(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await sync_to_async(_load_user)(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Drop-in for AuthenticationMiddleware that serves request.user from the cache.
+
+    Entries are invalidated by the User/Profile save and delete signals in
+    accounts.models.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+        request.auser = partial(aget_cached_user, request)
+
+    async def __acall__(self, request):
+        # process_request only installs lazy accessors, so skip the hop to the
+        # sync thread that MiddlewareMixin would make for it under ASGI
+        self.process_request(request)
+        return await self.get_response(request)
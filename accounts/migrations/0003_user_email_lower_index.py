@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_age_profile_date_of_birth'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        # auth.User belongs to contrib.auth, so the functional index is added with SQL
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS accounts_auth_user_email_lower_idx ON auth_user (LOWER(email))',
+            'DROP INDEX IF EXISTS accounts_auth_user_email_lower_idx',
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from .utils import invalidate_identity
+
 
 class Profile(models.Model):
 	class Role(models.TextChoices):
@@ -16,6 +18,8 @@ class Profile(models.Model):
 	age = models.PositiveSmallIntegerField(null=True, blank=True)
 	date_of_birth = models.DateField(null=True, blank=True)
 	avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+	# Thumbnail URLs keyed by size; see accounts.thumbnails.generate_avatar_thumbnails
+	avatar_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
@@ -40,3 +44,33 @@ def create_or_update_user_profile(sender, instance: User, created, **kwargs):
 	else:
 		# Ensure profile exists even if created before signal connected
 		Profile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Profile)
+def refresh_avatar_thumbnails(sender, instance: Profile, **kwargs):
+	source = instance.avatar.name if instance.avatar else ""
+	if (instance.avatar_thumbnails or {}).get("source", "") == source:
+		return
+	thumbs = {}
+	if source:
+		from .thumbnails import generate_avatar_thumbnails
+		try:
+			thumbs = generate_avatar_thumbnails(instance)
+		except (OSError, ValueError):
+			# Unreadable image or storage failure: remember the source so we don't retry on every save
+			thumbs = {"source": source}
+	# update() rather than save() so this handler is not re-entered
+	Profile.objects.filter(pk=instance.pk).update(avatar_thumbnails=thumbs)
+	instance.avatar_thumbnails = thumbs
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance: User, **kwargs):
+	invalidate_identity(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance: Profile, **kwargs):
+	invalidate_identity(instance.user_id)
@@ -0,0 +1,22 @@
+from django import template
+
+from accounts.thumbnails import AVATAR_THUMB_SIZES
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar_thumbnail(profile, size=64):
+    """Return {"webp": url|None, "fallback": url} for the smallest thumbnail >= size.
+
+    Falls back to the original upload until thumbnails exist; None without an avatar.
+    """
+    if profile is None or not profile.avatar:
+        return None
+    thumbs = profile.avatar_thumbnails or {}
+    if thumbs.get("source") == profile.avatar.name:
+        for edge in AVATAR_THUMB_SIZES:
+            entry = thumbs.get(str(edge))
+            if edge >= int(size) and entry:
+                return entry
+    return {"webp": None, "fallback": profile.avatar.url}
@@ -1,3 +1,131 @@
-from django.test import TestCase
+import io
+from pathlib import Path
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.testing import TemporaryMediaMixin
+from groups.models import Group, GroupApplication, GroupMembership
+from notifications.models import Notification
+from .forms import SignupForm
+from .templatetags.avatar_tags import avatar_thumbnail
+from .thumbnails import AVATAR_THUMB_SIZES
+from .utils import identity_cache_key, users_with_email
+
+
+@override_settings(IDENTITY_CACHE_TIMEOUT=300)
+class IdentityCacheTests(TestCase):
+	url = "/notifications/"
+
+	def setUp(self):
+		cache.clear()
+		self.user = User.objects.create_user("member", password="old-password")
+		self.client.force_login(self.user)
+		self.client.get(self.url)
+		self.assertIsNotNone(cache.get(identity_cache_key(self.user.pk)))
+
+	def test_password_change_rejects_existing_sessions(self):
+		self.user.set_password("new-password")
+		self.user.save()
+		self.assertRedirects(self.client.get(self.url), f"/accounts/login/?next={self.url}", fetch_redirect_response=False)
+
+	def test_deactivated_user_is_signed_out(self):
+		self.user.is_active = False
+		self.user.save()
+		self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class EmailAuthenticationTests(TestCase):
+	def setUp(self):
+		self.user = User.objects.create_user("grace", email="Grace@Example.com", password="pw")
+
+	def test_username_or_email_signs_in_with_one_query(self):
+		for login in ("grace", "grace@example.com", "GRACE@EXAMPLE.COM"):
+			with self.assertNumQueries(1):
+				self.assertEqual(authenticate(username=login, password="pw"), self.user)
+		self.assertIsNone(authenticate(username="grace@example.com", password="wrong"))
+
+	def test_email_match_wins_over_a_username_that_looks_like_an_email(self):
+		impostor = User.objects.create_user("grace@example.com", email="other@example.com", password="impostor")
+		self.assertEqual(authenticate(username="grace@example.com", password="pw"), self.user)
+		self.assertEqual(authenticate(username="grace@example.com", password="impostor"), impostor)
+
+	def test_duplicate_email_is_rejected_case_insensitively(self):
+		self.assertIn("email", SignupForm(data={"email": "GRACE@example.COM"}).errors)
+		self.assertEqual(list(users_with_email("grace@EXAMPLE.com")), [self.user])
+
+
+class SignupTests(TestCase):
+	def setUp(self):
+		self.choir = Group.objects.create(name="Choir")
+		self.leader = User.objects.create_user("leader", password="pw")
+		self.admin = User.objects.create_user("admin", password="pw")
+		GroupMembership.objects.create(user=self.leader, group=self.choir, is_leader=True)
+		GroupMembership.objects.create(user=self.admin, group=Group.objects.create(name="Admin"))
+		self.data = {
+			"username": "newcomer", "first_name": "Kofi", "last_name": "Mensah", "email": "kofi@example.com",
+			"phone": "0200000000", "age": 30, "date_of_birth": "1995-05-01", "groups": [self.choir.pk],
+			"password1": "a-long-Passphrase-1", "password2": "a-long-Passphrase-1",
+		}
+
+	def test_signup_applies_to_groups_and_notifies_leaders_and_admins(self):
+		form = SignupForm(data=self.data)
+		self.assertTrue(form.is_valid(), form.errors)
+		user = form.save()
+		self.assertEqual(user.profile.phone, "0200000000")
+		self.assertTrue(GroupApplication.objects.filter(user=user, group=self.choir).exists())
+		self.assertEqual(
+			set(Notification.objects.filter(actor=user).values_list("recipient__username", flat=True)),
+			{"leader", "admin"},
+		)
+		self.assertEqual(list(GroupMembership.objects.filter(user=user).values_list("group__name", flat=True)), ["Members"])
+		self.assertEqual(list(user.groups.values_list("name", flat=True)), ["Members"])
+
+	def test_a_failed_step_leaves_nothing_behind(self):
+		form = SignupForm(data=self.data)
+		self.assertTrue(form.is_valid(), form.errors)
+		with patch("accounts.forms.application_recipients", side_effect=RuntimeError), self.assertRaises(RuntimeError):
+			form.save()
+		self.assertFalse(User.objects.filter(username="newcomer").exists())
+		self.assertFalse(GroupApplication.objects.exists())
+
+
+class AvatarThumbnailTests(TemporaryMediaMixin, TestCase):
+	def setUp(self):
+		super().setUp()
+		self.profile = User.objects.create_user("member", password="pw").profile
+
+	def upload(self, mode="RGB"):
+		buf = io.BytesIO()
+		Image.new(mode, (400, 300), "red").save(buf, format="PNG")
+		self.profile.avatar = SimpleUploadedFile("me.png", buf.getvalue(), content_type="image/png")
+		self.profile.save()
+		self.profile.refresh_from_db()
+
+	def test_square_thumbnails_are_written_for_each_size(self):
+		self.upload()
+		thumbs = self.profile.avatar_thumbnails
+		self.assertEqual(thumbs["source"], self.profile.avatar.name)
+		for size in AVATAR_THUMB_SIZES:
+			self.assertTrue(thumbs[str(size)]["fallback"].endswith(".jpg"))
+			path = Path(settings.MEDIA_ROOT) / thumbs[str(size)]["webp"].removeprefix(settings.MEDIA_URL)
+			with Image.open(path) as img:
+				self.assertEqual((img.format, img.size), ("WEBP", (size, size)))
+
+	def test_transparent_avatars_fall_back_to_png(self):
+		self.upload("RGBA")
+		self.assertTrue(self.profile.avatar_thumbnails["64"]["fallback"].endswith(".png"))
+
+	def test_tag_picks_the_smallest_thumbnail_that_fits(self):
+		self.assertIsNone(avatar_thumbnail(self.profile))
+		self.upload()
+		thumbs = self.profile.avatar_thumbnails
+		self.assertEqual(avatar_thumbnail(self.profile, 40), thumbs["64"])
+		self.assertEqual(avatar_thumbnail(self.profile, 100), thumbs["256"])
+		self.assertEqual(avatar_thumbnail(self.profile, 512), {"webp": None, "fallback": self.profile.avatar.url})
@@ -0,0 +1,42 @@
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+
+# Square thumbnail edge lengths in pixels; templates ask for one of these
+AVATAR_THUMB_SIZES = (64, 256)
+
+
+def _save_image(storage, name: str, image, fmt: str, **params) -> str:
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, **params)
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(buf.getvalue()))
+
+
+def generate_avatar_thumbnails(profile) -> dict:
+    """Render square WebP thumbnails plus a JPEG/PNG fallback for every size.
+
+    Returns the mapping stored on `Profile.avatar_thumbnails`:
+    {"source": <avatar name>, "64": {"webp": url, "fallback": url}, ...}
+    """
+    # Pillow is only needed here; keep it out of module import time
+    from PIL import Image, ImageOps
+
+    avatar = profile.avatar
+    storage = avatar.storage
+    stem = posixpath.splitext(posixpath.basename(avatar.name))[0]
+    thumbs = {"source": avatar.name}
+    with avatar.open("rb"), Image.open(avatar) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        fallback_fmt, fallback_ext = ("PNG", "png") if has_alpha else ("JPEG", "jpg")
+        for size in AVATAR_THUMB_SIZES:
+            square = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+            base = f"avatars/thumbs/{profile.pk}/{stem}-{size}"
+            webp = _save_image(storage, f"{base}.webp", square, "WEBP", quality=80, method=6)
+            fallback = _save_image(storage, f"{base}.{fallback_ext}", square, fallback_fmt, optimize=True)
+            thumbs[str(size)] = {"webp": storage.url(webp), "fallback": storage.url(fallback)}
+    return thumbs
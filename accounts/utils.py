@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+
+def users_with_email(email: str):
+    """Users whose email matches case-insensitively.
+
+    Filters on LOWER(email) so the functional index from migration 0003 is
+    used; `email__iexact` compiles to LIKE/UPPER and scans auth_user instead.
+    """
+    return User.objects.annotate(email_lower=Lower("email")).filter(email_lower=(email or "").lower())
+
+
+def identity_cache_key(user_id) -> str:
+    return f"accounts:identity:{user_id}"
+
+
+def invalidate_identity(user_id) -> None:
+    """Drop the cached user + profile snapshot used by CachedAuthenticationMiddleware."""
+    cache.delete(identity_cache_key(user_id))
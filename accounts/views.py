@@ -2,7 +2,6 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.forms import AuthenticationForm
-from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from .forms import SignupForm, ProfileEditForm
 from .models import Profile
@@ -22,16 +21,8 @@ def signup_view(request):
 
 def login_view(request):
 	if request.method == 'POST':
-		# Support login via email or username by mapping email to username
-		data = request.POST.copy()
-		posted_username = data.get('username', '')
-		if '@' in posted_username:
-			try:
-				user_obj = User.objects.get(email__iexact=posted_username)
-				data['username'] = user_obj.username
-			except User.DoesNotExist:
-				pass
-		form = AuthenticationForm(request, data=data)
+		# Email or username; resolved in one query by accounts.backends.EmailOrUsernameBackend
+		form = AuthenticationForm(request, data=request.POST)
 		if form.is_valid():
 			user = form.get_user()
 			login(request, user)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from announcements.utils import rebuild_audience
+
+
+class Command(BaseCommand):
+    help = "Rebuild the announcement audience (inbox) table from current visibility and memberships."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_audience()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {total} audience rows."))
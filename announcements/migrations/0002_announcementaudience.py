@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_audience(apps, schema_editor):
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementAudience = apps.get_model('announcements', 'AnnouncementAudience')
+    GroupMembership = apps.get_model('groups', 'GroupMembership')
+    rows = []
+    for ann in Announcement.objects.exclude(visibility='PUBLIC').exclude(group_id=None):
+        members = GroupMembership.objects.filter(group_id=ann.group_id)
+        if ann.visibility == 'LEADER_ONLY':
+            members = members.filter(is_leader=True)
+        for user_id in members.values_list('user_id', flat=True):
+            rows.append(AnnouncementAudience(announcement_id=ann.pk, user_id=user_id, created_at=ann.created_at))
+    AnnouncementAudience.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0001_initial'),
+        ('groups', '0003_groupactivity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementAudience',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['visibility', '-created_at'], name='announcement_visibility_idx'),
+        ),
+        migrations.AddField(
+            model_name='announcementaudience',
+            name='announcement',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audience', to='announcements.announcement'),
+        ),
+        migrations.AddField(
+            model_name='announcementaudience',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='announcement_inbox', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='announcementaudience',
+            index=models.Index(fields=['user', '-created_at'], name='announcement_inbox_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='announcementaudience',
+            unique_together={('announcement', 'user')},
+        ),
+        migrations.RunPython(backfill_audience, migrations.RunPython.noop),
+    ]
@@ -42,6 +42,11 @@ class Announcement(models.Model):
 
 	objects = AnnouncementManager()
 
+	class Meta:
+		indexes = [
+			models.Index(fields=["visibility", "-created_at"], name="announcement_visibility_idx"),
+		]
+
 	def __str__(self) -> str:
 		return self.title
 
@@ -57,3 +62,24 @@ class Announcement(models.Model):
 				return GroupMembership.objects.filter(user=user, group_id=self.group_id, is_leader=True).exists()  # type: ignore[attr-defined]
 			return True
 		return False
+
+
+class AnnouncementAudience(models.Model):
+	"""Fan-out row: one per (announcement, user) for group and leader-only announcements.
+
+	Public announcements are not fanned out; they are served from the cached public feed.
+	`created_at` is copied from the announcement so a user's inbox is a single index scan.
+	"""
+
+	announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name="audience")
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="announcement_inbox")
+	created_at = models.DateTimeField()
+
+	class Meta:
+		unique_together = ("announcement", "user")
+		indexes = [
+			models.Index(fields=["user", "-created_at"], name="announcement_inbox_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.announcement_id} -> {self.user_id}"
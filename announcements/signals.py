@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from groups.models import GroupMembership
+from .models import Announcement
+from .utils import sync_announcement_audience, sync_membership_audience
+
+# The cached public feed is invalidated by the "announcements" cache
+# namespace (core.signals); only the fan-out rows are maintained here.
+
+
+@receiver(post_save, sender=Announcement)
+def fan_out_on_announcement_save(sender, instance: Announcement, **kwargs):
+    sync_announcement_audience(instance)
+
+
+@receiver(post_save, sender=GroupMembership)
+def fan_out_on_membership_save(sender, instance: GroupMembership, **kwargs):
+    sync_membership_audience(instance.user_id, instance.group_id)
+
+
+@receiver(post_delete, sender=GroupMembership)
+def fan_out_on_membership_delete(sender, instance: GroupMembership, **kwargs):
+    sync_membership_audience(instance.user_id, instance.group_id)
@@ -1,3 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from groups.models import Group, GroupMembership
+from .models import Announcement, AnnouncementAudience
+from .utils import feed_for, rebuild_audience
+
+
+class AudienceFanOutTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.choir = Group.objects.create(name="Choir")
+		self.member = User.objects.create_user("member", password="pw")
+		self.leader = User.objects.create_user("leader", password="pw")
+		self.outsider = User.objects.create_user("outsider", password="pw")
+		GroupMembership.objects.create(user=self.member, group=self.choir)
+		GroupMembership.objects.create(user=self.leader, group=self.choir, is_leader=True)
+
+	def post(self, title, visibility, group=None):
+		return Announcement.objects.create(title=title, body="...", visibility=visibility, group=group)
+
+	def titles(self, user):
+		return [a.title for a in feed_for(user)]
+
+	def test_feed_matches_visibility_rules(self):
+		self.post("Everyone", Announcement.Visibility.PUBLIC)
+		self.post("Choir", Announcement.Visibility.GROUP, self.choir)
+		self.post("Leaders", Announcement.Visibility.LEADER_ONLY, self.choir)
+		for user in (self.member, self.leader, self.outsider):
+			expected = set(Announcement.objects.visible_to(user).values_list("title", flat=True))
+			self.assertEqual(set(self.titles(user)), expected)
+		self.assertEqual(self.titles(self.outsider), ["Everyone"])
+		self.assertFalse(AnnouncementAudience.objects.filter(announcement__visibility=Announcement.Visibility.PUBLIC).exists())
+
+	def test_membership_changes_update_the_inbox(self):
+		self.post("Choir", Announcement.Visibility.GROUP, self.choir)
+		self.post("Leaders", Announcement.Visibility.LEADER_ONLY, self.choir)
+		GroupMembership.objects.create(user=self.outsider, group=self.choir)
+		self.assertEqual(self.titles(self.outsider), ["Choir"])
+
+		membership = GroupMembership.objects.get(user=self.member)
+		membership.is_leader = True
+		membership.save()
+		self.assertEqual(set(self.titles(self.member)), {"Choir", "Leaders"})
+
+		membership.delete()
+		self.assertEqual(self.titles(self.member), [])
+
+	def test_rebuild_recreates_the_rows(self):
+		self.post("Choir", Announcement.Visibility.GROUP, self.choir)
+		before = set(AnnouncementAudience.objects.values_list("announcement_id", "user_id"))
+		AnnouncementAudience.objects.all().delete()
+		self.assertEqual(rebuild_audience(), 2)
+		self.assertEqual(set(AnnouncementAudience.objects.values_list("announcement_id", "user_id")), before)
@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+
+from core.caching import bump, cached_queryset
+from groups.models import GroupMembership
+from .models import Announcement, AnnouncementAudience
+
+FEED_SIZE = 10
+PUBLIC_FEED_TIMEOUT = 300
+
+
+def _audience_user_ids(announcement: Announcement) -> list[int]:
+    if announcement.visibility == Announcement.Visibility.PUBLIC or not announcement.group_id:
+        return []
+    members = GroupMembership.objects.filter(group_id=announcement.group_id)
+    if announcement.visibility == Announcement.Visibility.LEADER_ONLY:
+        members = members.filter(is_leader=True)
+    return list(members.values_list("user_id", flat=True))
+
+
+def sync_announcement_audience(announcement: Announcement) -> None:
+    """Rewrite the fan-out rows for one announcement from its visibility and group."""
+    AnnouncementAudience.objects.filter(announcement=announcement).delete()
+    AnnouncementAudience.objects.bulk_create(
+        [
+            AnnouncementAudience(announcement=announcement, user_id=uid, created_at=announcement.created_at)
+            for uid in _audience_user_ids(announcement)
+        ],
+        batch_size=500,
+    )
+
+
+def sync_membership_audience(user_id: int, group_id: int) -> None:
+    """Re-derive a user's inbox rows for one group after their membership changed."""
+    AnnouncementAudience.objects.filter(user_id=user_id, announcement__group_id=group_id).delete()
+    membership = GroupMembership.objects.filter(user_id=user_id, group_id=group_id).first()
+    if membership is None:
+        return
+    visibilities = [Announcement.Visibility.GROUP]
+    if membership.is_leader:
+        visibilities.append(Announcement.Visibility.LEADER_ONLY)
+    rows = Announcement.objects.filter(group_id=group_id, visibility__in=visibilities).values_list("pk", "created_at")
+    AnnouncementAudience.objects.bulk_create(
+        [AnnouncementAudience(announcement_id=pk, user_id=user_id, created_at=created_at) for pk, created_at in rows],
+        batch_size=500,
+    )
+
+
+def rebuild_audience() -> int:
+    """Recreate every fan-out row from scratch; returns the number of rows written."""
+    AnnouncementAudience.objects.all().delete()
+    total = 0
+    for announcement in Announcement.objects.exclude(visibility=Announcement.Visibility.PUBLIC).iterator():
+        rows = [
+            AnnouncementAudience(announcement=announcement, user_id=uid, created_at=announcement.created_at)
+            for uid in _audience_user_ids(announcement)
+        ]
+        AnnouncementAudience.objects.bulk_create(rows, batch_size=500)
+        total += len(rows)
+    bump("announcements")
+    return total
+
+
+@cached_queryset("announcements", timeout=PUBLIC_FEED_TIMEOUT)
+def public_feed() -> list[Announcement]:
+    """Latest public announcements, shared by every visitor and cached."""
+    return (
+        Announcement.objects.filter(visibility=Announcement.Visibility.PUBLIC)
+        .select_related("author", "group")
+        .order_by("-created_at")[:FEED_SIZE]
+    )
+
+
+def feed_for(user: User) -> list[Announcement]:
+    """The latest announcements a user may see, newest first.
+
+    Same rules as `Announcement.objects.visible_to`, but members read their inbox
+    rows plus the cached public feed instead of OR-ing across memberships.
+    """
+    if not user.is_authenticated:
+        return public_feed()
+
+    profile = getattr(user, "profile", None)
+    if profile and profile.is_admin:
+        return list(Announcement.objects.select_related("author", "group").order_by("-created_at")[:FEED_SIZE])
+
+    inbox = [
+        row.announcement
+        for row in AnnouncementAudience.objects.filter(user=user)
+        .select_related("announcement__author", "announcement__group")
+        .order_by("-created_at")[:FEED_SIZE]
+    ]
+    merged = sorted(public_feed() + inbox, key=lambda a: a.created_at, reverse=True)
+    return merged[:FEED_SIZE]
@@ -1,6 +1,7 @@
 #!/bin/bash
 
 # Vercel build script for Django + Tailwind CSS project
+set -e
 
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
@@ -11,8 +12,11 @@ npm install
 echo "Building Tailwind CSS..."
 npm run tailwind:build
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+echo "Collecting static files (hashed + gzip/Brotli precompressed)..."
+python manage.py collectstatic --noinput --clear
+
+echo "Checking templates only reference hashed static assets..."
+python manage.py check_static_assets
 
 echo "Running database migrations..."
 python manage.py migrate --noinput
@@ -1,3 +1,20 @@
 from django.contrib import admin
+from .models import ChatMessage, ChatReadCursor
 
-# Register your models here.
+
+@admin.register(ChatMessage)
+class ChatMessageAdmin(admin.ModelAdmin):
+	list_display = ("group", "author", "body", "created_at")
+	list_filter = ("group",)
+	list_select_related = ("group", "author")
+	search_fields = ("body",)
+
+	def has_change_permission(self, request, obj=None):
+		# Append-only; moderators can still delete
+		return False
+
+
+@admin.register(ChatReadCursor)
+class ChatReadCursorAdmin(admin.ModelAdmin):
+	list_display = ("user", "group", "last_read_id", "updated_at")
+	list_select_related = ("user", "group")
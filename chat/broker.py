@@ -0,0 +1,72 @@
+"""In-process wake-ups for chat rooms.
+
+The broker carries no messages, only "room N changed". Listeners always
+read new rows from the database by id, so a wake-up that never arrives
+costs latency and nothing else. That happens when the post was handled by
+another process or serverless instance; the listener then finds the
+message at its next timeout (CHAT_LONG_POLL_SECONDS / CHAT_HEARTBEAT_SECONDS).
+
+Posting views are sync and may run in a worker thread, while listeners
+wait on an event loop, so waking goes through ``call_soon_threadsafe``.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Listener:
+	def __init__(self, loop):
+		self.loop = loop
+		self.future = loop.create_future()
+
+	def _wake(self):
+		if not self.future.done():
+			self.future.set_result(None)
+
+	async def wait(self, timeout: float) -> bool:
+		"""True if the room changed within ``timeout`` seconds."""
+		try:
+			await asyncio.wait_for(asyncio.shield(self.future), timeout)
+		except asyncio.TimeoutError:
+			return False
+		return True
+
+
+class RoomBroker:
+	def __init__(self):
+		self._listeners = defaultdict(set)
+		self._lock = threading.Lock()
+
+	@contextmanager
+	def listen(self, group_id: int):
+		"""Register before reading the database, so a post in between still wakes us."""
+		listener = Listener(asyncio.get_running_loop())
+		with self._lock:
+			self._listeners[group_id].add(listener)
+		try:
+			yield listener
+		finally:
+			with self._lock:
+				listeners = self._listeners.get(group_id)
+				if listeners is not None:
+					listeners.discard(listener)
+					if not listeners:
+						del self._listeners[group_id]
+
+	def publish(self, group_id: int) -> None:
+		with self._lock:
+			listeners = list(self._listeners.get(group_id, ()))
+		for listener in listeners:
+			try:
+				listener.loop.call_soon_threadsafe(listener._wake)
+			except RuntimeError:
+				# That request's event loop has already closed
+				pass
+
+	def listener_count(self) -> int:
+		with self._lock:
+			return sum(len(listeners) for listeners in self._listeners.values())
+
+
+broker = RoomBroker()
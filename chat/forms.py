@@ -0,0 +1,13 @@
+from django import forms
+
+from .models import ChatMessage
+
+
+class ChatMessageForm(forms.ModelForm):
+    class Meta:
+        model = ChatMessage
+        fields = ["body"]
+        widgets = {
+            "body": forms.Textarea(attrs={"rows": 2, "placeholder": "Write a message…"}),
+        }
+        labels = {"body": ""}
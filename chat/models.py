@@ -1,3 +1,44 @@
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+from groups.models import Group
+
+
+class ChatMessage(models.Model):
+	"""One message in a group's chat room.
+
+	Append-only: rows are inserted and never edited, so a message id doubles
+	as a cursor. History pages and unread counts are ranges over the
+	(group, id) index.
+	"""
+
+	group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="chat_messages")
+	author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="chat_messages")
+	body = models.TextField(max_length=2000)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		indexes = [models.Index(fields=["group", "id"], name="chat_message_group_id")]
+
+	def __str__(self) -> str:
+		return f"{self.author} in {self.group}: {self.body[:40]}"
+
+	def save(self, *args, **kwargs):
+		if not self._state.adding:
+			raise ValueError("Chat messages are append-only.")
+		super().save(*args, **kwargs)
+
+
+class ChatReadCursor(models.Model):
+	"""How far a member has read in a room: every message with a larger id is unread."""
+
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="chat_cursors")
+	group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="chat_cursors")
+	last_read_id = models.PositiveBigIntegerField(default=0)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=["user", "group"], name="chat_cursor_user_group")]
+
+	def __str__(self) -> str:
+		return f"{self.user} read {self.group} to #{self.last_read_id}"
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import asyncio
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from groups.models import Group, GroupMembership
+from .broker import RoomBroker, broker
+from .models import ChatMessage
+from .utils import advance_cursor, rooms_with_unread
+
+
+class ChatTests(TestCase):
+	def setUp(self):
+		self.group = Group.objects.create(name="Choir")
+		self.alice = User.objects.create_user("alice", password="pw")
+		self.bob = User.objects.create_user("bob", password="pw")
+		for user in (self.alice, self.bob):
+			GroupMembership.objects.create(user=user, group=self.group)
+		self.ids = [
+			ChatMessage.objects.create(group=self.group, author=self.alice, body=f"message {i}").pk
+			for i in range(60)
+		]
+
+	def test_unread_counts_follow_the_cursor(self):
+		self.assertEqual(rooms_with_unread(self.bob).get().unread, 60)
+		advance_cursor(self.bob.pk, self.group.pk, self.ids[49])
+		advance_cursor(self.bob.pk, self.group.pk, self.ids[10])  # Never moves back
+		self.assertEqual(rooms_with_unread(self.bob).get().unread, 10)
+
+	def test_history_is_keyset_paginated(self):
+		self.client.force_login(self.bob)
+		page = self.client.get(f"/chat/{self.group.pk}/history/").json()
+		self.assertEqual(page["messages"][0]["id"], self.ids[-1])
+		older = self.client.get(f"/chat/{self.group.pk}/history/", {"before": page["next_before"]}).json()
+		self.assertEqual([m["id"] for m in older["messages"]], self.ids[:10][::-1])
+		self.assertIsNone(older["next_before"])
+
+	def test_rooms_are_for_members_only(self):
+		outsider = User.objects.create_user("carol", password="pw")
+		self.client.force_login(outsider)
+		self.assertEqual(self.client.get(f"/chat/{self.group.pk}/").status_code, 404)
+		self.assertEqual(self.client.post(f"/chat/{self.group.pk}/post/", {"body": "hi"}).status_code, 404)
+
+	def test_posting_wakes_the_room_once_committed(self):
+		self.client.force_login(self.bob)
+		with patch.object(broker, "publish") as publish, self.captureOnCommitCallbacks(execute=True):
+			response = self.client.post(f"/chat/{self.group.pk}/post/", {"body": "hello"}, headers={"accept": "application/json"})
+			publish.assert_not_called()
+		self.assertEqual(response.status_code, 201)
+		publish.assert_called_once_with(self.group.pk)
+		self.assertEqual(ChatMessage.objects.get(pk=response.json()["id"]).author, self.bob)
+
+	def test_read_cursor_stops_at_the_newest_message(self):
+		self.client.force_login(self.bob)
+		response = self.client.post(f"/chat/{self.group.pk}/read/", {"last_id": self.ids[-1] + 1000})
+		self.assertEqual(response.json(), {"last_read_id": self.ids[-1]})
+		ChatMessage.objects.create(group=self.group, author=self.alice, body="later")
+		self.assertEqual(rooms_with_unread(self.bob).get().unread, 1)
+
+	@override_settings(CHAT_LONG_POLL_SECONDS=0)
+	def test_poll_returns_messages_after_the_cursor(self):
+		self.client.force_login(self.bob)
+		url = f"/chat/{self.group.pk}/poll/"
+		page = self.client.get(url, {"after": self.ids[-3]}).json()
+		self.assertEqual([m["id"] for m in page["messages"]], self.ids[-2:])
+		self.assertEqual(page["last_id"], self.ids[-1])
+		self.assertEqual(self.client.get(url, {"after": self.ids[-1]}).json(), {"messages": [], "last_id": self.ids[-1]})
+
+	@override_settings(QUERY_INSPECTOR=False, CHAT_LONG_POLL_SECONDS=5)
+	async def test_poll_wakes_when_a_message_is_posted(self):
+		await self.async_client.aforce_login(self.bob)
+		waiting = asyncio.ensure_future(self.async_client.get(f"/chat/{self.group.pk}/poll/", {"after": self.ids[-1]}))
+		while not broker.listener_count():
+			await asyncio.sleep(0.01)
+		message = await ChatMessage.objects.acreate(group=self.group, author=self.alice, body="hello")
+		broker.publish(self.group.pk)
+		response = await asyncio.wait_for(waiting, 2)
+		self.assertEqual([m["id"] for m in response.json()["messages"]], [message.pk])
+
+	def test_messages_are_append_only(self):
+		message = ChatMessage.objects.get(pk=self.ids[0])
+		message.body = "edited"
+		with self.assertRaises(ValueError):
+			message.save()
+
+
+class RoomBrokerTests(TestCase):
+	def test_publish_wakes_listeners_of_that_room_only(self):
+		broker = RoomBroker()
+
+		async def scenario():
+			with broker.listen(1) as same, broker.listen(2) as other:
+				asyncio.get_running_loop().call_later(0.05, broker.publish, 1)
+				return await same.wait(1), await other.wait(0.1)
+
+		self.assertEqual(asyncio.run(scenario()), (True, False))
+		self.assertEqual(broker.listener_count(), 0)
@@ -0,0 +1,15 @@
+from django.urls import path
+from . import views
+
+app_name = "chat"
+
+urlpatterns = [
+    path("", views.rooms, name="rooms"),
+    path("<int:group_pk>/", views.room, name="room"),
+    path("<int:group_pk>/post/", views.post_message, name="post"),
+    path("<int:group_pk>/read/", views.mark_read, name="mark_read"),
+    # Async JSON/SSE endpoints; live delivery wants ASGI (see chat.broker)
+    path("<int:group_pk>/history/", views.history, name="history"),
+    path("<int:group_pk>/poll/", views.poll, name="poll"),
+    path("<int:group_pk>/stream/", views.stream, name="stream"),
+]
@@ -0,0 +1,41 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from groups.models import GroupMembership
+from .models import ChatMessage, ChatReadCursor
+
+
+def advance_cursor(user_id: int, group_id: int, message_id: int) -> None:
+	"""Move a member's read cursor forward to ``message_id``; never backwards."""
+	updated = ChatReadCursor.objects.filter(
+		user_id=user_id, group_id=group_id, last_read_id__lt=message_id
+	).update(last_read_id=message_id, updated_at=timezone.now())
+	if not updated:
+		ChatReadCursor.objects.get_or_create(user_id=user_id, group_id=group_id, defaults={"last_read_id": message_id})
+
+
+def rooms_with_unread(user):
+	"""The user's memberships, each annotated with ``unread`` and ``last_message_id``.
+
+	One query: per room, the unread count is a range count on the
+	(group, id) index from the member's cursor onwards.
+	"""
+	cursor = ChatReadCursor.objects.filter(user=user, group=OuterRef(OuterRef("group"))).values("last_read_id")[:1]
+	unread = (
+		ChatMessage.objects.filter(group=OuterRef("group"), id__gt=Coalesce(Subquery(cursor), Value(0)))
+		.order_by()
+		.values("group")
+		.annotate(n=Count("id"))
+		.values("n")
+	)
+	last = ChatMessage.objects.filter(group=OuterRef("group")).order_by("-id").values("id")[:1]
+	return (
+		GroupMembership.objects.filter(user=user)
+		.select_related("group")
+		.annotate(
+			unread=Coalesce(Subquery(unread, output_field=IntegerField()), Value(0)),
+			last_message_id=Subquery(last),
+		)
+		.order_by("-last_message_id", "group__name")
+	)
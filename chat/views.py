@@ -1,3 +1,179 @@
-from django.shortcuts import render
+import asyncio
+import json
 
-# Create your views here.
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Max
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_POST
+
+from core.http import int_param
+from core.queries import query_budget
+from groups.models import Group, GroupMembership
+from .broker import broker
+from .forms import ChatMessageForm
+from .models import ChatMessage
+from .utils import advance_cursor, rooms_with_unread
+
+PAGE_SIZE = 50
+MESSAGE_FIELDS = ("id", "body", "created_at", "author_id", "author__username", "author__first_name", "author__last_name")
+
+
+def _serialise(row: dict) -> dict:
+	name = f"{row['author__first_name'] or ''} {row['author__last_name'] or ''}".strip()
+	return {
+		"id": row["id"],
+		"author_id": row["author_id"],
+		"author": name or row["author__username"] or "Former member",
+		"body": row["body"],
+		"created_at": row["created_at"].isoformat(),
+	}
+
+
+def _messages(group_id: int):
+	return ChatMessage.objects.filter(group_id=group_id).values(*MESSAGE_FIELDS)
+
+
+async def _messages_after(group_id: int, after: int) -> list[dict]:
+	qs = _messages(group_id).filter(id__gt=after).order_by("id")[:PAGE_SIZE]
+	return [_serialise(row) async for row in qs]
+
+
+def _room_or_404(user, group_pk: int) -> Group:
+	# Rooms are for members only; admins who are not members do not read them
+	membership = GroupMembership.objects.select_related("group").filter(user=user, group_id=group_pk).first()
+	if membership is None:
+		raise Http404()
+	return membership.group
+
+
+async def _aroom_or_404(request, group_pk: int):
+	user = await request.auser()
+	if not await GroupMembership.objects.filter(user_id=user.pk, group_id=group_pk).aexists():
+		raise Http404()
+	return user
+
+
+@query_budget(6)
+@login_required
+def rooms(request):
+	return render(request, "chat/rooms.html", {"rooms": rooms_with_unread(request.user)})
+
+
+@query_budget(10)
+@login_required
+def room(request, group_pk: int):
+	"""A room with its newest page of messages; later ones arrive over the stream."""
+	group = _room_or_404(request.user, group_pk)
+	latest = [_serialise(row) for row in _messages(group.pk).order_by("-id")[:PAGE_SIZE]]
+	latest.reverse()
+	if latest:
+		advance_cursor(request.user.pk, group.pk, latest[-1]["id"])
+	return render(request, "chat/room.html", {
+		"group": group,
+		"chat_messages": latest,
+		"has_older": len(latest) == PAGE_SIZE,
+		"last_id": latest[-1]["id"] if latest else 0,
+		"form": ChatMessageForm(),
+	})
+
+
+@require_POST
+@login_required
+def post_message(request, group_pk: int):
+	group = _room_or_404(request.user, group_pk)
+	form = ChatMessageForm(request.POST)
+	wants_json = request.headers.get("Accept", "").startswith("application/json")
+	if not form.is_valid():
+		if wants_json:
+			return JsonResponse({"errors": form.errors}, status=400)
+		return redirect("chat:room", group_pk=group.pk)
+	with transaction.atomic():
+		message = form.save(commit=False)
+		message.group = group
+		message.author = request.user
+		message.save()
+		# Your own messages are never unread
+		advance_cursor(request.user.pk, group.pk, message.pk)
+		transaction.on_commit(lambda: broker.publish(group.pk))
+	if wants_json:
+		return JsonResponse({"id": message.pk}, status=201)
+	return redirect("chat:room", group_pk=group.pk)
+
+
+@require_POST
+@login_required
+def mark_read(request, group_pk: int):
+	group = _room_or_404(request.user, group_pk)
+	last_id = int_param(request.POST.get("last_id"))
+	if last_id:
+		# Never past the room's newest message, or later posts would arrive already read
+		newest = ChatMessage.objects.filter(group_id=group.pk).aggregate(newest=Max("id"))["newest"]
+		last_id = min(last_id, newest or 0)
+	if last_id:
+		advance_cursor(request.user.pk, group.pk, last_id)
+	return JsonResponse({"last_read_id": last_id})
+
+
+@login_required
+async def history(request, group_pk: int):
+	"""Older messages, newest first, before the ``before`` id (keyset pagination)."""
+	await _aroom_or_404(request, group_pk)
+	qs = _messages(group_pk).order_by("-id")
+	before = int_param(request.GET.get("before"))
+	if before:
+		qs = qs.filter(id__lt=before)
+	rows = [_serialise(row) async for row in qs[:PAGE_SIZE]]
+	return JsonResponse({
+		"messages": rows,
+		"next_before": rows[-1]["id"] if len(rows) == PAGE_SIZE else None,
+	})
+
+
+@login_required
+async def poll(request, group_pk: int):
+	"""Long-poll: messages after ``after``, waiting up to CHAT_LONG_POLL_SECONDS for one."""
+	await _aroom_or_404(request, group_pk)
+	after = int_param(request.GET.get("after"))
+	with broker.listen(group_pk) as listener:
+		rows = await _messages_after(group_pk, after)
+		if not rows and await listener.wait(settings.CHAT_LONG_POLL_SECONDS):
+			rows = await _messages_after(group_pk, after)
+	return JsonResponse({"messages": rows, "last_id": rows[-1]["id"] if rows else after})
+
+
+async def _event_stream(group_id: int, after: int):
+	loop = asyncio.get_running_loop()
+	deadline = loop.time() + settings.CHAT_STREAM_SECONDS
+	# Browsers reconnect by themselves, resuming from the Last-Event-ID sent below
+	yield "retry: 2000\n\n"
+	while (remaining := deadline - loop.time()) > 0:
+		with broker.listen(group_id) as listener:
+			rows = await _messages_after(group_id, after)
+			if not rows:
+				if not await listener.wait(min(settings.CHAT_HEARTBEAT_SECONDS, remaining)):
+					# Keeps proxies from closing an idle connection
+					yield ": keep-alive\n\n"
+				continue
+		for row in rows:
+			after = row["id"]
+			yield f"id: {after}\nevent: message\ndata: {json.dumps(row)}\n\n"
+
+
+@login_required
+async def stream(request, group_pk: int):
+	"""Server-sent events for a room, ending after CHAT_STREAM_SECONDS."""
+	await _aroom_or_404(request, group_pk)
+	if not isinstance(request, ASGIRequest):
+		# A WSGI server would collect the whole stream before sending any of
+		# it. 204 tells EventSource not to reconnect; the page then long-polls.
+		return HttpResponse(status=204)
+	after = int_param(request.headers.get("Last-Event-ID") or request.GET.get("after"))
+	response = StreamingHttpResponse(_event_stream(group_pk, after), content_type="text/event-stream")
+	response["Cache-Control"] = "no-cache"
+	# Stop nginx-style proxies from buffering the stream
+	response["X-Accel-Buffering"] = "no"
+	return response
@@ -1,3 +1,59 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 
-# Register your models here.
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+	list_display = ("created_at", "method", "path", "view", "status_code", "duration_ms", "trigger")
+	list_filter = ("trigger", "method")
+	search_fields = ("path", "view")
+	fields = ("created_at", "method", "path", "view", "status_code", "duration_ms", "trigger", "top_functions_table", "stacks_download")
+	readonly_fields = fields
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
+
+	def get_urls(self):
+		return [
+			path(
+				"<int:pk>/stacks.txt",
+				self.admin_site.admin_view(self.download_stacks),
+				name="core_requestprofile_stacks",
+			),
+		] + super().get_urls()
+
+	def download_stacks(self, request, pk: int):
+		profile = get_object_or_404(RequestProfile, pk=pk)
+		# admin_view only checks is_staff; stacks expose code paths, so match the change page
+		if not self.has_view_permission(request, profile):
+			raise PermissionDenied
+		response = HttpResponse(profile.collapsed_stacks, content_type="text/plain; charset=utf-8")
+		response["Content-Disposition"] = f'attachment; filename="profile-{pk}.folded"'
+		return response
+
+	@admin.display(description="Top functions (by cumulative time)")
+	def top_functions_table(self, obj):
+		rows = format_html_join(
+			"",
+			"<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+			((r["cumtime_ms"], r["tottime_ms"], r["calls"], r["function"]) for r in obj.top_functions),
+		)
+		return format_html(
+			"<table><thead><tr><th>cumulative ms</th><th>own ms</th><th>calls</th><th>function</th></tr></thead>"
+			"<tbody>{}</tbody></table>",
+			rows,
+		)
+
+	@admin.display(description="Collapsed stacks")
+	def stacks_download(self, obj):
+		url = reverse("admin:core_requestprofile_stacks", args=[obj.pk])
+		return format_html('<a href="{}">Download</a> (flamegraph.pl / speedscope format)', url)
@@ -0,0 +1,213 @@
+"""Namespaced caching with generation-based invalidation.
+
+Every cache entry belongs to one or more namespaces (one per model family,
+see NAMESPACE_MODELS). A namespace has a generation counter stored in the
+cache itself, and the generation is part of every key written under it.
+``post_save``/``post_delete`` on any model of the family bump the counter
+(wired in core.signals), so all older entries become unreachable in every
+process that shares the cache backend without a wildcard delete; they simply
+age out.
+
+A namespace can also be scoped by a value such as a user id, so that one
+user's changes do not invalidate everyone else's entries.
+
+    @cached_queryset("groups")
+    def public_groups():
+        return Group.objects.filter(...)
+
+    @cached_queryset("notifications", scope=lambda user: user.pk)
+    def unread_for(user):
+        return user.notifications.filter(read=False)
+
+Hit/miss counters per namespace are kept in the cache when CACHE_STATS is on;
+see the ``cache_stats`` management command.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+NAMESPACE_MODELS = {
+    "accounts": ("auth.User", "accounts.Profile"),
+    "groups": ("groups.Group", "groups.GroupMembership", "groups.GroupApplication", "groups.GroupActivity"),
+    "events": ("events.Event", "events.EventImage"),
+    "announcements": ("announcements.Announcement",),
+    "notifications": ("notifications.Notification",),
+    "prayer": ("prayer.PrayerRequest",),
+    "sermons": ("sermons.Sermon",),
+}
+
+# Namespaces with no model family, bumped by hand (e.g. core.pagecache)
+EXTRA_NAMESPACES = ("pages",)
+
+# Which field scopes a model's rows, for namespaces that are cached per user
+SCOPE_FIELDS = {
+    "auth.User": "pk",
+    "accounts.Profile": "user_id",
+    "notifications.Notification": "recipient_id",
+    # Prayer wall pages are cached per visibility scope (prayer.utils.first_page)
+    "prayer.PrayerRequest": "scope",
+}
+
+_MISSING = object()
+
+
+def _generation_key(namespace: str, scope=None) -> str:
+    if scope is None:
+        return f"cachegen:{namespace}"
+    return f"cachegen:{namespace}:{scope}"
+
+
+def _stats_key(namespace: str, outcome: str) -> str:
+    return f"cachestats:{namespace}:{outcome}"
+
+
+def _normalise(namespaces) -> list[tuple]:
+    """Accept "groups" or a list of names and (name, scope) pairs."""
+    if isinstance(namespaces, str):
+        return [(namespaces, None)]
+    return [(ns, None) if isinstance(ns, str) else tuple(ns) for ns in namespaces]
+
+
+def generations(namespaces) -> list[int]:
+    """Current generation of each namespace, seeding missing counters in one round trip."""
+    pairs = _normalise(namespaces)
+    keys = [_generation_key(ns, scope) for ns, scope in pairs]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # Seed from the clock so an evicted counter never revives old entries
+        seed = time.time_ns() // 1000
+        for key in missing:
+            cache.add(key, seed, None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+async def agenerations(namespaces) -> list[int]:
+    """Async twin of ``generations`` for async views."""
+    pairs = _normalise(namespaces)
+    keys = [_generation_key(ns, scope) for ns, scope in pairs]
+    found = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        seed = time.time_ns() // 1000
+        for key in missing:
+            await cache.aadd(key, seed, None)
+        found.update(await cache.aget_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def bump(namespace: str, scope=None) -> None:
+    """Invalidate every entry cached under ``namespace`` (optionally one scope of it)."""
+    key = _generation_key(namespace, scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns() // 1000, None)
+
+
+def _format_key(pairs, gens, parts) -> str:
+    raw = ":".join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{pairs[0][0]}:{'.'.join(str(g) for g in gens)}:{digest}"
+
+
+def namespaced_key(namespaces, *parts) -> str:
+    """Build a cache key that changes whenever any of ``namespaces`` is bumped."""
+    pairs = _normalise(namespaces)
+    return _format_key(pairs, generations(pairs), parts)
+
+
+async def anamespaced_key(namespaces, *parts) -> str:
+    pairs = _normalise(namespaces)
+    return _format_key(pairs, await agenerations(pairs), parts)
+
+
+def record(namespace: str, hit: bool) -> None:
+    if not settings.CACHE_STATS:
+        return
+    key = _stats_key(namespace, "hits" if hit else "misses")
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+async def arecord(namespace: str, hit: bool) -> None:
+    if not settings.CACHE_STATS:
+        return
+    key = _stats_key(namespace, "hits" if hit else "misses")
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        await cache.aincr(key)
+
+
+def stats() -> dict[str, dict[str, int]]:
+    names = list(NAMESPACE_MODELS) + list(EXTRA_NAMESPACES)
+    keys = [_stats_key(ns, outcome) for ns in names for outcome in ("hits", "misses")]
+    values = cache.get_many(keys)
+    gens = generations(names)
+    return {
+        ns: {
+            "hits": values.get(_stats_key(ns, "hits"), 0),
+            "misses": values.get(_stats_key(ns, "misses"), 0),
+            "generation": gen,
+        }
+        for ns, gen in zip(names, gens)
+    }
+
+
+def reset_stats() -> None:
+    names = list(NAMESPACE_MODELS) + list(EXTRA_NAMESPACES)
+    cache.delete_many([_stats_key(ns, outcome) for ns in names for outcome in ("hits", "misses")])
+
+
+def get_or_set(namespaces, parts, builder, timeout=DEFAULT_TIMEOUT):
+    """Return the value cached under ``namespaces``/``parts``, building it on a miss."""
+    pairs = _normalise(namespaces)
+    key = namespaced_key(pairs, *parts)
+    value = cache.get(key, _MISSING)
+    hit = value is not _MISSING
+    record(pairs[0][0], hit)
+    if not hit:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
+
+
+def _memoize(namespace, timeout, scope, evaluate):
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            namespaces = [(namespace, None)]
+            if scope is not None:
+                namespaces.append((namespace, scope(*args, **kwargs)))
+            parts = (name, *(getattr(a, "pk", a) for a in args), *sorted(kwargs.items()))
+            return get_or_set(namespaces, parts, lambda: evaluate(func(*args, **kwargs)), timeout)
+
+        return wrapper
+
+    return decorator
+
+
+def cached_queryset(namespace: str, timeout=DEFAULT_TIMEOUT, scope=None):
+    """Cache the rows of the queryset a function returns, as a list.
+
+    Positional model instances contribute their pk to the key. ``scope`` maps
+    the call arguments to a sub-namespace (usually a user id).
+    """
+    return _memoize(namespace, timeout, scope, list)
+
+
+def cached_fragment(namespace: str, timeout=DEFAULT_TIMEOUT, scope=None):
+    """Cache the string (typically rendered HTML) a function returns."""
+    return _memoize(namespace, timeout, scope, str)
@@ -0,0 +1,189 @@
+"""Brotli/gzip encoding of dynamic responses, used by CompressionMiddleware.
+
+Encoders work incrementally, so streamed responses (CSV exports and the
+like) are compressed chunk by chunk as they are sent, never held in memory.
+The gzip encoder writes a random-length filename into the header, as
+Django's GZipMiddleware does, to blunt BREACH-style length probing; Django
+already masks CSRF tokens per response, which covers the Brotli side for
+the secret that matters most.
+
+Bytes in and out per encoding are counted in the cache (``manage.py
+compression_stats``) when COMPRESSION_STATS is on.
+"""
+import secrets
+from gzip import GzipFile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import StreamingBuffer
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is in requirements.txt
+    brotli = None
+
+# Random filename padding for gzip; the value GZipMiddleware uses
+MAX_RANDOM_BYTES = 100
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "image/svg+xml",
+)
+# Each event must reach the browser as soon as it is written
+UNBUFFERED_TYPES = ("text/event-stream",)
+
+STAT_FIELDS = ("responses", "bytes_in", "bytes_out")
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self):
+        self.buffer = StreamingBuffer()
+        self.file = GzipFile(
+            filename=b"a" * secrets.randbelow(MAX_RANDOM_BYTES),
+            mode="wb",
+            compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+            fileobj=self.buffer,
+            mtime=0,
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        self.file.write(data)
+        return self.buffer.read()
+
+    def finish(self) -> bytes:
+        self.file.close()
+        return self.buffer.read()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+
+# Preferred first when the client weighs them equally
+PREFERENCE = ("br", "gzip")
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The best encoding we support from an Accept-Encoding header, or None."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for name in PREFERENCE:
+        if name not in ENCODERS:
+            continue
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) and media_type not in UNBUFFERED_TYPES
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    encoder = ENCODERS[encoding]()
+    return encoder.compress(data) + encoder.finish()
+
+
+def compress_stream(chunks, encoding: str):
+    """Compress an iterable of byte chunks incrementally, counting the result when it ends."""
+    encoder = ENCODERS[encoding]()
+    size_in = size_out = 0
+    for chunk in chunks:
+        size_in += len(chunk)
+        data = encoder.compress(chunk)
+        if data:
+            size_out += len(data)
+            yield data
+    data = encoder.finish()
+    size_out += len(data)
+    yield data
+    record(encoding, size_in, size_out)
+
+
+async def acompress_stream(chunks, encoding: str):
+    """Async twin of ``compress_stream`` for async streaming responses."""
+    encoder = ENCODERS[encoding]()
+    size_in = size_out = 0
+    async for chunk in chunks:
+        size_in += len(chunk)
+        data = encoder.compress(chunk)
+        if data:
+            size_out += len(data)
+            yield data
+    data = encoder.finish()
+    size_out += len(data)
+    yield data
+    await arecord(encoding, size_in, size_out)
+
+
+def _stat_key(encoding: str, field: str) -> str:
+    return f"compressionstats:{encoding}:{field}"
+
+
+def record(encoding: str, size_in: int, size_out: int) -> None:
+    if not settings.COMPRESSION_STATS:
+        return
+    for field, delta in zip(STAT_FIELDS, (1, size_in, size_out)):
+        key = _stat_key(encoding, field)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key, delta)
+
+
+async def arecord(encoding: str, size_in: int, size_out: int) -> None:
+    if not settings.COMPRESSION_STATS:
+        return
+    for field, delta in zip(STAT_FIELDS, (1, size_in, size_out)):
+        key = _stat_key(encoding, field)
+        try:
+            await cache.aincr(key, delta)
+        except ValueError:
+            await cache.aadd(key, 0, None)
+            await cache.aincr(key, delta)
+
+
+def stats() -> dict[str, dict[str, int]]:
+    keys = [_stat_key(encoding, field) for encoding in PREFERENCE for field in STAT_FIELDS]
+    values = cache.get_many(keys)
+    return {
+        encoding: {field: values.get(_stat_key(encoding, field), 0) for field in STAT_FIELDS}
+        for encoding in PREFERENCE
+    }
+
+
+def reset_stats() -> None:
+    cache.delete_many([_stat_key(encoding, field) for encoding in PREFERENCE for field in STAT_FIELDS])
@@ -0,0 +1,85 @@
+"""Conditional GET for signed-in pages built from rows with ``updated_at``.
+
+``conditional_page`` gives a view an ETag computed from one aggregate query
+(latest ``updated_at`` and row count of the objects the page shows) plus
+what else the HTML depends on: the viewer and their role, the sidebar's
+per-user cache generations, and any related namespaces the caller lists. A
+browser revalidating an unchanged page gets a 304 without the view running.
+
+No Last-Modified is sent: the sidebar badge and membership-driven parts of
+the page change without any timestamp moving, so If-Modified-Since alone
+could not be answered correctly.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from .caching import generations
+
+SIDEBAR_NAMESPACES = ("accounts", "notifications")
+
+
+def _has_pending_messages(request) -> bool:
+    # A 304 would leave a flash message unshown until some later page. The
+    # default fallback storage keeps messages in this cookie, then the session.
+    if "messages" in request.COOKIES:
+        return True
+    session = getattr(request, "session", None)
+    return bool(session is not None and session.get("_messages"))
+
+
+def _viewer_scope(user) -> str:
+    # Only fields already loaded with the user (see accounts.middleware), so no query
+    profile = getattr(user, "profile", None)
+    role = getattr(profile, "role", "")
+    return f"{user.pk}:{int(user.is_staff)}:{int(user.is_superuser)}:{role}"
+
+
+def page_etag(request, rows, related=()) -> str:
+    version = rows.aggregate(latest=Max("updated_at"), count=Count("pk"))
+    user = request.user
+    pairs = [(ns, None) for ns in related] + [(ns, user.pk) for ns in SIDEBAR_NAMESPACES]
+    raw = ":".join(
+        str(part)
+        for part in (
+            request.get_full_path(),
+            version["latest"].isoformat() if version["latest"] else "-",
+            version["count"],
+            _viewer_scope(user),
+            ".".join(str(g) for g in generations(pairs)),
+        )
+    )
+    return '"' + hashlib.md5(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def conditional_page(rows, related=()):
+    """Answer If-None-Match for a signed-in GET from ``rows(request, *args, **kwargs)``.
+
+    ``rows`` returns the queryset of objects the page renders; ``related``
+    names cache namespaces (see core.caching) whose data the page also shows
+    without an ``updated_at`` of its own, e.g. group names or memberships.
+    Apply inside login_required so request.user is always a real user.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or _has_pending_messages(request):
+                return view_func(request, *args, **kwargs)
+            etag = page_etag(request, rows(request, *args, **kwargs), related)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                response["ETag"] = etag
+            # Per-viewer HTML: browsers keep it but must revalidate each time
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,16 @@
+"""Small request and response helpers shared by the app views."""
+
+
+class Echo:
+    """File-like object whose write() hands back the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def int_param(value, default: int = 0) -> int:
+    """A non-negative integer from a query or form value, or ``default`` when it is not a number."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,251 @@
+"""Streaming analysis of exported Vercel request logs.
+
+Exports are either one JSON array (the dashboard's "Export" button, as in
+logs_result.json) or one object per line (``vercel logs --json``). Records
+are decoded one at a time with ``JSONDecoder.raw_decode`` from a fixed-size
+read buffer, so memory stays flat however large the file is.
+
+Vercel writes two kinds of rows: one per request, carrying the status code
+and duration, and one per line the function printed (status and duration
+-1), tied to its request by ``requestId``. Latencies go into log-bucketed
+histograms, which keep percentiles within a few percent in constant space
+and can be merged, so the rolled-up history stays small.
+"""
+import gzip
+import json
+import math
+import re
+import sys
+from collections import Counter, OrderedDict
+
+from django.urls import Resolver404, resolve
+
+CHUNK_SIZE = 64 * 1024
+# Histogram buckets grow by 5%, which bounds the error of any percentile
+BUCKET_GROWTH = 1.05
+# requestIds remembered while matching printed lines to their request
+MAX_PENDING = 50_000
+
+COLD_START_RE = re.compile(r"INIT_START|INIT_REPORT|Init Duration", re.IGNORECASE)
+CRASH_RE = re.compile(r"process exited|Runtime exited|Task timed out|Traceback \(most recent call last\)")
+
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+_HEX_RE = re.compile(r"/[0-9a-f]{8,}(?=/|$)")
+
+_decoder = json.JSONDecoder()
+
+
+def open_export(path: str):
+    """Open a log export for reading as text; ``-`` is stdin and ``.gz`` files are decompressed."""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_records(fh, chunk_size: int = CHUNK_SIZE):
+    """Yield each JSON object from a text stream holding an array or JSON lines."""
+    buf = ""
+    pos = 0
+    eof = False
+    while True:
+        # Skip array brackets, separators and whitespace between records
+        while pos < len(buf) and buf[pos] in "[], \t\r\n":
+            pos += 1
+        if pos < len(buf):
+            try:
+                record, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                record = None
+            if record is not None:
+                yield record
+                pos = end
+                continue
+        elif eof:
+            return
+        # Need more input: keep only the undecoded tail
+        chunk = fh.read(chunk_size)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+
+class LatencyHistogram:
+    """Counts of durations in exponentially sized buckets."""
+
+    def __init__(self, buckets=None):
+        self.buckets = Counter(buckets or {})
+
+    def add(self, ms: float) -> None:
+        self.buckets[0 if ms < 1 else int(math.log(ms, BUCKET_GROWTH)) + 1] += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.buckets.update(other.buckets)
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets.values())
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        total = self.count
+        if not total:
+            return 0.0
+        target = math.ceil(total * fraction)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return round(BUCKET_GROWTH ** bucket, 1) if bucket else 1.0
+        return 0.0
+
+    def to_dict(self) -> dict[str, int]:
+        return {str(bucket): n for bucket, n in sorted(self.buckets.items())}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        return cls({int(bucket): n for bucket, n in data.items()})
+
+
+class RouteStats:
+    def __init__(self):
+        self.count = 0
+        self.statuses = Counter()
+        self.histogram = LatencyHistogram()
+        self.total_ms = 0.0
+        self.cold_starts = 0
+        self.crashes = 0
+        self.max_memory_mb = 0
+
+    def add(self, status: int, duration_ms: float, memory_mb: int) -> None:
+        self.count += 1
+        self.statuses[status] += 1
+        if duration_ms >= 0:
+            self.histogram.add(duration_ms)
+            self.total_ms += duration_ms
+        self.max_memory_mb = max(self.max_memory_mb, memory_mb)
+
+    @property
+    def errors(self) -> int:
+        return sum(n for status, n in self.statuses.items() if status >= 500)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "total_ms": round(self.total_ms, 1),
+            "p50_ms": self.histogram.percentile(0.50),
+            "p95_ms": self.histogram.percentile(0.95),
+            "p99_ms": self.histogram.percentile(0.99),
+            "cold_starts": self.cold_starts,
+            "crashes": self.crashes,
+            "max_memory_mb": self.max_memory_mb,
+            "histogram": self.histogram.to_dict(),
+        }
+
+
+def normalise_route(request_path: str) -> str:
+    """Map a logged path such as ``host/groups/12/`` to its URL pattern, e.g. ``/groups/<int:pk>/``."""
+    path = request_path.split("?", 1)[0]
+    if not path.startswith("/"):
+        # Vercel prefixes the host
+        path = "/" + path.split("/", 1)[1] if "/" in path else "/"
+    return _route_for(path)
+
+
+_route_cache: dict[str, str] = {}
+
+
+def _route_for(path: str) -> str:
+    route = _route_cache.get(path)
+    if route is None:
+        if path.startswith("/static/"):
+            route = "/static/*"
+        else:
+            try:
+                route = "/" + resolve(path).route
+            except Resolver404:
+                route = _HEX_RE.sub("/<hex>", _ID_RE.sub("/<id>", path))
+        if len(_route_cache) < MAX_PENDING:
+            _route_cache[path] = route
+    return route
+
+
+class LogSummary:
+    """Accumulates request rows and printed lines into per-route statistics."""
+
+    def __init__(self):
+        self.routes: dict[str, RouteStats] = {}
+        self.deployments = Counter()
+        self.first_ms = None
+        self.last_ms = None
+        self.records = 0
+        self._route_by_request = OrderedDict()
+        self._pending_markers = OrderedDict()
+
+    def add(self, record: dict) -> None:
+        self.records += 1
+        request_id = record.get("requestId") or ""
+        status = record.get("responseStatusCode", -1)
+        if status is None or status < 0:
+            self._add_message(request_id, record.get("message") or "")
+            return
+
+        timestamp = record.get("timestampInMs")
+        if timestamp:
+            self.first_ms = timestamp if self.first_ms is None else min(self.first_ms, timestamp)
+            self.last_ms = timestamp if self.last_ms is None else max(self.last_ms, timestamp)
+        self.deployments[record.get("deploymentId") or "-"] += 1
+
+        route = f"{record.get('requestMethod', 'GET')} {normalise_route(record.get('requestPath') or '/')}"
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.add(status, record.get("durationMs", -1), record.get("maxMemoryUsed", -1))
+        self._mark(stats, record.get("message") or "")
+        if request_id:
+            for message in self._pending_markers.pop(request_id, ()):
+                self._mark(stats, message)
+            self._remember(self._route_by_request, request_id, route)
+
+    def _add_message(self, request_id: str, message: str) -> None:
+        if not (COLD_START_RE.search(message) or CRASH_RE.search(message)):
+            return
+        route = self._route_by_request.get(request_id)
+        if route is not None:
+            self._mark(self.routes[route], message)
+        elif request_id:
+            self._pending_markers.setdefault(request_id, []).append(message)
+            while len(self._pending_markers) > MAX_PENDING:
+                self._pending_markers.popitem(last=False)
+
+    @staticmethod
+    def _mark(stats: RouteStats, message: str) -> None:
+        if COLD_START_RE.search(message):
+            stats.cold_starts += 1
+        if CRASH_RE.search(message):
+            stats.crashes += 1
+
+    @staticmethod
+    def _remember(mapping: OrderedDict, key, value) -> None:
+        mapping[key] = value
+        if len(mapping) > MAX_PENDING:
+            mapping.popitem(last=False)
+
+    @property
+    def span_minutes(self) -> float:
+        if self.first_ms is None:
+            return 0.0
+        return max((self.last_ms - self.first_ms) / 60_000, 1 / 60)
+
+    def to_dict(self) -> dict:
+        return {
+            "first_ms": self.first_ms,
+            "last_ms": self.last_ms,
+            "records": self.records,
+            "requests": sum(stats.count for stats in self.routes.values()),
+            "deployments": dict(self.deployments.most_common()),
+            "routes": {route: stats.to_dict() for route, stats in sorted(self.routes.items())},
+        }
@@ -0,0 +1,122 @@
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.logstream import LatencyHistogram, LogSummary, iter_records, open_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream exported Vercel request logs (a JSON array or JSON lines, optionally .gz) and report "
+        "per-route request rates, status mix, cold starts and latency percentiles. Each run appends a "
+        "compact roll-up to a history file so deploys can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="Log exports; '-' reads stdin.")
+        parser.add_argument("--top", type=int, default=10, help="How many routes to show.")
+        parser.add_argument(
+            "--history", default=str(settings.BASE_DIR / "perf" / "vercel_history.jsonl"),
+            help="Roll-up history file (JSON lines).",
+        )
+        parser.add_argument("--no-history", action="store_true", help="Do not append this run to the history.")
+        parser.add_argument("--trend", action="store_true", help="Compare the top routes with earlier roll-ups.")
+        parser.add_argument("--json", action="store_true", help="Print the full summary as JSON instead.")
+
+    def handle(self, *args, **options):
+        summary = LogSummary()
+        for path in options["files"]:
+            try:
+                with open_export(path) as fh:
+                    for record in iter_records(fh):
+                        if isinstance(record, dict):
+                            summary.add(record)
+            except OSError as exc:
+                raise CommandError(f"Cannot read {path}: {exc}")
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"{path} is not a JSON array or JSON lines: {exc}")
+        if not summary.routes:
+            raise CommandError("No request rows found.")
+
+        rollup = {"analysed_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **summary.to_dict()}
+        if options["json"]:
+            self.stdout.write(json.dumps(rollup, indent=2))
+        else:
+            self._report(summary, options["top"])
+
+        history = Path(options["history"])
+        previous = self._load_history(history)
+        if options["trend"]:
+            self._trend(previous, rollup, options["top"])
+        if not options["no_history"]:
+            key = (rollup["first_ms"], rollup["last_ms"], rollup["requests"])
+            if any((row["first_ms"], row["last_ms"], row["requests"]) == key for row in previous):
+                self.stdout.write("Already in history; not appended.")
+            else:
+                history.parent.mkdir(parents=True, exist_ok=True)
+                with history.open("a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(rollup, separators=(",", ":")) + "\n")
+                self.stdout.write(f"Roll-up appended to {history}")
+
+    def _report(self, summary, top):
+        minutes = summary.span_minutes
+        requests = sum(stats.count for stats in summary.routes.values())
+        overall = LatencyHistogram()
+        statuses = {}
+        for stats in summary.routes.values():
+            overall.merge(stats.histogram)
+            for status, n in stats.statuses.items():
+                statuses[status] = statuses.get(status, 0) + n
+        self.stdout.write(
+            f"{summary.records} records, {requests} requests over {minutes:.1f} min "
+            f"({requests / minutes:.1f}/min) across {len(summary.deployments)} deployment(s)"
+        )
+        self.stdout.write(
+            "Status mix: " + ", ".join(f"{status}: {n / requests:.0%}" for status, n in sorted(statuses.items()))
+        )
+        self.stdout.write(
+            f"Latency: p50={overall.percentile(0.5)}ms p95={overall.percentile(0.95)}ms p99={overall.percentile(0.99)}ms  "
+            f"cold starts={sum(s.cold_starts for s in summary.routes.values())}  "
+            f"crashes={sum(s.crashes for s in summary.routes.values())}\n"
+        )
+
+        # Ranked by total time spent, which is what speeding a route up would save
+        ranked = sorted(summary.routes.items(), key=lambda item: item[1].total_ms, reverse=True)[:top]
+        total_ms = sum(stats.total_ms for stats in summary.routes.values()) or 1.0
+        self.stdout.write(
+            f"{'route':<45} {'req/min':>8} {'5xx':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'time%':>6} {'cold':>5} {'crash':>5}"
+        )
+        for route, stats in ranked:
+            self.stdout.write(
+                f"{route[:45]:<45} {stats.count / minutes:>8.1f} {stats.errors / stats.count:>5.0%} "
+                f"{stats.histogram.percentile(0.5):>8} {stats.histogram.percentile(0.95):>8} "
+                f"{stats.histogram.percentile(0.99):>8} {stats.total_ms / total_ms:>6.0%} "
+                f"{stats.cold_starts:>5} {stats.crashes:>5}"
+            )
+
+    def _load_history(self, path):
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+    def _trend(self, previous, current, top):
+        if not previous:
+            self.stdout.write("No earlier roll-ups to compare with.")
+            return
+        last = previous[-1]
+        self.stdout.write(f"\nTrend vs roll-up of {last['analysed_at']}:")
+        ranked = sorted(current["routes"].items(), key=lambda item: item[1]["total_ms"], reverse=True)[:top]
+        for route, row in ranked:
+            old = last["routes"].get(route)
+            if not old:
+                self.stdout.write(f"{route[:45]:<45} new")
+                continue
+            delta = (row["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+            self.stdout.write(
+                f"{route[:45]:<45} p95 {old['p95_ms']} -> {row['p95_ms']}ms ({delta:+.0f}%)  "
+                f"5xx {old['errors']}/{old['count']} -> {row['errors']}/{row['count']}"
+            )
@@ -0,0 +1,249 @@
+import asyncio
+import io
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from groups.models import GroupMembership
+from notifications.models import Notification
+
+from .bench_views import _git_revision, _percentile
+
+HOST = "bench.local"
+
+
+@contextmanager
+def db_latency(seconds: float):
+	"""Add ``seconds`` of sleep to every SQL statement on every connection in the block."""
+
+	def wrapper(execute, sql, params, many, context):
+		time.sleep(seconds)
+		return execute(sql, params, many, context)
+
+	def install(sender, connection, **kwargs):
+		# Fires again on every reconnect of the same wrapper object
+		if wrapper not in connection.execute_wrappers:
+			connection.execute_wrappers.append(wrapper)
+
+	if not seconds:
+		yield
+		return
+	connection_created.connect(install, weak=False)
+	for conn in connections.all(initialized_only=True):
+		conn.execute_wrappers.append(wrapper)
+	try:
+		yield
+	finally:
+		connection_created.disconnect(install)
+		for conn in connections.all(initialized_only=True):
+			if wrapper in conn.execute_wrappers:
+				conn.execute_wrappers.remove(wrapper)
+
+
+class Command(BaseCommand):
+	help = (
+		"Fire concurrent requests at the async JSON endpoints through the real WSGI and ASGI "
+		"handlers and compare throughput and latency. Use --db-latency-ms to emulate a "
+		"networked database; local SQLite has almost no I/O wait to overlap."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels.")
+		parser.add_argument("--requests", type=int, default=200, help="Requests per deployment and level.")
+		parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Sleep added to every SQL statement.")
+		parser.add_argument(
+			"--wsgi-threads", type=int, default=0,
+			help="Worker threads for WSGI, like gunicorn --threads; defaults to the concurrency level.",
+		)
+		parser.add_argument("--deployment", choices=("wsgi", "asgi"), action="append", default=[])
+		parser.add_argument("--output", help="Write results as JSON to this file.")
+
+	def handle(self, *args, **options):
+		try:
+			levels = [int(n) for n in options["concurrency"].split(",")]
+		except ValueError:
+			raise CommandError("--concurrency takes comma-separated integers, e.g. 1,8,32")
+		deployments = options["deployment"] or ["wsgi", "asgi"]
+		targets = self._targets()
+
+		results = {}
+		# Built inside the override so the debug-only middleware removes itself
+		with override_settings(ALLOWED_HOSTS=["*"], DEBUG=False, QUERY_INSPECTOR=False, PROFILER_ENABLED=False):
+			with db_latency(options["db_latency_ms"] / 1000):
+				for name in deployments:
+					for level in levels:
+						if name == "wsgi":
+							row = self._run_wsgi(targets, level, options["requests"], options["wsgi_threads"] or level)
+						else:
+							row = self._run_asgi(targets, level, options["requests"])
+						results[f"{name}@{level}"] = row
+						self._print_row(name, level, row)
+
+		if options["output"]:
+			report = {
+				"meta": {
+					"revision": _git_revision(),
+					"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+					"python": platform.python_version(),
+					"database": connections["default"].vendor,
+					"db_latency_ms": options["db_latency_ms"],
+					"wsgi_threads": options["wsgi_threads"] or "concurrency",
+					"requests": options["requests"],
+					"targets": [path + ("?" + query if query else "") for path, query, _ in targets],
+				},
+				"results": results,
+			}
+			with open(options["output"], "w", encoding="utf-8") as fh:
+				json.dump(report, fh, indent=2)
+			self.stdout.write(f"Results written to {options['output']}")
+
+	def _targets(self):
+		"""(path, query string, session cookie) for the calendar feed, autocomplete and unread count."""
+		member_id = GroupMembership.objects.filter(is_leader=False).values_list("user_id", flat=True).first()
+		inbox_id = (
+			Notification.objects.values("recipient_id").annotate(n=Count("id")).order_by("-n").values_list("recipient_id", flat=True).first()
+		)
+		if member_id is None:
+			raise CommandError("No group members to benchmark with; run `manage.py seed_data` first.")
+		member_cookie = self._session_cookie(User.objects.get(pk=member_id))
+		inbox_cookie = self._session_cookie(User.objects.get(pk=inbox_id)) if inbox_id else member_cookie
+		first = date.today().replace(day=1)
+		return [
+			(reverse("events:api_events"), f"start={first.isoformat()}&end={(first + timedelta(days=42)).isoformat()}", member_cookie),
+			# Signed in, so the anonymous page cache is bypassed and the view itself runs
+			(reverse("groups:groups_api"), "q=a", member_cookie),
+			(reverse("notifications:unread_count"), "", inbox_cookie),
+		]
+
+	def _session_cookie(self, user) -> str:
+		client = Client()
+		client.force_login(user)
+		return f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+	def _run_wsgi(self, targets, concurrency, total, threads):
+		handler = WSGIHandler()
+		# ``concurrency`` clients share ``threads`` workers; latency includes
+		# the wait for a free one, as behind a real WSGI server
+		workers = threading.BoundedSemaphore(threads)
+
+		def one(i):
+			path, query, cookie = targets[i % len(targets)]
+			environ = {
+				"REQUEST_METHOD": "GET",
+				"SCRIPT_NAME": "",
+				"PATH_INFO": path,
+				"QUERY_STRING": query,
+				"SERVER_NAME": HOST,
+				"SERVER_PORT": "80",
+				"SERVER_PROTOCOL": "HTTP/1.1",
+				"HTTP_HOST": HOST,
+				"HTTP_COOKIE": cookie,
+				"wsgi.version": (1, 0),
+				"wsgi.url_scheme": "http",
+				"wsgi.input": io.BytesIO(),
+				"wsgi.errors": sys.stderr,
+				"wsgi.multithread": True,
+				"wsgi.multiprocess": False,
+				"wsgi.run_once": False,
+			}
+			statuses = []
+			start = time.perf_counter()
+			with workers:
+				response = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+				try:
+					b"".join(response)
+				finally:
+					response.close()
+			return (time.perf_counter() - start) * 1000, int(statuses[0].split()[0])
+
+		with ThreadPoolExecutor(max_workers=concurrency) as pool:
+			started = time.perf_counter()
+			samples = list(pool.map(one, range(total)))
+			elapsed = time.perf_counter() - started
+		return self._summarise(samples, elapsed)
+
+	def _run_asgi(self, targets, concurrency, total):
+		handler = ASGIHandler()
+
+		async def one(i):
+			path, query, cookie = targets[i % len(targets)]
+			scope = {
+				"type": "http",
+				"asgi": {"version": "3.0"},
+				"http_version": "1.1",
+				"method": "GET",
+				"scheme": "http",
+				"path": path,
+				"raw_path": path.encode(),
+				"query_string": query.encode(),
+				"root_path": "",
+				"headers": [(b"host", HOST.encode()), (b"cookie", cookie.encode())],
+				"client": ("127.0.0.1", 0),
+				"server": (HOST, 80),
+			}
+			sent_body = asyncio.Event()
+			status = []
+
+			async def receive():
+				if not sent_body.is_set():
+					sent_body.set()
+					return {"type": "http.request", "body": b"", "more_body": False}
+				# The handler listens for a disconnect until the response is done
+				await asyncio.Event().wait()
+
+			async def send(message):
+				if message["type"] == "http.response.start":
+					status.append(message["status"])
+
+			start = time.perf_counter()
+			await handler(scope, receive, send)
+			return (time.perf_counter() - start) * 1000, status[0]
+
+		async def main():
+			queue = iter(range(total))
+			samples = []
+
+			async def worker():
+				for i in queue:
+					samples.append(await one(i))
+
+			started = time.perf_counter()
+			await asyncio.gather(*(worker() for _ in range(concurrency)))
+			return samples, time.perf_counter() - started
+
+		samples, elapsed = asyncio.run(main())
+		return self._summarise(samples, elapsed)
+
+	def _summarise(self, samples, elapsed):
+		ordered = sorted(ms for ms, _ in samples)
+		return {
+			"requests": len(samples),
+			"errors": sum(1 for _, status in samples if status >= 400),
+			"throughput_rps": round(len(samples) / elapsed, 1),
+			"p50_ms": round(statistics.median(ordered), 3),
+			"p95_ms": round(_percentile(ordered, 0.95), 3),
+		}
+
+	def _print_row(self, name, level, row):
+		self.stdout.write(
+			f"{name:<5} c={level:<4} {row['throughput_rps']:>8.1f} req/s  p50={row['p50_ms']:>8.2f}ms  "
+			f"p95={row['p95_ms']:>8.2f}ms  errors={row['errors']}"
+		)
@@ -0,0 +1,122 @@
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from notifications.models import Notification
+
+from .bench_views import _percentile
+
+PROFILES = {"default": "0", "production": "1"}
+
+
+class Command(BaseCommand):
+	help = (
+		"Run several writer processes against a scratch copy of the SQLite database and report "
+		"committed transactions per second and 'database is locked' failures, once per SQLite "
+		"profile (see SQLITE_PRODUCTION)."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--writers", type=int, default=4, help="Writer processes.")
+		parser.add_argument("--transactions", type=int, default=200, help="Transactions per writer.")
+		parser.add_argument("--profile", choices=PROFILES, action="append", default=[])
+		# Internal: run as one writer process
+		parser.add_argument("--worker", action="store_true", help="(internal)")
+		parser.add_argument("--start-at", type=float, default=0.0, help="(internal)")
+
+	def handle(self, *args, **options):
+		if connection.vendor != "sqlite":
+			raise CommandError("This benchmark only applies to SQLite.")
+		if options["worker"]:
+			self._work(options["transactions"], options["start_at"])
+			return
+		for profile in options["profile"] or list(PROFILES):
+			row = self._run_profile(profile, options["writers"], options["transactions"])
+			self.stdout.write(
+				f"{profile:<11} writers={options['writers']:<3} {row['throughput_tps']:>8.1f} tx/s  "
+				f"p50={row['p50_ms']:>7.2f}ms  p95={row['p95_ms']:>8.2f}ms  locked={row['locked']}/{row['attempted']}"
+			)
+
+	def _run_profile(self, profile, writers, transactions):
+		with tempfile.TemporaryDirectory() as tmp:
+			scratch = os.path.join(tmp, "bench.sqlite3")
+			# Copy through the backup API so the primary stays consistent if it is in use
+			source, target = sqlite3.connect(settings.DATABASES["default"]["NAME"]), sqlite3.connect(scratch)
+			try:
+				source.backup(target)
+			finally:
+				target.close()
+				source.close()
+
+			env = {
+				**os.environ,
+				"DB_NAME": scratch,
+				"SQLITE_PRODUCTION": PROFILES[profile],
+				"DB_REPLICA_NAME": "",
+				"QUERY_INSPECTOR": "False",
+			}
+			# Every writer waits for the same moment, after its Django startup
+			start_at = time.time() + 2.0
+			command = [
+				sys.executable, str(settings.BASE_DIR / "manage.py"), "bench_sqlite_writers", "--worker",
+				"--transactions", str(transactions), "--start-at", str(start_at),
+			]
+			procs = [subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True) for _ in range(writers)]
+			results = []
+			for proc in procs:
+				out, _ = proc.communicate()
+				if proc.returncode:
+					raise CommandError(f"A writer process failed (exit {proc.returncode}).")
+				results.append(json.loads(out.strip().splitlines()[-1]))
+
+		latencies = sorted(ms for r in results for ms in r["latencies_ms"])
+		committed = sum(r["committed"] for r in results)
+		elapsed = max(r["finished"] for r in results) - min(r["started"] for r in results)
+		return {
+			"attempted": writers * transactions,
+			"committed": committed,
+			"locked": sum(r["locked"] for r in results),
+			"throughput_tps": committed / elapsed if elapsed else 0.0,
+			"p50_ms": statistics.median(latencies) if latencies else 0.0,
+			"p95_ms": _percentile(latencies, 0.95) if latencies else 0.0,
+		}
+
+	def _work(self, transactions, start_at):
+		user_ids = list(User.objects.values_list("pk", flat=True)[:200])
+		if not user_ids:
+			raise CommandError("No users to write notifications for; run `manage.py seed_data` first.")
+		rng = random.Random(os.getpid())
+		latencies, locked = [], 0
+		time.sleep(max(0.0, start_at - time.time()))
+		started = time.time()
+		for i in range(transactions):
+			uid = rng.choice(user_ids)
+			t0 = time.perf_counter()
+			try:
+				# Read, then write: the shape of most form handlers, and the one
+				# that cannot upgrade its lock under a deferred BEGIN
+				with transaction.atomic():
+					Notification.objects.filter(recipient_id=uid, read=False).count()
+					Notification.objects.create(recipient_id=uid, actor_id=uid, text=f"bench {os.getpid()} {i}", url="/")
+			except OperationalError:
+				locked += 1
+				continue
+			latencies.append((time.perf_counter() - t0) * 1000)
+		self.stdout.write(json.dumps({
+			"committed": len(latencies),
+			"locked": locked,
+			"latencies_ms": latencies,
+			"started": started,
+			"finished": time.time(),
+		}))
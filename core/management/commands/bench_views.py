@@ -0,0 +1,170 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from groups.models import Group, GroupActivity, GroupMembership
+from notifications.models import Notification
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+	return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _git_revision() -> str:
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return ""
+
+
+class Command(BaseCommand):
+	help = (
+		"Benchmark the main views through the test client and report p50/p95 latency and query counts. "
+		"Run `manage.py seed_data` first for realistic volumes."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--iterations", type=int, default=30)
+		parser.add_argument("--warmup", type=int, default=3)
+		parser.add_argument("--only", action="append", default=[], help="Benchmark only the named scenario(s).")
+		parser.add_argument("--output", help="Write results as JSON to this file.")
+		parser.add_argument("--compare", help="A previous --output file to diff against.")
+
+	def handle(self, *args, **options):
+		if not getattr(staticfiles_storage, "hashed_files", True):
+			# Pages render with DEBUG off, which needs the hashed-asset manifest
+			raise CommandError("No static manifest; run `manage.py collectstatic` first.")
+		scenarios = self._scenarios()
+		if options["only"]:
+			unknown = set(options["only"]) - {name for name, *_ in scenarios}
+			if unknown:
+				raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+			scenarios = [s for s in scenarios if s[0] in options["only"]]
+
+		results = {}
+		with override_settings(ALLOWED_HOSTS=["*"], DEBUG=False):
+			for name, url, user in scenarios:
+				results[name] = self._run(url, user, options["iterations"], options["warmup"])
+				self._print_row(name, results[name])
+
+		report = {
+			"meta": {
+				"revision": _git_revision(),
+				"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+				"python": platform.python_version(),
+				"database": connection.vendor,
+				"cache": settings.CACHES["default"]["BACKEND"],
+				"iterations": options["iterations"],
+				"rows": {
+					"users": User.objects.count(),
+					"groups": Group.objects.count(),
+					"activities": GroupActivity.objects.count(),
+					"notifications": Notification.objects.count(),
+				},
+			},
+			"results": results,
+		}
+		if options["output"]:
+			with open(options["output"], "w", encoding="utf-8") as fh:
+				json.dump(report, fh, indent=2)
+			self.stdout.write(f"Results written to {options['output']}")
+		if options["compare"]:
+			self._compare(options["compare"], results)
+
+	def _scenarios(self):
+		"""(name, url, user) triples, with users and objects picked from the current data."""
+		busiest = (
+			Group.objects.exclude(name__in=["Admin", "Leaders", "Members"])
+			.annotate(n=Count("activities"))
+			.order_by("-n")
+			.first()
+		)
+		if busiest is None:
+			raise CommandError("No groups to benchmark; run `manage.py seed_data` first.")
+		member_id = (
+			GroupMembership.objects.filter(group=busiest, is_leader=False).values_list("user_id", flat=True).first()
+			or GroupMembership.objects.filter(group=busiest).values_list("user_id", flat=True).first()
+		)
+		member = User.objects.get(pk=member_id)
+		admin = (
+			User.objects.filter(is_superuser=True).first()
+			or User.objects.filter(is_staff=True).first()
+			or User.objects.filter(profile__role="ADMIN").first()
+		)
+		if admin is None:
+			raise CommandError("No admin user found for the admin-only views.")
+		inbox_id = (
+			Notification.objects.values("recipient_id").annotate(n=Count("id")).order_by("-n").values_list("recipient_id", flat=True).first()
+		)
+		inbox_user = User.objects.get(pk=inbox_id) if inbox_id else member
+		today = date.today()
+		month = f"?start={today.replace(day=1).isoformat()}&end={(today.replace(day=1) + timedelta(days=42)).isoformat()}"
+		return [
+			("home_anonymous", reverse("home"), None),
+			("home_member", reverse("home"), member),
+			("groups_list", reverse("groups:list"), member),
+			("group_detail", reverse("groups:detail", args=[busiest.pk]), member),
+			("api_events", reverse("events:api_events") + month, member),
+			("activities_report", reverse("groups:activities_report", args=[busiest.pk]), admin),
+			("notifications_list", reverse("notifications:list"), inbox_user),
+		]
+
+	def _run(self, url, user, iterations, warmup):
+		client = Client()
+		if user is not None:
+			client.force_login(user)
+		timings, queries, status = [], [], None
+		for i in range(warmup + iterations):
+			with CaptureQueriesContext(connection) as ctx:
+				start = time.perf_counter()
+				response = client.get(url)
+				elapsed = time.perf_counter() - start
+			status = response.status_code
+			if i >= warmup:
+				timings.append(elapsed * 1000)
+				queries.append(len(ctx.captured_queries))
+		ordered = sorted(timings)
+		return {
+			"url": url,
+			"status": status,
+			"p50_ms": round(statistics.median(ordered), 3),
+			"p95_ms": round(_percentile(ordered, 0.95), 3),
+			"mean_ms": round(statistics.fmean(ordered), 3),
+			"queries": max(queries),
+			"bytes": len(response.content),
+		}
+
+	def _print_row(self, name, row):
+		self.stdout.write(
+			f"{name:<20} {row['status']}  p50={row['p50_ms']:>9.2f}ms  p95={row['p95_ms']:>9.2f}ms  "
+			f"queries={row['queries']:<4} bytes={row['bytes']}"
+		)
+
+	def _compare(self, path, results):
+		with open(path, encoding="utf-8") as fh:
+			previous = json.load(fh)["results"]
+		self.stdout.write(f"\nChange vs {path}:")
+		for name, row in results.items():
+			old = previous.get(name)
+			if not old:
+				continue
+			delta = (row["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+			self.stdout.write(
+				f"{name:<20} p50 {old['p50_ms']:.2f} -> {row['p50_ms']:.2f}ms ({delta:+.1f}%)  "
+				f"queries {old['queries']} -> {row['queries']}"
+			)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.caching import bump, reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = "Show cache hit/miss counts and generations per namespace."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the hit/miss counters afterwards.")
+        parser.add_argument("--bump", metavar="NAMESPACE", action="append", default=[], help="Invalidate a namespace.")
+
+    def handle(self, *args, **options):
+        for namespace in options["bump"]:
+            bump(namespace)
+        self.stdout.write(f"Backend: {settings.CACHES['default']['BACKEND']}")
+        self.stdout.write(f"{'namespace':<15} {'hits':>8} {'misses':>8} {'hit rate':>9}  generation")
+        for namespace, row in stats().items():
+            lookups = row["hits"] + row["misses"]
+            rate = f"{row['hits'] / lookups:.1%}" if lookups else "-"
+            self.stdout.write(f"{namespace:<15} {row['hits']:>8} {row['misses']:>8} {rate:>9}  {row['generation']}")
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
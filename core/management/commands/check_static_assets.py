@@ -0,0 +1,75 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+STATIC_TAG_RE = re.compile(r"""{%\s*static\s+(?P<quote>['"])(?P<path>[^'"]+)(?P=quote)""")
+DYNAMIC_STATIC_TAG_RE = re.compile(r"""{%\s*static\s+(?!['"])(?P<expr>[^\s%]+)""")
+# src/href attributes that spell out STATIC_URL instead of using {% static %}
+HARDCODED_RE = re.compile(r"""(?:src|href)\s*=\s*['"](?P<url>/static/[^'"]+)['"]""")
+PRECOMPRESSED_SUFFIXES = (".css", ".js")
+
+
+def _template_dirs() -> list[Path]:
+    # App directories are listed explicitly so the check does not depend on APP_DIRS
+    dirs = [Path(d) for engine in engines.all() for d in engine.template_dirs]
+    dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    return list(dict.fromkeys(d.resolve() for d in dirs if d.is_dir()))
+
+
+def _template_files():
+    for root in _template_dirs():
+        yield from (p for p in root.rglob("*") if p.is_file() and p.suffix in (".html", ".txt", ".xml"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Fail if templates reference static assets that are not in the collectstatic manifest "
+        "(and so would be served without a content hash), or if CSS/JS lacks precompressed copies. "
+        "Run after `collectstatic`."
+    )
+
+    def handle(self, *args, **options):
+        problems = []
+        manifest = getattr(staticfiles_storage, "hashed_files", None)
+        if not manifest:
+            raise CommandError(
+                f"No static manifest found in {settings.STATIC_ROOT}; run `manage.py collectstatic` first."
+            )
+
+        referenced = set()
+        scanned = 0
+        for path in _template_files():
+            scanned += 1
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for match in STATIC_TAG_RE.finditer(text):
+                name = match["path"]
+                referenced.add(name)
+                if name not in manifest:
+                    problems.append(f"{path}: {{% static '{name}' %}} is not in the manifest")
+            for match in DYNAMIC_STATIC_TAG_RE.finditer(text):
+                self.stdout.write(f"note: {path}: dynamic {{% static {match['expr']} %}} cannot be checked")
+            for match in HARDCODED_RE.finditer(text):
+                problems.append(f"{path}: hard-coded {match['url']} bypasses hashing; use {{% static %}}")
+
+        if not scanned:
+            raise CommandError("No templates found to check; are the template directories configured?")
+
+        root = Path(settings.STATIC_ROOT)
+        for name in sorted(referenced):
+            hashed = manifest.get(name)
+            if not hashed or not hashed.endswith(PRECOMPRESSED_SUFFIXES):
+                continue
+            for suffix in (".gz", ".br"):
+                if not (root / (hashed + suffix)).exists():
+                    problems.append(f"{hashed}{suffix} is missing; is the Brotli package installed?")
+
+        if problems:
+            raise CommandError("Static asset check failed:\n  " + "\n  ".join(problems))
+        self.stdout.write(
+            self.style.SUCCESS(f"{scanned} templates checked; {len(referenced)} asset references resolve to hashed, precompressed files.")
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.compression import reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = "Show how many responses were compressed per encoding and the bytes saved."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters afterwards.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'encoding':<10} {'responses':>10} {'bytes in':>14} {'bytes out':>14} {'ratio':>7} {'saved':>7}")
+        for encoding, row in stats().items():
+            ratio = f"{row['bytes_in'] / row['bytes_out']:.1f}x" if row["bytes_out"] else "-"
+            saved = f"{1 - row['bytes_out'] / row['bytes_in']:.0%}" if row["bytes_in"] else "-"
+            self.stdout.write(
+                f"{encoding:<10} {row['responses']:>10} {row['bytes_in']:>14} {row['bytes_out']:>14} {ratio:>7} {saved:>7}"
+            )
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
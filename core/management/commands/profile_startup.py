@@ -0,0 +1,47 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import local_imports, measure_cold_start
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time of the WSGI entry point in fresh interpreters and show the slowest imports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=20, help="How many imports to list.")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=settings.COLD_START_BUDGET_MS,
+            help="Fail if the median cold start exceeds this (default: COLD_START_BUDGET_MS).",
+        )
+
+    def handle(self, *args, **options):
+        runs = [measure_cold_start() for _ in range(options["runs"])]
+        totals = sorted(run["total_ms"] for run in runs)
+        median = statistics.median(totals)
+        self.stdout.write(
+            f"Cold start over {len(runs)} runs: min={totals[0]:.0f}ms median={median:.0f}ms max={totals[-1]:.0f}ms"
+        )
+        self.stdout.write(
+            f"  import PCG_APP.wsgi: {statistics.median(r['wsgi_ms'] for r in runs):.0f}ms, "
+            f"URLconf: {statistics.median(r['urlconf_ms'] for r in runs):.0f}ms, "
+            f"modules loaded: {runs[-1]['modules']}"
+        )
+
+        detail = measure_cold_start(importtime=True)
+        imports = detail["imports"]
+        self.stdout.write(f"\nSlowest imports by cumulative time (of {len(imports)}):")
+        for row in sorted(imports, key=lambda r: r["cumulative_ms"], reverse=True)[: options["top"]]:
+            self.stdout.write(f"  {row['cumulative_ms']:8.1f}ms  {row['module']}")
+        self.stdout.write("\nProject modules by own import time:")
+        for row in local_imports(imports)[: options["top"]]:
+            self.stdout.write(f"  {row['self_ms']:8.1f}ms  {row['module']}")
+
+        budget = options["budget_ms"]
+        if budget and median > budget:
+            raise CommandError(f"Median cold start {median:.0f}ms exceeds the {budget:.0f}ms budget.")
+        self.stdout.write(self.style.SUCCESS(f"Within the {budget:.0f}ms budget."))
@@ -0,0 +1,271 @@
+import hashlib
+import http.cookiejar
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import NoReverseMatch, Resolver404, resolve, reverse
+
+from core.logstream import iter_records, normalise_route, open_export
+from events.models import Event, EventImage
+from groups.models import Group, GroupActivity, GroupApplication
+from notifications.models import Notification
+
+from .bench_views import _percentile
+from .seed_data import BASE_GROUPS, SEED_PASSWORD, SEED_PREFIX
+
+# (URL namespace, kwarg) -> the model, and field, whose local values replace the recorded ones
+KWARG_SOURCES = {
+	("groups", "pk"): (Group, "pk"),
+	("groups", "group_pk"): (Group, "pk"),
+	("groups", "user_pk"): (User, "pk"),
+	("groups", "app_pk"): (GroupApplication, "pk"),
+	("groups", "activity_pk"): (GroupActivity, "pk"),
+	("events", "slug"): (Event, "slug"),
+	("events", "image_id"): (EventImage, "pk"),
+	("notifications", "pk"): (Notification, "pk"),
+}
+POOL_SIZE = 1000
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def _stable_index(value, size: int) -> int:
+	digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+	return int.from_bytes(digest, "big") % size
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+	# Time each request on its own; a redirect is a result, not something to follow
+	def redirect_request(self, req, fp, code, msg, headers, newurl):
+		return None
+
+
+class Command(BaseCommand):
+	help = (
+		"Replay the request mix from exported Vercel logs against a running instance, at a chosen speed "
+		"and concurrency, and report throughput, error rate and latency. Recorded ids and slugs are "
+		"mapped onto local rows and requests are spread over signed-in seed users "
+		"(run `manage.py seed_data` first)."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("files", nargs="+", help="Log exports, as read by analyze_vercel_logs.")
+		parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+		parser.add_argument("--speed", type=float, default=1.0, help="Replay rate relative to the recording; 0 = as fast as possible.")
+		parser.add_argument("--concurrency", type=int, default=16, help="Maximum requests in flight.")
+		parser.add_argument("--loop", type=int, default=1, help="Replay the recording this many times back to back.")
+		parser.add_argument("--users", type=int, default=20, help="Seed users to sign in and spread requests over.")
+		parser.add_argument("--anonymous-share", type=float, default=0.3, help="Fraction of requests sent signed out.")
+		parser.add_argument("--include-writes", action="store_true", help="Also replay non-GET/HEAD requests.")
+		parser.add_argument("--timeout", type=float, default=30.0)
+		parser.add_argument("--top", type=int, default=10)
+		parser.add_argument("--output", help="Write results as JSON to this file.")
+
+	def handle(self, *args, **options):
+		self.base_url = options["base_url"].rstrip("/")
+		self.timeout = options["timeout"]
+		requests, skipped = self._load(options["files"], options["include_writes"])
+		if not requests:
+			raise CommandError("No replayable requests in the export.")
+		self.pools = {}
+		plan = self._plan(requests, options["loop"], options["speed"])
+		clients = self._sign_in(options["users"])
+		speed = f"{options['speed']}x" if options["speed"] else "maximum"
+		self.stdout.write(
+			f"Replaying {len(plan)} requests ({skipped} writes skipped) at {speed} speed, "
+			f"concurrency {options['concurrency']}, {len(clients)} signed-in users"
+		)
+
+		samples = []
+		lock = threading.Lock()
+		anonymous = self._opener()
+
+		def send(item):
+			scheduled, method, url, route, key = item
+			lag = time.perf_counter() - started - scheduled
+			signed_in = _stable_index(("anon", key), 1000) >= options["anonymous_share"] * 1000
+			opener = clients[_stable_index(key, len(clients))] if clients and signed_in else anonymous
+			status, elapsed = self._fetch(opener, method, url)
+			with lock:
+				samples.append((route, status, elapsed * 1000, max(lag, 0.0) * 1000))
+
+		with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+			started = time.perf_counter()
+			for item in plan:
+				delay = item[0] - (time.perf_counter() - started)
+				if delay > 0:
+					time.sleep(delay)
+				pool.submit(send, item)
+		elapsed = time.perf_counter() - started
+
+		report = self._summarise(samples, elapsed)
+		report["skipped_writes"] = skipped
+		self._print(report, options["top"])
+		if options["output"]:
+			with open(options["output"], "w", encoding="utf-8") as fh:
+				json.dump(report, fh, indent=2)
+			self.stdout.write(f"Results written to {options['output']}")
+
+	def _load(self, files, include_writes):
+		requests, skipped = [], 0
+		for path in files:
+			with open_export(path) as fh:
+				for record in iter_records(fh):
+					if not isinstance(record, dict) or (record.get("responseStatusCode") or -1) < 0:
+						# Printed-output rows, not requests
+						continue
+					method = record.get("requestMethod") or "GET"
+					if method not in SAFE_METHODS and not include_writes:
+						skipped += 1
+						continue
+					requests.append(record)
+		requests.sort(key=lambda r: r.get("timestampInMs") or 0)
+		return requests, skipped
+
+	def _plan(self, requests, loops, speed):
+		"""(send offset in seconds, method, url, route, user key) for every request to replay."""
+		first = requests[0].get("timestampInMs") or 0
+		span = ((requests[-1].get("timestampInMs") or 0) - first) / 1000 + 1
+		plan = []
+		for loop in range(loops):
+			for record in requests:
+				offset = ((record.get("timestampInMs") or first) - first) / 1000 + loop * span
+				path = record.get("requestPath") or "/"
+				route = normalise_route(path)
+				url = self._local_url(path, record.get("requestQueryString") or "")
+				key = record.get("sessionId") or record.get("requestId") or len(plan)
+				plan.append((offset / speed if speed else 0.0, record.get("requestMethod") or "GET", url, route, key))
+		return plan
+
+	def _local_url(self, request_path, query):
+		path = request_path.split("?", 1)[0]
+		if not path.startswith("/"):
+			path = "/" + path.split("/", 1)[1] if "/" in path else "/"
+		try:
+			match = resolve(path)
+			kwargs = {name: self._map(match.namespace, name, value) for name, value in match.kwargs.items()}
+			path = reverse(match.view_name, kwargs=kwargs)
+		except (Resolver404, NoReverseMatch, LookupError):
+			# Static files, favicons and unknown paths are replayed as recorded
+			pass
+		return self.base_url + path + (f"?{query}" if query else "")
+
+	def _map(self, namespace, name, value):
+		source = KWARG_SOURCES.get((namespace, name))
+		if source is None:
+			return value
+		if source not in self.pools:
+			model, field = source
+			qs = model.objects.all()
+			if model is Group:
+				qs = qs.exclude(name__in=BASE_GROUPS)
+			self.pools[source] = list(qs.order_by("pk").values_list(field, flat=True)[:POOL_SIZE])
+		pool = self.pools[source]
+		if not pool:
+			raise LookupError(name)
+		# Stable, so a hot recorded group stays one hot local group
+		return pool[_stable_index(value, len(pool))]
+
+	def _opener(self):
+		return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect)
+
+	def _sign_in(self, count):
+		"""Log ``count`` seed users in through the login form; one cookie jar each."""
+		usernames = list(
+			User.objects.filter(username__startswith=SEED_PREFIX).order_by("pk").values_list("username", flat=True)[:count]
+		)
+		if count and not usernames:
+			raise CommandError("No seed users found; run `manage.py seed_data` first.")
+		login_url = self.base_url + reverse("login")
+		clients = []
+		for username in usernames:
+			jar = http.cookiejar.CookieJar()
+			opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), _NoRedirect)
+			try:
+				opener.open(login_url, timeout=self.timeout).read()
+			except urllib.error.URLError as exc:
+				raise CommandError(f"Cannot reach {login_url}: {exc.reason}")
+			csrf = next((c.value for c in jar if c.name == "csrftoken"), "")
+			data = urllib.parse.urlencode({"username": username, "password": SEED_PASSWORD, "csrfmiddlewaretoken": csrf})
+			request = urllib.request.Request(login_url, data=data.encode(), headers={"Referer": login_url})
+			status, _ = self._fetch(opener, "POST", request)
+			if status != 302:
+				raise CommandError(f"Login as {username} failed with status {status}.")
+			clients.append(opener)
+		return clients
+
+	def _fetch(self, opener, method, url):
+		request = url if isinstance(url, urllib.request.Request) else urllib.request.Request(url, method=method)
+		start = time.perf_counter()
+		try:
+			with opener.open(request, timeout=self.timeout) as response:
+				response.read()
+				status = response.status
+		except urllib.error.HTTPError as exc:
+			exc.read()
+			status = exc.code
+		except (urllib.error.URLError, TimeoutError, ConnectionError):
+			status = 0
+		return status, time.perf_counter() - start
+
+	def _summarise(self, samples, elapsed):
+		ordered = sorted(ms for _, _, ms, _ in samples)
+		lags = sorted(lag for _, _, _, lag in samples)
+		statuses = Counter(status for _, status, _, _ in samples)
+		by_route = defaultdict(list)
+		for route, status, ms, _ in samples:
+			by_route[route].append((status, ms))
+		total = len(samples)
+
+		def latency(values):
+			values = sorted(values)
+			return {
+				"p50_ms": round(statistics.median(values), 2),
+				"p95_ms": round(_percentile(values, 0.95), 2),
+				"p99_ms": round(_percentile(values, 0.99), 2),
+				"max_ms": round(values[-1], 2),
+			}
+
+		return {
+			"requests": total,
+			"elapsed_s": round(elapsed, 2),
+			"throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+			"error_rate": round(sum(n for s, n in statuses.items() if s == 0 or s >= 500) / total, 4),
+			"statuses": {str(s): n for s, n in sorted(statuses.items())},
+			"latency": latency(ordered),
+			# How late requests left versus the recording; high values mean the client could not keep up
+			"schedule_lag_p95_ms": round(_percentile(lags, 0.95), 2),
+			"routes": {
+				route: {
+					"count": len(rows),
+					"errors": sum(1 for s, _ in rows if s == 0 or s >= 500),
+					**latency(ms for _, ms in rows),
+				}
+				for route, rows in by_route.items()
+			},
+		}
+
+	def _print(self, report, top):
+		lat = report["latency"]
+		self.stdout.write(
+			f"{report['requests']} requests in {report['elapsed_s']}s = {report['throughput_rps']} req/s, "
+			f"error rate {report['error_rate']:.1%}, schedule lag p95 {report['schedule_lag_p95_ms']}ms"
+		)
+		self.stdout.write("Statuses: " + ", ".join(f"{s}: {n}" for s, n in report["statuses"].items()))
+		self.stdout.write(
+			f"Latency: p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms max={lat['max_ms']}ms\n"
+		)
+		self.stdout.write(f"{'route':<45} {'count':>6} {'errors':>6} {'p50':>9} {'p95':>9} {'max':>9}")
+		ranked = sorted(report["routes"].items(), key=lambda item: item[1]["count"], reverse=True)[:top]
+		for route, row in ranked:
+			self.stdout.write(
+				f"{route[:45]:<45} {row['count']:>6} {row['errors']:>6} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['max_ms']:>9}"
+			)
@@ -0,0 +1,247 @@
+import random
+from datetime import time, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from announcements.models import Announcement
+from announcements.utils import rebuild_audience
+from core.caching import NAMESPACE_MODELS, bump
+from events.models import Event
+from groups.models import Group, GroupActivity, GroupMembership
+from notifications.models import Notification
+
+SEED_PREFIX = "seed_"
+SEED_PASSWORD = "seed-password"
+BASE_GROUPS = ("Admin", "Leaders", "Members")
+
+WORDS = (
+	"prayer worship youth choir outreach bible study fellowship service mission "
+	"family women men children music media ushering hospitality welfare evangelism "
+	"harvest retreat conference vigil seminar picnic rally drive training"
+).split()
+
+
+def _batched(iterable, size):
+	iterator = iter(iterable)
+	while batch := list(islice(iterator, size)):
+		yield batch
+
+
+def _phrase(rng, n=3):
+	return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+
+class Command(BaseCommand):
+	help = (
+		"Seed a large synthetic dataset with bulk inserts (users, groups, memberships, events, "
+		"activities, announcements, notifications). Seeded users log in with password "
+		f"'{SEED_PASSWORD}'; usernames start with '{SEED_PREFIX}'."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--users", type=int, default=50_000)
+		parser.add_argument("--groups", type=int, default=500)
+		parser.add_argument("--notifications", type=int, default=1_000_000)
+		parser.add_argument("--activities", type=int, default=100_000)
+		parser.add_argument("--events", type=int, default=100_000)
+		parser.add_argument("--announcements", type=int, default=5_000)
+		parser.add_argument("--scale", type=float, default=1.0, help="Multiply every count, e.g. 0.01 for a quick run.")
+		parser.add_argument("--batch-size", type=int, default=5_000)
+		parser.add_argument("--seed", type=int, default=1, help="Random seed, so runs are reproducible.")
+		parser.add_argument("--skip-derived", action="store_true", help="Do not rebuild the announcement fan-out and search index.")
+
+	def handle(self, *args, **options):
+		if User.objects.filter(username__startswith=SEED_PREFIX).exists():
+			raise CommandError("Seed data already present; use a fresh database.")
+		scale = options["scale"]
+		counts = {
+			key: max(1, int(options[key] * scale))
+			for key in ("users", "groups", "notifications", "activities", "events", "announcements")
+		}
+		self.batch_size = options["batch_size"]
+		self.rng = random.Random(options["seed"])
+
+		with transaction.atomic():
+			user_ids = self._seed_users(counts["users"])
+			group_ids = self._seed_groups(counts["groups"])
+			members_by_group = self._seed_memberships(user_ids, group_ids)
+			self._seed_events(counts["events"], user_ids, group_ids)
+			self._seed_activities(counts["activities"], members_by_group)
+			self._seed_announcements(counts["announcements"], members_by_group)
+			self._seed_notifications(counts["notifications"], user_ids)
+
+		if not options["skip_derived"]:
+			self.stdout.write("Rebuilding announcement fan-out...")
+			rebuild_audience()
+			self.stdout.write("Rebuilding search index...")
+			from search.utils import rebuild_index
+
+			with transaction.atomic():
+				rebuild_index()
+		# bulk_create sends no signals, so invalidate cached data by hand
+		for namespace in NAMESPACE_MODELS:
+			bump(namespace)
+		self.stdout.write(self.style.SUCCESS("Seeded " + ", ".join(f"{n} {k}" for k, n in counts.items()) + "."))
+
+	def _insert(self, model, rows, label):
+		total = 0
+		for batch in _batched(rows, self.batch_size):
+			model.objects.bulk_create(batch, batch_size=self.batch_size)
+			total += len(batch)
+		self.stdout.write(f"  {label}: {total}")
+		return total
+
+	def _seed_users(self, n):
+		hashed = make_password(SEED_PASSWORD)
+		self._insert(
+			User,
+			(
+				User(
+					username=f"{SEED_PREFIX}user{i}",
+					email=f"{SEED_PREFIX}user{i}@example.org",
+					first_name=self.rng.choice(WORDS).title(),
+					password=hashed,
+					is_staff=(i == 0),
+				)
+				for i in range(n)
+			),
+			"users",
+		)
+		user_ids = list(
+			User.objects.filter(username__startswith=SEED_PREFIX).order_by("pk").values_list("pk", flat=True)
+		)
+		# The first seeded user is an admin; leaders are set in _seed_memberships
+		roles = {user_ids[0]: Profile.Role.ADMIN}
+		self._insert(
+			Profile,
+			(Profile(user_id=uid, role=roles.get(uid, Profile.Role.MEMBER)) for uid in user_ids),
+			"profiles",
+		)
+		return user_ids
+
+	def _seed_groups(self, n):
+		for name in BASE_GROUPS:
+			Group.objects.get_or_create(name=name)
+		self._insert(
+			Group,
+			(Group(name=f"{SEED_PREFIX}{_phrase(self.rng, 2)} {i}", description=_phrase(self.rng, 12)) for i in range(n)),
+			"groups",
+		)
+		return list(Group.objects.filter(name__startswith=SEED_PREFIX).values_list("pk", flat=True))
+
+	def _seed_memberships(self, user_ids, group_ids):
+		"""Each user joins one to four groups; the first member of each group leads it."""
+		members_by_group = {gid: [] for gid in group_ids}
+		pairs = []
+		for uid in user_ids:
+			for gid in self.rng.sample(group_ids, min(len(group_ids), self.rng.randint(1, 4))):
+				members_by_group[gid].append(uid)
+				pairs.append((uid, gid))
+		leaders = {(members[0], gid) for gid, members in members_by_group.items() if members}
+		base = dict(Group.objects.filter(name__in=BASE_GROUPS).values_list("name", "pk"))
+		admin_id = user_ids[0]
+		extra = [(uid, base["Members"]) for uid in user_ids]
+		extra += [(uid, base["Leaders"]) for uid, _ in leaders]
+		extra.append((admin_id, base["Admin"]))
+		self._insert(
+			GroupMembership,
+			(
+				GroupMembership(user_id=uid, group_id=gid, is_leader=(uid, gid) in leaders)
+				for uid, gid in pairs + list(dict.fromkeys(extra))
+			),
+			"memberships",
+		)
+		Profile.objects.filter(user_id__in=[uid for uid, _ in leaders]).exclude(role=Profile.Role.ADMIN).update(
+			role=Profile.Role.LEADER
+		)
+		return members_by_group
+
+	def _seed_events(self, n, user_ids, group_ids):
+		today = timezone.localdate()
+		rng = self.rng
+
+		def rows():
+			for i in range(n):
+				start = today + timedelta(days=rng.randint(-365, 365))
+				is_global = rng.random() < 0.05
+				yield Event(
+					title=_phrase(rng),
+					slug=f"{SEED_PREFIX.rstrip('_')}-event-{i}",
+					created_by_id=rng.choice(user_ids),
+					group_id=None if is_global else rng.choice(group_ids),
+					is_global=is_global,
+					start_date=start,
+					end_date=start + timedelta(days=rng.randint(0, 2)) if rng.random() < 0.3 else None,
+					start_time=time(rng.randint(6, 20), rng.choice((0, 30))) if rng.random() < 0.8 else None,
+					location=_phrase(rng, 2),
+					body=_phrase(rng, 40),
+				)
+
+		self._insert(Event, rows(), "events")
+
+	def _seed_activities(self, n, members_by_group):
+		today = timezone.localdate()
+		rng = self.rng
+		groups = [(gid, members) for gid, members in members_by_group.items() if members]
+
+		def rows():
+			for _ in range(n):
+				gid, members = rng.choice(groups)
+				yield GroupActivity(
+					group_id=gid,
+					created_by_id=members[0],
+					title=_phrase(rng),
+					kind=rng.choice(GroupActivity.Kind.values),
+					date=today - timedelta(days=rng.randint(0, 730)),
+					start_time=time(rng.randint(6, 20), 0),
+					location=_phrase(rng, 2),
+					attendance_count=rng.randint(3, 200),
+					notes=_phrase(rng, 20),
+				)
+
+		self._insert(GroupActivity, rows(), "activities")
+
+	def _seed_announcements(self, n, members_by_group):
+		rng = self.rng
+		groups = [(gid, members) for gid, members in members_by_group.items() if members]
+		visibilities = Announcement.Visibility.values
+
+		def rows():
+			for _ in range(n):
+				gid, members = rng.choice(groups)
+				visibility = rng.choice(visibilities)
+				yield Announcement(
+					title=_phrase(rng),
+					body=_phrase(rng, 30),
+					author_id=members[0],
+					group_id=None if visibility == Announcement.Visibility.PUBLIC else gid,
+					visibility=visibility,
+				)
+
+		self._insert(Announcement, rows(), "announcements")
+
+	def _seed_notifications(self, n, user_ids):
+		rng = self.rng
+		# Skewed so that some users have thousands of notifications
+		weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(user_ids))]
+		recipients = rng.choices(user_ids, weights=weights, k=n)
+		self._insert(
+			Notification,
+			(
+				Notification(
+					actor_id=rng.choice(user_ids),
+					recipient_id=uid,
+					text=_phrase(rng, 6)[:255],
+					url="/groups/",
+					read=rng.random() < 0.7,
+				)
+				for uid in recipients
+			),
+			"notifications",
+		)
@@ -0,0 +1,63 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Checkpoint the SQLite write-ahead log and refresh query planner statistics. "
+        "Schedule it periodically (e.g. nightly) when SQLITE_PRODUCTION is on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--checkpoint", choices=("PASSIVE", "FULL", "RESTART", "TRUNCATE"), default="TRUNCATE",
+            help="wal_checkpoint mode; TRUNCATE also shrinks the -wal file to zero bytes.",
+        )
+        parser.add_argument("--vacuum", action="store_true", help="Also VACUUM (rewrites the file; takes the write lock).")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError(f"Database '{options['database']}' is not SQLite.")
+        path = str(connection.settings_dict["NAME"])
+        wal = f"{path}-wal"
+        before = _size(path), _size(wal)
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            mode = cursor.fetchone()[0]
+            start = time.perf_counter()
+            # Analyses only the tables whose statistics are stale
+            cursor.execute("PRAGMA optimize")
+            if options["vacuum"]:
+                cursor.execute("VACUUM")
+            # Last, so pages written by VACUUM are folded back too
+            if mode == "wal":
+                cursor.execute(f"PRAGMA wal_checkpoint({options['checkpoint']})")
+                busy, log_frames, checkpointed = cursor.fetchone()
+                self.stdout.write(
+                    f"Checkpoint {options['checkpoint']}: {checkpointed}/{log_frames} frames"
+                    + (" (blocked by readers; rerun later)" if busy else "")
+                )
+            else:
+                self.stdout.write(f"Journal mode is {mode}; no WAL to checkpoint.")
+            elapsed = (time.perf_counter() - start) * 1000
+
+        after = _size(path), _size(wal)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done in {elapsed:.0f}ms. Database {before[0] // 1024} -> {after[0] // 1024} KiB, "
+                f"WAL {before[1] // 1024} -> {after[1] // 1024} KiB."
+            )
+        )
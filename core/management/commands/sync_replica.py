@@ -0,0 +1,43 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over the replica file using SQLite's online backup API. "
+        "Stands in for real replication when testing core.routers locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=1024, help="Pages copied per backup step.")
+
+    def handle(self, *args, **options):
+        alias = settings.REPLICA_DATABASE
+        if not alias:
+            raise CommandError("No replica configured; set DB_REPLICA_NAME.")
+        primary, replica = connections["default"], connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_replica only copies SQLite files; use the database's own replication.")
+        if str(primary.settings_dict["NAME"]) == str(replica.settings_dict["NAME"]):
+            raise CommandError("The replica points at the primary's file.")
+
+        replica.close()
+        start = time.perf_counter()
+        source = sqlite3.connect(primary.settings_dict["NAME"])
+        target = sqlite3.connect(replica.settings_dict["NAME"])
+        try:
+            # Online backup: readers and writers on the primary are not blocked for the whole copy
+            source.backup(target, pages=options["pages"])
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']} "
+                f"in {(time.perf_counter() - start) * 1000:.0f}ms."
+            )
+        )
@@ -0,0 +1,280 @@
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import compression
+from .models import RequestProfile
+from .queries import QueryBudgetExceeded, record_queries
+
+logger = logging.getLogger("pcg.queries")
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware that can also run in an async middleware chain.
+
+    WhiteNoise's own middleware is sync-only, so under ASGI Django would adapt
+    every request through it onto the single thread-sensitive executor, which
+    serialises the async views behind it. Static lookups are an in-memory
+    dict hit; only opening a matched file is handed to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for dynamic text responses (HTML, JSON, CSV, ...).
+
+    Negotiates from Accept-Encoding, preferring Brotli. Skips bodies under
+    COMPRESSION_MIN_SIZE, responses that already carry a Content-Encoding
+    (or ask for no-transform), partial and empty responses, media types that
+    do not compress, and event streams. Streaming responses, sync or async,
+    are compressed incrementally. Static files never get here: WhiteNoise
+    answers them earlier with its precompressed copies.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        sizes = self._compress(request, response)
+        if sizes:
+            compression.record(*sizes)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        sizes = self._compress(request, response)
+        if sizes:
+            await compression.arecord(*sizes)
+        return response
+
+    def _compress(self, request, response):
+        """Encode ``response`` in place; returns (encoding, bytes in, bytes out) for a body compressed now."""
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return None
+        if response.has_header("Content-Encoding") or "no-transform" in response.get("Cache-Control", ""):
+            return None
+        if not compression.is_compressible(response.get("Content-Type", "")):
+            return None
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return None
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return None
+
+        sizes = None
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            # Unknown until the last chunk is out
+            del response.headers["Content-Length"]
+        else:
+            body = compression.compress_body(response.content, encoding)
+            if len(body) >= len(response.content):
+                return None
+            sizes = (encoding, len(response.content), len(body))
+            response.content = body
+            response.headers["Content-Length"] = str(len(body))
+
+        # The encoded bytes differ from the identity ones, so a strong ETag must weaken
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return sizes
+
+
+class ReplicaStickinessMiddleware:
+    """Pin a client's reads to the primary for a while after it writes.
+
+    Any unsafe request sets the REPLICA_STICKY_COOKIE cookie for
+    REPLICA_STICKY_SECONDS; core.routers.use_replica skips the replica while
+    it is present. Removed at startup when no replica is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._mark(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._mark(request, await self.get_response(request))
+
+    def _mark(self, request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
+
+
+class QueryInspectorMiddleware:
+    """Record query count, DB time and repeated SQL for every request.
+
+    Results go out as a ``Server-Timing`` header (visible in the browser's
+    network panel) and one structured log line per request on the
+    ``pcg.queries`` logger. A fingerprint repeated QUERY_REPEAT_THRESHOLD times
+    is logged as a likely N+1. Views decorated with core.queries.query_budget
+    are checked against their budget. Disabled entirely unless QUERY_INSPECTOR
+    is set, so production pays nothing for it.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries", app;dur={total_ms - db_ms:.1f}'
+        )
+        view = getattr(request, "_inspected_view", "-")
+        logger.info(
+            "request path=%s view=%s status=%s queries=%d db_ms=%.1f total_ms=%.1f",
+            request.path, view, response.status_code, recorder.count, db_ms, total_ms,
+        )
+        for sql, count in recorder.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                "n_plus_one path=%s view=%s count=%d db_ms=%.1f sql=%r",
+                request.path, view, count, recorder.fingerprint_time[sql] * 1000, sql,
+            )
+
+        budget = getattr(request, "_query_budget", None)
+        if budget is not None and recorder.count > budget:
+            message = f"{view} issued {recorder.count} queries (budget {budget}) for {request.path}"
+            if settings.QUERY_INSPECTOR_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning("query_budget_exceeded %s", message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._inspected_view = f"{view_func.__module__}.{view_func.__qualname__}"
+        request._query_budget = getattr(view_func, "query_budget", None)
+
+
+class ProfilerMiddleware:
+    """Run selected requests' views under cProfile and keep the results.
+
+    A request is profiled when an admin sends the PROFILER_HEADER header or the
+    PROFILER_PARAM query parameter, or at random with probability
+    PROFILER_SAMPLE_RATE. Captures are stored as core.models.RequestProfile and
+    only the newest PROFILER_KEEP are kept. Unless PROFILER_ENABLED is set the
+    middleware removes itself at startup. Keep it last in MIDDLEWARE so every
+    other process_view hook has already run.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = "HTTP_" + settings.PROFILER_HEADER.upper().replace("-", "_")
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _trigger(self, request):
+        if self.header in request.META or settings.PROFILER_PARAM in request.GET:
+            from groups.views import is_admin_user
+
+            if is_admin_user(request.user):
+                return RequestProfile.Trigger.HEADER if self.header in request.META else RequestProfile.Trigger.PARAM
+        if settings.PROFILER_SAMPLE_RATE and random.random() < settings.PROFILER_SAMPLE_RATE:
+            return RequestProfile.Trigger.SAMPLE
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func):
+            # cProfile follows one thread's stack, not an awaited coroutine
+            return None
+        trigger = self._trigger(request)
+        if trigger is None:
+            return None
+        # Deferred so cProfile/pstats are not imported on every cold start
+        from .profiling import collapsed_stacks, run_profiled, top_functions
+
+        def call_view():
+            response = view_func(request, *view_args, **view_kwargs)
+            # Include template rendering of TemplateResponses in the profile
+            if callable(getattr(response, "render", None)):
+                response = response.render()
+            return response
+
+        start = time.perf_counter()
+        response, stats = run_profiled(call_view)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.path[:500],
+            view=f"{view_func.__module__}.{view_func.__qualname__}"[:255],
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            trigger=trigger,
+            top_functions=top_functions(stats),
+            collapsed_stacks=collapsed_stacks(stats),
+        )
+        stale = RequestProfile.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)[settings.PROFILER_KEEP:]
+        RequestProfile.objects.filter(pk__in=list(stale)).delete()
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
@@ -1,3 +1,26 @@
 from django.db import models
 
-# Create your models here.
+
+class RequestProfile(models.Model):
+	"""One cProfile capture of a view, kept in a ring buffer of PROFILER_KEEP rows."""
+
+	class Trigger(models.TextChoices):
+		HEADER = "HEADER", "Header"
+		PARAM = "PARAM", "Query parameter"
+		SAMPLE = "SAMPLE", "Sampled"
+
+	created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+	method = models.CharField(max_length=10)
+	path = models.CharField(max_length=500)
+	view = models.CharField(max_length=255)
+	status_code = models.PositiveSmallIntegerField()
+	duration_ms = models.FloatField()
+	trigger = models.CharField(max_length=10, choices=Trigger.choices)
+	top_functions = models.JSONField(default=list)
+	collapsed_stacks = models.TextField(blank=True)
+
+	class Meta:
+		ordering = ["-created_at"]
+
+	def __str__(self) -> str:
+		return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,117 @@
+"""Full-response cache for anonymous visitors.
+
+Only GET/HEAD requests that carry no cookies (other than the CSRF cookie) are
+served from or stored in the cache, so every response here is the same HTML
+any anonymous visitor would get. The CSRF token in cached pages is replaced by
+a placeholder and filled in per request, so the sidebar sign-in form keeps
+working. Keys carry the generations of the namespaces anonymous pages are
+built from (see core.caching), so model signals purge them without wildcard
+deletes. Async views get an async wrapper that uses the cache's async API.
+"""
+import re
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_vary_headers
+
+from .caching import anamespaced_key, arecord, bump, namespaced_key, record
+
+PAGE_CACHE_NAMESPACES = ("pages", "announcements", "events", "groups")
+PAGE_CACHE_HEADER = "X-Page-Cache"
+
+_CSRF_INPUT_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+_CSRF_PLACEHOLDER = b"__pagecache_csrf_token__"
+
+
+def purge_page_cache() -> None:
+    bump("pages")
+
+
+def _is_anonymous_request(request) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    # No session, messages or other cookies: the page cannot be personalised
+    return set(request.COOKIES) <= {settings.CSRF_COOKIE_NAME}
+
+
+def _page_key(request) -> str:
+    return namespaced_key(PAGE_CACHE_NAMESPACES, request.get_host(), request.get_full_path())
+
+
+async def _apage_key(request) -> str:
+    return await anamespaced_key(PAGE_CACHE_NAMESPACES, request.get_host(), request.get_full_path())
+
+
+def _response_from_entry(request, entry: dict) -> HttpResponse:
+    content = entry["content"]
+    if _CSRF_PLACEHOLDER in content:
+        content = content.replace(_CSRF_PLACEHOLDER, get_token(request).encode("ascii"))
+    return HttpResponse(content, content_type=entry["content_type"])
+
+
+def _entry_from_response(response) -> dict | None:
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return None
+    content = _CSRF_INPUT_RE.sub(rb"\g<1>" + _CSRF_PLACEHOLDER + rb"\g<2>", response.content)
+    return {"content": content, "content_type": response["Content-Type"]}
+
+
+def cache_anonymous_page(view_func):
+    """Serve identical HTML/JSON to anonymous, cookie-less visitors from the cache.
+
+    Adds an ``X-Page-Cache`` header of HIT, MISS or BYPASS so hit rates can be
+    read straight from the request logs.
+    """
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def _awrapped_view(request, *args, **kwargs):
+            if not _is_anonymous_request(request):
+                response = await view_func(request, *args, **kwargs)
+                response[PAGE_CACHE_HEADER] = "BYPASS"
+                return response
+
+            key = await _apage_key(request)
+            entry = await cache.aget(key)
+            await arecord("pages", entry is not None)
+            if entry is not None:
+                response = _response_from_entry(request, entry)
+                response[PAGE_CACHE_HEADER] = "HIT"
+            else:
+                response = await view_func(request, *args, **kwargs)
+                entry = _entry_from_response(response)
+                if entry is not None:
+                    await cache.aset(key, entry, settings.PAGE_CACHE_TIMEOUT)
+                response[PAGE_CACHE_HEADER] = "MISS"
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return _awrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not _is_anonymous_request(request):
+            response = view_func(request, *args, **kwargs)
+            response[PAGE_CACHE_HEADER] = "BYPASS"
+            return response
+
+        key = _page_key(request)
+        entry = cache.get(key)
+        record("pages", entry is not None)
+        if entry is not None:
+            response = _response_from_entry(request, entry)
+            response[PAGE_CACHE_HEADER] = "HIT"
+        else:
+            response = view_func(request, *args, **kwargs)
+            entry = _entry_from_response(response)
+            if entry is not None:
+                cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+            response[PAGE_CACHE_HEADER] = "MISS"
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+    return _wrapped_view
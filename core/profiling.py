@@ -0,0 +1,83 @@
+"""cProfile helpers for core.middleware.ProfilerMiddleware.
+
+cProfile records a call graph rather than stacks, so ``collapsed_stacks``
+rebuilds flamegraph-style "a;b;c weight" lines by walking the graph from its
+roots and splitting each function's time across callers in proportion to
+how much of it each caller accounted for. The result reads like the output
+of a sampling profiler and can be fed to flamegraph.pl or speedscope.
+"""
+import cProfile
+import os
+import pstats
+
+TOP_FUNCTIONS = 30
+MAX_STACK_DEPTH = 64
+# Paths worth less than this are dropped, which also bounds the graph walk
+MIN_PATH_SECONDS = 20e-6
+
+
+def run_profiled(func, *args, **kwargs):
+    """Call ``func`` under cProfile; return its result and the resulting pstats.Stats."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    return result, pstats.Stats(profiler)
+
+
+def _label(func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-ins are reported as ('~', 0, '<built-in method ...>')
+        return name
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def top_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> list[dict]:
+    """The ``limit`` functions with the most inclusive time, as plain dicts for JSON storage."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": _label(func),
+            "calls": nc,
+            "primitive_calls": cc,
+            "tottime_ms": round(tt * 1000, 3),
+            "cumtime_ms": round(ct * 1000, 3),
+        }
+        for func, (cc, nc, tt, ct, callers) in rows
+    ]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> str:
+    """Fold the call graph into "frame;frame;frame microseconds" lines."""
+    callees = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge))
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+
+    folded = {}
+
+    def walk(func, path, share):
+        # share: the fraction of func's total time attributable to this path
+        cc, nc, tt, ct, callers = stats.stats[func]
+        path = path + (_label(func),)
+        own = tt * share
+        if own:
+            key = ";".join(path)
+            folded[key] = folded.get(key, 0.0) + own
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, (ecc, enc, ett, ect) in callees.get(func, ()):
+            callee_ct = stats.stats[callee][3]
+            if share * ect < MIN_PATH_SECONDS or _label(callee) in path:
+                continue
+            walk(callee, path, share * ect / callee_ct)
+
+    for root in roots:
+        walk(root, (), 1.0)
+
+    lines = []
+    for stack, seconds in sorted(folded.items()):
+        micros = int(seconds * 1_000_000)
+        if micros:
+            lines.append(f"{stack} {micros}")
+    return "\n".join(lines)
@@ -0,0 +1,78 @@
+"""Per-request SQL recording: counts, timings and repeated-statement fingerprints.
+
+Used by core.middleware.QueryInspectorMiddleware. A fingerprint is the SQL
+with literals and IN-lists collapsed, so the same query issued for every row
+of a loop (the usual N+1 shape) shows up as one fingerprint with a high count.
+"""
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|\d+)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view issues more queries than its declared budget."""
+
+
+def fingerprint(sql: str) -> str:
+    sql = _STRING_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """A connection execute_wrapper that tallies every statement it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.fingerprint_time = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = fingerprint(sql)
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[key] += 1
+            self.fingerprint_time[key] += elapsed
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints issued at least ``threshold`` times, most frequent first."""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+
+@contextmanager
+def record_queries():
+    """Record the queries issued on every configured database inside the block."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def query_budget(max_queries: int):
+    """Declare how many queries a view may issue per request.
+
+    Exceeding it is logged by QueryInspectorMiddleware, and raises
+    QueryBudgetExceeded when QUERY_INSPECTOR_STRICT is on (as in tests).
+    """
+
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+
+    return decorator
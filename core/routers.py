@@ -0,0 +1,86 @@
+"""Read-replica routing for read-heavy views.
+
+Nothing goes to the replica by default. A view decorated with ``use_replica``
+runs its safe (GET/HEAD) requests with reads routed to the REPLICA_DATABASE
+alias; writes always go to ``default``. After a client sends an unsafe
+request, ReplicaStickinessMiddleware sets a short-lived cookie and, while it
+is present, that client's reads stay on the primary, so users see their own
+writes even if the replica lags.
+
+Locally the replica can be a second SQLite file kept current with
+``manage.py sync_replica``.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+# Alias reads are routed to for the current request, if any
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+# Apps whose reads must never see replica lag
+PRIMARY_ONLY_APPS = {"sessions"}
+
+
+def current_read_alias() -> str | None:
+    return _read_alias.get()
+
+
+def _replica_for(request) -> str | None:
+    alias = settings.REPLICA_DATABASE
+    if not alias or request.method not in ("GET", "HEAD"):
+        return None
+    if settings.REPLICA_STICKY_COOKIE in request.COOKIES:
+        return None
+    return alias
+
+
+def use_replica(view_func):
+    """Route the view's reads to the replica, unless the client has just written."""
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def _awrapped_view(request, *args, **kwargs):
+            # Context is copied into the threads the async ORM runs queries in
+            token = _read_alias.set(_replica_for(request))
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+
+        return _awrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        token = _read_alias.set(_replica_for(request))
+        try:
+            response = view_func(request, *args, **kwargs)
+            # Render lazy TemplateResponses while the alias is still set
+            if callable(getattr(response, "render", None)):
+                response = response.render()
+            return response
+        finally:
+            _read_alias.reset(token)
+
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return "default"
+        # Explicit, so instances loaded from the replica do not pull their
+        # relations from it outside a use_replica view
+        return _read_alias.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copied from the primary, never migrated directly
+        return db == "default"
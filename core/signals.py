@@ -0,0 +1,23 @@
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .caching import NAMESPACE_MODELS, SCOPE_FIELDS, bump
+
+
+def _bump_namespace(namespace: str, scope_field: str | None):
+    def receiver(sender, instance, **kwargs):
+        if scope_field is None:
+            bump(namespace)
+        else:
+            # Per-user families only invalidate the affected user's entries
+            bump(namespace, getattr(instance, scope_field))
+
+    return receiver
+
+
+for _namespace, _labels in NAMESPACE_MODELS.items():
+    for _label in _labels:
+        _model = apps.get_model(_label)
+        _receiver = _bump_namespace(_namespace, SCOPE_FIELDS.get(_label))
+        post_save.connect(_receiver, sender=_model, weak=False, dispatch_uid=f"cache_bump_{_label}")
+        post_delete.connect(_receiver, sender=_model, weak=False, dispatch_uid=f"cache_bump_{_label}")
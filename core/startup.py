@@ -0,0 +1,72 @@
+"""Cold-start measurement for the serverless entry point.
+
+Each measurement runs in a fresh interpreter (that is what a cold lambda
+is), importing PCG_APP.wsgi the way Vercel does and then loading the URLconf,
+which Django otherwise defers to the first request. With ``importtime`` the
+interpreter's ``-X importtime`` report is parsed so the slowest imports can
+be shown; it adds overhead, so timing runs leave it off.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+_PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "PCG_APP.settings")
+import PCG_APP.wsgi
+imported = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+done = time.perf_counter()
+print(json.dumps({
+    "wsgi_ms": (imported - start) * 1000,
+    "urlconf_ms": (done - imported) * 1000,
+    "total_ms": (done - start) * 1000,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> list[dict]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+            rows.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+        except ValueError:
+            # The header line ("self [us] | cumulative | imported package")
+            continue
+    return rows
+
+
+def measure_cold_start(importtime: bool = False) -> dict:
+    """Start a new interpreter, import the WSGI app and URLconf, and report timings."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "PCG_APP.settings"))
+    flags = ["-X", "importtime"] if importtime else []
+    proc = subprocess.run(
+        [sys.executable, *flags, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        cwd=settings.BASE_DIR,
+        env=env,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = _parse_importtime(proc.stderr) if importtime else []
+    return result
+
+
+def local_imports(imports: list[dict]) -> list[dict]:
+    """The project's own modules from an import list, slowest (self time) first."""
+    roots = {name.split(".")[0] for name in settings.INSTALLED_APPS} | {"PCG_APP"}
+    return sorted(
+        (row for row in imports if row["module"].split(".")[0] in roots and not row["module"].startswith("django")),
+        key=lambda row: row["self_ms"],
+        reverse=True,
+    )
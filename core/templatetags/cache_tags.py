@@ -0,0 +1,21 @@
+from django import template
+
+from core.caching import generations
+
+register = template.Library()
+
+
+@register.simple_tag
+def cache_generations(*namespaces, scope=None):
+    """Current generations of cache namespaces, for use as a {% cache %} vary-on key.
+
+        {% cache_generations "accounts" "notifications" scope=request.user.pk as version %}
+        {% cache 600 sidebar request.user.pk version %}...{% endcache %}
+
+    With ``scope`` each namespace contributes both its global and its scoped
+    generation, so either kind of bump changes the result.
+    """
+    pairs = [(ns, None) for ns in namespaces]
+    if scope is not None:
+        pairs += [(ns, scope) for ns in namespaces]
+    return ".".join(str(g) for g in generations(pairs))
@@ -0,0 +1,40 @@
+"""Test-suite plumbing shared by every app's tests.
+
+``TestRunner`` (settings.TEST_RUNNER) serves static files through Django's
+plain storage, so pages render without ``collectstatic`` having written the
+hashed-asset manifest; the manifest itself is checked by the
+``check_static_assets`` command and its tests. ``TemporaryMediaMixin`` gives
+tests that write uploads a media root of their own.
+"""
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+PLAIN_STATIC_STORAGE = {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._static_storage = override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC_STORAGE})
+        self._static_storage.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._static_storage.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class TemporaryMediaMixin:
+    """Point MEDIA_ROOT at a fresh directory for each test, removed afterwards.
+
+    ``self.tmp`` is the scratch directory; the media root is its ``media``
+    subdirectory, so a test can put other scratch paths beside it.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(MEDIA_ROOT=self.tmp / "media"))
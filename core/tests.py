@@ -1,3 +1,553 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.test import LiveServerTestCase, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.middleware import CachedAuthenticationMiddleware
+from events.models import Event, EventImage
+from groups.models import Group, GroupMembership
+from notifications.models import Notification
+from notifications.views import unread_count
+from .caching import cached_queryset, get_or_set, stats
+from .compression import negotiate
+from .logstream import LatencyHistogram, LogSummary, iter_records
+from .middleware import CompressionMiddleware, ProfilerMiddleware, QueryInspectorMiddleware, ReplicaStickinessMiddleware
+from .models import RequestProfile
+from .pagecache import PAGE_CACHE_HEADER
+from .queries import QueryBudgetExceeded, fingerprint, query_budget
+from .routers import ReplicaRouter, use_replica
+from .startup import measure_cold_start
+
+
+class ColdStartTests(SimpleTestCase):
+	def test_cold_start_within_budget(self):
+		# Best of three, so one noisy run on a shared CI box does not fail the build
+		best = min(measure_cold_start()["total_ms"] for _ in range(3))
+		self.assertLessEqual(
+			best,
+			settings.COLD_START_BUDGET_MS,
+			f"Cold start took {best:.0f}ms; run `manage.py profile_startup` to see which imports grew.",
+		)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class ReplicaRoutingTests(SimpleTestCase):
+
+	def setUp(self):
+		self.factory = RequestFactory()
+
+		@use_replica
+		def view(request):
+			return HttpResponse(ReplicaRouter().db_for_read(Event))
+
+		self.view = view
+
+	def test_safe_requests_read_from_replica(self):
+		self.assertEqual(self.view(self.factory.get("/")).content, b"replica")
+
+	def test_unsafe_requests_read_from_primary(self):
+		self.assertEqual(self.view(self.factory.post("/")).content, b"default")
+
+	def test_recent_writers_read_from_primary(self):
+		request = self.factory.get("/")
+		request.COOKIES[settings.REPLICA_STICKY_COOKIE] = "1"
+		self.assertEqual(self.view(request).content, b"default")
+
+	def test_reads_outside_decorated_views_use_primary(self):
+		self.view(self.factory.get("/"))
+		self.assertEqual(ReplicaRouter().db_for_read(Event), "default")
+
+	def test_writes_pin_the_next_reads_to_primary(self):
+		sticky = ReplicaStickinessMiddleware(self.view)
+		self.assertNotIn(settings.REPLICA_STICKY_COOKIE, sticky(self.factory.get("/")).cookies)
+		cookie = sticky(self.factory.post("/")).cookies[settings.REPLICA_STICKY_COOKIE]
+		self.assertEqual(cookie["max-age"], settings.REPLICA_STICKY_SECONDS)
+
+		request = self.factory.get("/")
+		request.COOKIES[settings.REPLICA_STICKY_COOKIE] = cookie.value
+		self.assertEqual(sticky(request).content, b"default")
+
+	@override_settings(REPLICA_DATABASE=None)
+	def test_stickiness_is_off_without_a_replica(self):
+		with self.assertRaises(MiddlewareNotUsed):
+			ReplicaStickinessMiddleware(self.view)
+
+
+class ConditionalGetTests(TestCase):
+	def setUp(self):
+		user = User.objects.create_user("conditional", password="pw")
+		group = Group.objects.create(name="Conditional")
+		GroupMembership.objects.create(user=user, group=group)
+		self.event = Event.objects.create(title="Revalidated", group=group, start_date=datetime.date.today())
+		self.url = f"/events/{self.event.slug}/"
+		self.client.force_login(user)
+
+	def test_unchanged_page_revalidates_with_one_aggregate(self):
+		etag = self.client.get(self.url)["ETag"]
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(response.status_code, 304)
+		# The session and user lookups plus the max(updated_at) aggregate
+		self.assertEqual(len(queries), 3)
+
+	def test_gallery_change_invalidates_etag(self):
+		etag = self.client.get(self.url)["ETag"]
+		EventImage.objects.create(event=self.event, image="events/x.jpg")
+		self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SidebarCacheTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.user = User.objects.create_user("sidebar", first_name="Ama", password="pw")
+		self.client.force_login(self.user)
+
+	def test_sidebar_fragment_follows_account_changes(self):
+		self.assertContains(self.client.get("/notifications/"), "Hello, Ama")
+		self.user.first_name = "Abena"
+		self.user.save()
+		self.assertContains(self.client.get("/notifications/"), "Hello, Abena")
+
+	def test_app_templates_are_found(self):
+		# check_static_assets and the loaders both rely on the app template directories
+		dirs = {str(d) for d in engines["django"].template_dirs}
+		self.assertIn(str(Path(settings.BASE_DIR) / "core" / "templates"), dirs)
+
+
+class CheckStaticAssetsTests(SimpleTestCase):
+	def setUp(self):
+		self.root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.root)
+		# A manifest that knows one file, which base.html does not use
+		with open(Path(self.root) / "staticfiles.json", "w") as fh:
+			json.dump({"version": "1.1", "paths": {"css/other.css": "css/other.0123456789ab.css"}, "hash": "x"}, fh)
+
+	def check(self):
+		# The manifest storage production uses; the test runner swaps in the plain one
+		manifest_storage = {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}
+		with self.settings(STATIC_ROOT=self.root, STORAGES={**settings.STORAGES, "staticfiles": manifest_storage}):
+			call_command("check_static_assets", stdout=io.StringIO())
+
+	def test_missing_asset_fails_the_check(self):
+		with self.assertRaisesMessage(CommandError, "{% static 'css/styles.css' %} is not in the manifest"):
+			self.check()
+
+	def test_app_templates_are_scanned_without_app_dirs(self):
+		loaders = {**settings.TEMPLATES[0], "APP_DIRS": False, "OPTIONS": {
+			**settings.TEMPLATES[0]["OPTIONS"],
+			"loaders": ["django.template.loaders.app_directories.Loader"],
+		}}
+		with self.settings(TEMPLATES=[loaders]):
+			with self.assertRaisesMessage(CommandError, "css/styles.css"):
+				self.check()
+
+
+@override_settings(PROFILER_ENABLED=True, PROFILER_SAMPLE_RATE=1.0)
+class ProfilerMiddlewareTests(TestCase):
+
+	def setUp(self):
+		self.middleware = ProfilerMiddleware(lambda request: HttpResponse())
+		self.request = RequestFactory().get("/")
+
+	def test_sync_views_are_profiled(self):
+		response = self.middleware.process_view(self.request, lambda request: HttpResponse("ok"), (), {})
+		self.assertEqual(response["X-Profile-Id"], str(RequestProfile.objects.get().pk))
+
+	def test_async_views_are_left_alone(self):
+		self.assertIsNone(self.middleware.process_view(self.request, unread_count, (), {}))
+		self.assertFalse(RequestProfile.objects.exists())
+
+	@override_settings(PROFILER_KEEP=2)
+	def test_captures_name_the_view_and_keep_only_the_newest(self):
+		def slow_view(request):
+			sum(i * i for i in range(20000))
+			return HttpResponse("ok")
+
+		for _ in range(3):
+			self.middleware.process_view(self.request, slow_view, (), {})
+		self.assertEqual(RequestProfile.objects.count(), 2)
+		profile = RequestProfile.objects.first()
+		self.assertEqual(profile.trigger, RequestProfile.Trigger.SAMPLE)
+		self.assertTrue(any("slow_view" in row["function"] for row in profile.top_functions))
+		self.assertIn("(slow_view)", profile.collapsed_stacks)
+
+	@override_settings(PROFILER_SAMPLE_RATE=0.0)
+	def test_only_admins_can_request_a_profile(self):
+		request = RequestFactory().get("/", {"_profile": "1"})
+		request.user = User.objects.create_user("member", password="pw")
+		self.assertIsNone(self.middleware.process_view(request, lambda request: HttpResponse(), (), {}))
+		request.user = User.objects.create_user("staff", password="pw", is_staff=True)
+		self.middleware.process_view(request, lambda request: HttpResponse(), (), {})
+		self.assertEqual(RequestProfile.objects.get().trigger, RequestProfile.Trigger.PARAM)
+
+	def test_stacks_download_needs_view_permission(self):
+		self.middleware.process_view(self.request, lambda request: HttpResponse("ok"), (), {})
+		url = reverse("admin:core_requestprofile_stacks", args=[RequestProfile.objects.get().pk])
+		self.client.force_login(User.objects.create_user("staff", password="pw", is_staff=True))
+		self.assertEqual(self.client.get(url).status_code, 403)
+		self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+		response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+
+
+class CompressionTests(SimpleTestCase):
+	body = b"<p>" + b"hello compression " * 200 + b"</p>"
+
+	def setUp(self):
+		self.factory = RequestFactory(headers={"accept-encoding": "gzip"})
+
+	def test_negotiation_prefers_brotli_and_honours_weights(self):
+		self.assertEqual(negotiate("gzip, deflate, br"), "br")
+		self.assertEqual(negotiate("br;q=0.2, gzip;q=0.8"), "gzip")
+		self.assertIsNone(negotiate("identity"))
+
+	def test_small_and_encoded_bodies_pass_through(self):
+		small = CompressionMiddleware(lambda request: HttpResponse(b"tiny"))(self.factory.get("/"))
+		self.assertFalse(small.has_header("Content-Encoding"))
+
+		def png(request):
+			return HttpResponse(self.body, content_type="image/png")
+
+		self.assertFalse(CompressionMiddleware(png)(self.factory.get("/")).has_header("Content-Encoding"))
+
+	def test_streaming_sync_and_async(self):
+		def sync_view(request):
+			return StreamingHttpResponse(iter([self.body, self.body]), content_type="text/csv")
+
+		async def async_view(request):
+			async def chunks():
+				yield self.body
+				yield self.body
+
+			return StreamingHttpResponse(chunks(), content_type="text/csv")
+
+		response = CompressionMiddleware(sync_view)(self.factory.get("/"))
+		self.assertEqual(response["Content-Encoding"], "gzip")
+		self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.body * 2)
+
+		async def consume():
+			response = await CompressionMiddleware(async_view)(self.factory.get("/"))
+			return response, b"".join([chunk async for chunk in response.streaming_content])
+
+		response, data = asyncio.run(consume())
+		self.assertEqual(response["Content-Encoding"], "gzip")
+		self.assertEqual(gzip.decompress(data), self.body * 2)
+
+
+class PageCacheTests(TestCase):
+	def setUp(self):
+		cache.clear()
+
+	def test_anonymous_pages_are_cached_until_a_model_changes(self):
+		self.assertEqual(self.client.get("/groups/")[PAGE_CACHE_HEADER], "MISS")
+		response = self.client.get("/groups/")
+		self.assertEqual(response[PAGE_CACHE_HEADER], "HIT")
+		self.assertNotContains(response, "Newcomers")
+
+		Group.objects.create(name="Newcomers")
+		response = self.client.get("/groups/")
+		self.assertEqual(response[PAGE_CACHE_HEADER], "MISS")
+		self.assertContains(response, "Newcomers")
+
+	def test_signed_in_visitors_bypass_the_cache(self):
+		self.client.get("/groups/")
+		self.client.force_login(User.objects.create_user("member", password="pw"))
+		self.assertEqual(self.client.get("/groups/")[PAGE_CACHE_HEADER], "BYPASS")
+
+
+def _on_event_loop():
+	try:
+		asyncio.get_running_loop()
+	except RuntimeError:
+		return False
+	return True
+
+
+# QueryInspectorMiddleware is sync-only; left on, it would run the chain in sync mode
+@override_settings(QUERY_INSPECTOR=False, REPLICA_DATABASE="replica")
+class AsyncMiddlewareTests(TestCase):
+	async def test_static_files_are_served_without_the_sync_middleware(self):
+		with patch("whitenoise.middleware.WhiteNoiseMiddleware.__call__", side_effect=AssertionError("sync path")):
+			response = await self.async_client.get(settings.STATIC_URL + "css/styles.css")
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(b"".join(response.streaming_content), Path(settings.STATIC_ROOT, "css", "styles.css").read_bytes())
+
+	async def test_middleware_runs_on_the_event_loop(self):
+		seen = {}
+
+		def record(method):
+			def wrapper(middleware, *args):
+				seen[method.__qualname__] = _on_event_loop()
+				return method(middleware, *args)
+			return wrapper
+
+		hooks = (
+			(CachedAuthenticationMiddleware, "process_request"),
+			(CompressionMiddleware, "_compress"),
+			(ReplicaStickinessMiddleware, "_mark"),
+		)
+		patches = [patch.object(cls, name, record(getattr(cls, name))) for cls, name in hooks]
+		for p in patches:
+			p.start()
+			self.addCleanup(p.stop)
+
+		response = await self.async_client.post(reverse("groups:groups_api"))
+		self.assertEqual(response.status_code, 200)
+		self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+		self.assertEqual(seen, {
+			"CachedAuthenticationMiddleware.process_request": True,
+			"CompressionMiddleware._compress": True,
+			"ReplicaStickinessMiddleware._mark": True,
+		})
+
+
+class NamespacedCacheTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.alice = User.objects.create_user("alice", password="pw")
+		self.bob = User.objects.create_user("bob", password="pw")
+
+	def test_saving_a_model_invalidates_its_namespace(self):
+		@cached_queryset("groups")
+		def group_names():
+			return Group.objects.order_by("name").values_list("name", flat=True)
+
+		Group.objects.create(name="Choir")
+		with self.assertNumQueries(1):
+			self.assertEqual(group_names(), ["Choir"])
+		with self.assertNumQueries(0):
+			self.assertEqual(group_names(), ["Choir"])
+		Group.objects.create(name="Ushers")
+		with self.assertNumQueries(1):
+			self.assertEqual(group_names(), ["Choir", "Ushers"])
+
+	def test_scoped_entries_are_invalidated_per_user(self):
+		@cached_queryset("notifications", scope=lambda user: user.pk)
+		def unread_for(user):
+			return Notification.objects.filter(recipient=user, read=False).values_list("text", flat=True)
+
+		unread_for(self.alice)
+		unread_for(self.bob)
+		Notification.objects.create(recipient=self.alice, text="Welcome")
+		with self.assertNumQueries(0):
+			self.assertEqual(unread_for(self.bob), [])
+		with self.assertNumQueries(1):
+			self.assertEqual(unread_for(self.alice), ["Welcome"])
+
+	@override_settings(CACHE_STATS=True)
+	def test_hits_and_misses_are_counted(self):
+		get_or_set("events", ("stats",), lambda: 1)
+		get_or_set("events", ("stats",), lambda: 2)
+		self.assertEqual({k: v for k, v in stats()["events"].items() if k != "generation"}, {"hits": 1, "misses": 1})
+
+
+@override_settings(QUERY_INSPECTOR=True, QUERY_REPEAT_THRESHOLD=3)
+class QueryInspectorTests(TestCase):
+	def setUp(self):
+		@query_budget(2)
+		def group_view(request):
+			for pk in range(4):
+				Group.objects.filter(pk=pk).exists()
+			return HttpResponse()
+
+		self.view = group_view
+		self.request = RequestFactory().get("/groups/")
+
+	def run_view(self):
+		middleware = QueryInspectorMiddleware(lambda request: self.view(request))
+		middleware.process_view(self.request, self.view, (), {})
+		return middleware(self.request)
+
+	def test_fingerprints_collapse_literals(self):
+		self.assertEqual(
+			fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x''y' LIMIT 21"),
+			"SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+		)
+
+	def test_repeats_and_budget_overruns_are_logged(self):
+		with self.assertLogs("pcg.queries", "INFO") as logs:
+			response = self.run_view()
+		self.assertIn('desc="4 queries"', response["Server-Timing"])
+		output = "\n".join(logs.output)
+		self.assertIn("n_plus_one", output)
+		self.assertIn("issued 4 queries (budget 2)", output)
+
+	@override_settings(QUERY_INSPECTOR_STRICT=True)
+	def test_strict_mode_raises_on_overrun(self):
+		with self.assertLogs("pcg.queries"), self.assertRaises(QueryBudgetExceeded):
+			self.run_view()
+
+
+class SeedAndBenchCommandTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		call_command("seed_data", scale=0.0002, stdout=io.StringIO())
+
+	def test_seeded_data_is_consistent_and_not_seeded_twice(self):
+		self.assertEqual(User.objects.filter(username__startswith="seed_").count(), 10)
+		self.assertEqual(Notification.objects.count(), 200)
+		self.assertTrue(User.objects.filter(is_staff=True, profile__role="ADMIN").exists())
+		self.assertTrue(GroupMembership.objects.filter(is_leader=True).exists())
+		with self.assertRaisesMessage(CommandError, "Seed data already present"):
+			call_command("seed_data", scale=0.0002, stdout=io.StringIO())
+
+	def test_bench_views_reports_every_scenario(self):
+		output = Path(tempfile.mkdtemp()) / "bench.json"
+		self.addCleanup(shutil.rmtree, output.parent)
+		call_command("bench_views", iterations=2, warmup=0, output=str(output), stdout=io.StringIO())
+		results = json.loads(output.read_text())["results"]
+		self.assertIn("notifications_list", results)
+		self.assertEqual({name: row["status"] for name, row in results.items() if row["status"] != 200}, {})
+
+		stdout = io.StringIO()
+		call_command("bench_views", iterations=1, warmup=0, only=["groups_list"], compare=str(output), stdout=stdout)
+		self.assertIn("groups_list", stdout.getvalue().split("Change vs")[1])
+
+
+class SQLiteProductionProfileTests(SimpleTestCase):
+	alias = "sqlite_profile"
+
+	def setUp(self):
+		tmp = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, tmp)
+		self.path = str(Path(tmp) / "profile.sqlite3")
+		wrapper = connections.create_connection("default")
+		wrapper.settings_dict = {**wrapper.settings_dict, "NAME": self.path, "OPTIONS": settings.SQLITE_PRODUCTION_OPTIONS}
+		wrapper.alias = self.alias
+		connections[self.alias] = wrapper
+		self.addCleanup(connections.__delitem__, self.alias)
+		self.addCleanup(wrapper.close)
+		self.connection = wrapper
+
+	def pragma(self, name):
+		with self.connection.cursor() as cursor:
+			cursor.execute(f"PRAGMA {name}")
+			return cursor.fetchone()[0]
+
+	def test_connections_use_wal_and_wait_for_the_lock(self):
+		self.assertEqual(self.pragma("journal_mode"), "wal")
+		self.assertEqual(self.pragma("synchronous"), 1)
+		self.assertEqual(self.pragma("busy_timeout"), settings.SQLITE_BUSY_TIMEOUT_MS)
+
+	def test_transactions_take_the_write_lock_up_front(self):
+		self.pragma("journal_mode")
+		other = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+		self.addCleanup(other.close)
+		with transaction.atomic(using=self.alias):
+			# Nothing written yet, but a second writer is already shut out
+			with self.assertRaisesMessage(sqlite3.OperationalError, "database is locked"):
+				other.execute("BEGIN IMMEDIATE")
+
+	def test_maintenance_truncates_the_wal(self):
+		with self.connection.cursor() as cursor:
+			cursor.execute("CREATE TABLE t (x)")
+			cursor.executemany("INSERT INTO t VALUES (%s)", [(i,) for i in range(500)])
+		self.assertGreater(os.path.getsize(f"{self.path}-wal"), 0)
+		stdout = io.StringIO()
+		call_command("sqlite_maintenance", database=self.alias, stdout=stdout)
+		self.assertIn("Checkpoint TRUNCATE", stdout.getvalue())
+		self.assertEqual(os.path.getsize(f"{self.path}-wal"), 0)
+
+
+def _log_rows():
+	rows = []
+	for i in range(20):
+		rows.append({
+			"requestId": f"r{i}", "requestMethod": "GET", "requestPath": f"pcg.vercel.app/groups/{i}/",
+			"responseStatusCode": 500 if i == 0 else 200, "durationMs": 100 + i, "timestampInMs": 1_700_000_000_000 + i * 1000,
+			"deploymentId": "dpl_1", "maxMemoryUsed": 90,
+		})
+	# A printed line that arrives before its request row
+	rows.insert(0, {"requestId": "r3", "responseStatusCode": -1, "durationMs": -1, "message": "INIT_REPORT Init Duration: 812 ms"})
+	return rows
+
+
+class LogStreamTests(SimpleTestCase):
+	def setUp(self):
+		self.tmp = Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.tmp)
+
+	def test_arrays_and_json_lines_decode_the_same(self):
+		rows = _log_rows()
+		as_array = list(iter_records(io.StringIO(json.dumps(rows, indent=1)), chunk_size=7))
+		as_lines = list(iter_records(io.StringIO("\n".join(json.dumps(row) for row in rows)), chunk_size=7))
+		self.assertEqual(as_array, rows)
+		self.assertEqual(as_lines, rows)
+
+	def test_summary_groups_by_route_and_matches_printed_lines(self):
+		summary = LogSummary()
+		for row in _log_rows():
+			summary.add(row)
+		stats = summary.routes["GET /groups/<int:pk>/"].to_dict()
+		self.assertEqual((stats["count"], stats["errors"], stats["cold_starts"]), (20, 1, 1))
+		# Within one 5% bucket of the exact p50 (109 ms)
+		self.assertAlmostEqual(stats["p50_ms"], 109, delta=109 * 0.05)
+
+	def test_histograms_merge(self):
+		a, b = LatencyHistogram(), LatencyHistogram()
+		for ms in (10, 20):
+			a.add(ms)
+		b.add(400)
+		a.merge(LatencyHistogram.from_dict(b.to_dict()))
+		self.assertEqual(a.count, 3)
+		self.assertGreaterEqual(a.percentile(1.0), 400)
+
+	def test_command_appends_each_export_to_the_history_once(self):
+		export = self.tmp / "logs.json.gz"
+		with gzip.open(export, "wt", encoding="utf-8") as fh:
+			json.dump(_log_rows(), fh)
+		history = self.tmp / "history.jsonl"
+		for _ in range(2):
+			stdout = io.StringIO()
+			call_command("analyze_vercel_logs", str(export), history=str(history), stdout=stdout)
+		self.assertIn("/groups/<int:pk>/", stdout.getvalue())
+		self.assertIn("Already in history", stdout.getvalue())
+		self.assertEqual(len(history.read_text().splitlines()), 1)
+
+
+class ReplayTrafficTests(LiveServerTestCase):
+	def setUp(self):
+		cache.clear()
+		call_command("seed_data", scale=0.0002, skip_derived=True, stdout=io.StringIO())
+		self.tmp = Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.tmp)
+
+	def test_recorded_mix_is_replayed_against_local_rows(self):
+		base = {"responseStatusCode": 200, "durationMs": 50, "requestId": "r"}
+		rows = [
+			{**base, "requestMethod": "GET", "requestPath": "pcg.vercel.app/", "timestampInMs": 1000},
+			{**base, "requestMethod": "GET", "requestPath": "pcg.vercel.app/groups/98765/", "timestampInMs": 1100},
+			{**base, "requestMethod": "POST", "requestPath": "pcg.vercel.app/groups/98765/apply/", "timestampInMs": 1200},
+			{"requestId": "r", "responseStatusCode": -1, "message": "printed"},
+		]
+		export = self.tmp / "logs.json"
+		export.write_text(json.dumps(rows))
+		output = self.tmp / "replay.json"
+		call_command(
+			"replay_traffic", str(export), base_url=self.live_server_url, speed=0, loop=2, concurrency=1,
+			users=2, anonymous_share=0, output=str(output), stdout=io.StringIO(),
+		)
+		report = json.loads(output.read_text())
+		self.assertEqual((report["requests"], report["skipped_writes"]), (4, 1))
+		self.assertEqual(report["statuses"], {"200": 4})
+		self.assertEqual(report["routes"]["/groups/<int:pk>/"]["count"], 2)
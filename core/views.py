@@ -1,14 +1,16 @@
 from django.shortcuts import render
 
-from announcements.models import Announcement
+from announcements.utils import feed_for
+from .pagecache import cache_anonymous_page
+from .queries import query_budget
+from .routers import use_replica
 
+@query_budget(8)
+@cache_anonymous_page
+@use_replica
 def home(request):
-    anns = (Announcement.objects  # type: ignore[attr-defined]
-            .visible_to(request.user)  # type: ignore[attr-defined]
-            .select_related('author', 'group')
-            .order_by('-created_at')[:10])
     context = {
         "site_name": "PCG - A.N.T",
-        "announcements": anns,
+        "announcements": feed_for(request.user),
     }
     return render(request, "core/home.html", context)
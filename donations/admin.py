@@ -1,3 +1,56 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
+from .models import Fund, FundMonthTotal, GroupMonthTotal, LedgerEntry
+from .utils import post_entries, reverse_entry
 
-# Register your models here.
+
+@admin.register(Fund)
+class FundAdmin(admin.ModelAdmin):
+	list_display = ("name", "is_active")
+	list_filter = ("is_active",)
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+	list_display = ("date", "fund", "kind", "amount", "member", "group", "reference", "reverses")
+	list_filter = ("fund", "kind")
+	list_select_related = ("fund", "member", "group", "reverses")
+	search_fields = ("reference", "member__username", "member__last_name")
+	date_hierarchy = "date"
+	raw_id_fields = ("member", "activity", "event", "reverses")
+	exclude = ("recorded_by",)
+	actions = ("post_reversals",)
+
+	def save_model(self, request, obj, form, change):
+		# Through post_entries so the monthly totals move with it
+		obj.recorded_by = request.user
+		post_entries([obj])
+
+	@admin.action(description="Reverse selected entries", permissions=["add"])
+	def post_reversals(self, request, queryset):
+		# Reversals are not reversed again, and an entry is only ever reversed once
+		entries = queryset.filter(reverses__isnull=True, reversal__isnull=True).order_by("pk")
+		with transaction.atomic():
+			reversals = [reverse_entry(entry, recorded_by=request.user) for entry in entries]
+		skipped = queryset.count() - len(reversals)
+		self.message_user(request, f"Posted {len(reversals)} reversing entries.", messages.SUCCESS)
+		if skipped:
+			self.message_user(request, f"Skipped {skipped} entries that are reversals or already reversed.", messages.WARNING)
+
+	def has_change_permission(self, request, obj=None):
+		# Append-only: corrections are reversing entries
+		return False
+
+	def has_delete_permission(self, request, obj=None):
+		return False
+
+
+@admin.register(FundMonthTotal, GroupMonthTotal)
+class MonthTotalAdmin(admin.ModelAdmin):
+	list_display = ("__str__", "month", "total", "entries")
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
@@ -0,0 +1,6 @@
+from django import forms
+
+
+class LedgerImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with date, fund and amount columns; see donations.importer for the rest.")
+    dry_run = forms.BooleanField(required=False, label="Check only, do not record")
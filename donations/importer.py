@@ -0,0 +1,181 @@
+"""Bulk import of weekly giving records from CSV.
+
+Columns (header row required, order free): ``date`` (YYYY-MM-DD or
+DD/MM/YYYY), ``fund`` (name), ``amount``, and optionally ``kind``
+(offertory, tithe, pledge, thanksgiving, other), ``member`` (username or
+email; blank for loose offertory), ``group`` (name), ``event`` (slug),
+``activity`` (id) and ``reference``.
+
+A file is imported whole or not at all: every row is validated first, with
+all lookups done in a handful of ``IN`` queries, and any error leaves the
+ledger untouched. Each row gets an ``import_key`` derived from its content
+(and its position among identical rows), so importing the same file twice
+only adds what is new.
+"""
+import datetime
+import hashlib
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from events.models import Event
+from groups.models import Group, GroupActivity
+from .models import Fund, LedgerEntry
+from .utils import post_entries
+
+REQUIRED_COLUMNS = ("date", "fund", "amount")
+# SQLite allows 999 parameters per query
+LOOKUP_CHUNK = 500
+
+
+@dataclass
+class ImportResult:
+	rows: int = 0
+	created: int = 0
+	skipped: int = 0
+	total: Decimal = Decimal("0")
+	errors: list[str] = field(default_factory=list)
+
+
+def _chunks(values, size=LOOKUP_CHUNK):
+	values = list(values)
+	for start in range(0, len(values), size):
+		yield values[start:start + size]
+
+
+def _parse_date(value: str) -> datetime.date:
+	for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+		try:
+			return datetime.datetime.strptime(value, fmt).date()
+		except ValueError:
+			pass
+	raise ValueError(f"date {value!r} is not YYYY-MM-DD or DD/MM/YYYY")
+
+
+def _parse_kind(value: str) -> str:
+	if not value:
+		return LedgerEntry.Kind.OFFERTORY
+	for kind in LedgerEntry.Kind:
+		if value.upper() == kind.value or value.lower() in (kind.label.lower(), kind.value.lower()):
+			return kind.value
+	raise ValueError(f"unknown kind {value!r}")
+
+
+def _parse_amount(value: str) -> Decimal:
+	try:
+		amount = Decimal(value.replace(",", "")).quantize(Decimal("0.01"))
+	except InvalidOperation:
+		raise ValueError(f"amount {value!r} is not a number")
+	if amount <= 0:
+		raise ValueError("amount must be positive; use a reversal to correct an entry")
+	return amount
+
+
+def _lookups(rows):
+	"""Fetch every fund, member, group, event and activity the rows mention, in bulk."""
+	wanted = {name: {(row.get(name) or "").strip() for row in rows} - {""} for name in ("member", "event", "activity")}
+	# Funds and groups are few and matched case-insensitively, so load them all
+	funds = {name.lower(): pk for pk, name in Fund.objects.values_list("pk", "name")}
+	groups = {name.lower(): pk for pk, name in Group.objects.values_list("pk", "name")}
+	members = {}
+	for chunk in _chunks(wanted["member"]):
+		emails = [v.lower() for v in chunk if "@" in v]
+		# Emails are stored as entered; LOWER(email) matches them and uses the accounts index
+		users = User.objects.annotate(email_lower=Lower("email")).filter(Q(username__in=chunk) | Q(email_lower__in=emails))
+		for pk, username, email in users.values_list("pk", "username", "email"):
+			members[username] = pk
+			if email:
+				members[email.lower()] = pk
+	events = {}
+	for chunk in _chunks(wanted["event"]):
+		events.update(Event.objects.filter(slug__in=chunk).values_list("slug", "pk"))
+	activities = {}
+	activity_ids = [int(v) for v in wanted["activity"] if v.isdigit()]
+	for chunk in _chunks(activity_ids):
+		activities.update({str(pk): (pk, group_id) for pk, group_id in GroupActivity.objects.filter(pk__in=chunk).values_list("pk", "group_id")})
+	return funds, members, groups, events, activities
+
+
+@transaction.atomic
+def import_csv(fh, recorded_by=None, dry_run: bool = False) -> ImportResult:
+	import csv
+	result = ImportResult()
+	reader = csv.DictReader(fh)
+	header = [name.strip().lower() for name in reader.fieldnames or []]
+	missing = [name for name in REQUIRED_COLUMNS if name not in header]
+	if missing:
+		result.errors.append(f"Missing column(s): {', '.join(missing)}")
+		return result
+	reader.fieldnames = header
+	rows = list(reader)
+	result.rows = len(rows)
+	funds, members, groups, events, activities = _lookups(rows)
+
+	entries = []
+	seen = {}
+	for line, row in enumerate(rows, start=2):
+		row = {name: (value or "").strip() for name, value in row.items() if name}
+		try:
+			fund_id = funds.get(row["fund"].lower())
+			if fund_id is None:
+				raise ValueError(f"unknown fund {row['fund']!r}")
+			member_id = None
+			if row.get("member"):
+				member_id = members.get(row["member"]) or members.get(row["member"].lower())
+				if member_id is None:
+					raise ValueError(f"unknown member {row['member']!r}")
+			group_id = None
+			if row.get("group"):
+				group_id = groups.get(row["group"].lower())
+				if group_id is None:
+					raise ValueError(f"unknown group {row['group']!r}")
+			event_id = None
+			if row.get("event"):
+				event_id = events.get(row["event"])
+				if event_id is None:
+					raise ValueError(f"unknown event {row['event']!r}")
+			activity_id = None
+			if row.get("activity"):
+				if row["activity"] not in activities:
+					raise ValueError(f"unknown activity {row['activity']!r}")
+				activity_id, activity_group = activities[row["activity"]]
+				group_id = group_id or activity_group
+			entry = LedgerEntry(
+				fund_id=fund_id,
+				kind=_parse_kind(row.get("kind", "")),
+				amount=_parse_amount(row["amount"]),
+				date=_parse_date(row["date"]),
+				member_id=member_id,
+				group_id=group_id,
+				activity_id=activity_id,
+				event_id=event_id,
+				reference=row.get("reference", "")[:120],
+				recorded_by=recorded_by,
+			)
+		except (KeyError, ValueError) as exc:
+			result.errors.append(f"Line {line}: {exc}")
+			continue
+		identity = "|".join(str(part) for part in (
+			entry.date, fund_id, entry.kind, entry.amount, member_id, group_id, event_id, activity_id, entry.reference,
+		))
+		# Two identical rows in one file (e.g. two loose-offertory bags) are both real
+		seen[identity] = seen.get(identity, 0) + 1
+		entry.import_key = hashlib.blake2b(f"{identity}#{seen[identity]}".encode(), digest_size=16).hexdigest()
+		entries.append(entry)
+
+	if result.errors:
+		return result
+	existing = set()
+	for chunk in _chunks(entry.import_key for entry in entries):
+		existing.update(LedgerEntry.objects.filter(import_key__in=chunk).values_list("import_key", flat=True))
+	new = [entry for entry in entries if entry.import_key not in existing]
+	result.skipped = len(entries) - len(new)
+	result.created = len(new)
+	result.total = sum((entry.amount for entry in new), Decimal("0"))
+	if not dry_run:
+		post_entries(new)
+	return result
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from donations.importer import import_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Import weekly giving records from CSV files into the donations ledger. Each file is "
+        "all-or-nothing, and rows already imported are skipped, so a file can be re-run safely."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and report without recording anything.")
+
+    def handle(self, *args, **options):
+        failed = False
+        for path in options["files"]:
+            try:
+                with open(path, encoding="utf-8-sig", newline="") as fh:
+                    result = import_csv(fh, dry_run=options["dry_run"])
+            except OSError as exc:
+                raise CommandError(f"Cannot read {path}: {exc}")
+            if result.errors:
+                failed = True
+                self.stderr.write(f"{path}: not imported, {len(result.errors)} error(s)")
+                for error in result.errors[:50]:
+                    self.stderr.write(f"  {error}")
+                continue
+            verb = "would add" if options["dry_run"] else "added"
+            self.stdout.write(
+                f"{path}: {result.rows} rows, {verb} {result.created} entries totalling {result.total}, "
+                f"{result.skipped} already recorded"
+            )
+        if failed:
+            raise CommandError("Some files had errors and were not imported.")
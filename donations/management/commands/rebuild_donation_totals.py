@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from donations.models import FundMonthTotal, LedgerEntry
+from donations.utils import rebuild_totals
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the fund and group monthly totals from the ledger. Only needed if the summary "
+        "tables were edited by hand or entries were written without donations.utils.post_entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only compare the totals with the ledger.")
+
+    def handle(self, *args, **options):
+        ledger = LedgerEntry.objects.aggregate(total=Sum("amount"))["total"] or 0
+        summary = FundMonthTotal.objects.aggregate(total=Sum("total"))["total"] or 0
+        self.stdout.write(f"Ledger total {ledger}, fund totals {summary}")
+        if options["check"]:
+            if ledger != summary:
+                self.stdout.write(self.style.ERROR("Totals disagree; run without --check to rebuild."))
+            return
+        funds, groups = rebuild_totals()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {funds} fund-month and {groups} group-month totals."))
@@ -1,3 +1,101 @@
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+from events.models import Event
+from groups.models import Group, GroupActivity
+
+
+class Fund(models.Model):
+	"""Where money is directed, e.g. General, Building, Welfare."""
+
+	name = models.CharField(max_length=120, unique=True)
+	description = models.TextField(blank=True)
+	is_active = models.BooleanField(default=True)
+
+	class Meta:
+		ordering = ["name"]
+
+	def __str__(self) -> str:
+		return self.name
+
+
+class LedgerEntry(models.Model):
+	"""One amount received. Append-only.
+
+	Entries are never edited or deleted; a mistake is corrected by a
+	reversing entry (see donations.utils.reverse_entry). The summary tables
+	below are kept in step by donations.utils.post_entries, which every
+	write goes through.
+	"""
+
+	class Kind(models.TextChoices):
+		OFFERTORY = "OFFERTORY", "Offertory"
+		TITHE = "TITHE", "Tithe"
+		PLEDGE = "PLEDGE", "Pledge payment"
+		THANKSGIVING = "THANKSGIVING", "Thanksgiving"
+		OTHER = "OTHER", "Other"
+
+	fund = models.ForeignKey(Fund, on_delete=models.PROTECT, related_name="entries")
+	kind = models.CharField(max_length=16, choices=Kind.choices, default=Kind.OFFERTORY)
+	amount = models.DecimalField(max_digits=12, decimal_places=2)
+	date = models.DateField(help_text="Date of the service or giving.")
+	# Blank for loose offertory
+	member = models.ForeignKey(User, on_delete=models.PROTECT, null=True, blank=True, related_name="ledger_entries")
+	group = models.ForeignKey(Group, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries")
+	activity = models.ForeignKey(GroupActivity, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries")
+	event = models.ForeignKey(Event, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries")
+	reference = models.CharField(max_length=120, blank=True, help_text="Receipt, envelope or batch number.")
+	reverses = models.OneToOneField("self", on_delete=models.PROTECT, null=True, blank=True, related_name="reversal")
+	# Set by bulk import so a re-imported file does not count twice
+	import_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+	recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="recorded_ledger_entries")
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		verbose_name_plural = "ledger entries"
+		indexes = [
+			# Giving statements: one member's entries in date order
+			models.Index(fields=["member", "date"], name="ledger_member_date"),
+			models.Index(fields=["date"], name="ledger_date"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.date} {self.get_kind_display()} {self.amount} to {self.fund}"
+
+	def save(self, *args, **kwargs):
+		if not self._state.adding:
+			raise ValueError("Ledger entries are append-only; record a reversal instead.")
+		super().save(*args, **kwargs)
+
+	def delete(self, *args, **kwargs):
+		raise ValueError("Ledger entries are append-only; record a reversal instead.")
+
+
+class FundMonthTotal(models.Model):
+	"""Running total of one fund for one month (``month`` is the 1st)."""
+
+	fund = models.ForeignKey(Fund, on_delete=models.CASCADE, related_name="month_totals")
+	month = models.DateField()
+	total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+	entries = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=["fund", "month"], name="fund_month_total_unique")]
+
+	def __str__(self) -> str:
+		return f"{self.fund} {self.month:%Y-%m}: {self.total}"
+
+
+class GroupMonthTotal(models.Model):
+	"""Running total given through one group for one month, across funds."""
+
+	group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="month_totals")
+	month = models.DateField()
+	total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+	entries = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=["group", "month"], name="group_month_total_unique")]
+
+	def __str__(self) -> str:
+		return f"{self.group} {self.month:%Y-%m}: {self.total}"
@@ -1,3 +1,100 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from groups.models import Group
+from .importer import import_csv
+from .models import Fund, FundMonthTotal, GroupMonthTotal, LedgerEntry
+from .utils import post_entries, rebuild_totals, reverse_entry
+
+WEEKLY_CSV = """date,fund,amount,kind,member,group,reference
+2025-03-02,General,50.00,tithe,alice,Choir,ENV-1
+2025-03-02,General,20.00,,,,BAG-1
+2025-03-02,General,20.00,,,,BAG-1
+09/03/2025,Building,"1,000.00",pledge,alice@example.com,,ENV-2
+"""
+
+
+class LedgerTests(TestCase):
+	def setUp(self):
+		self.general = Fund.objects.create(name="General")
+		self.building = Fund.objects.create(name="Building")
+		self.choir = Group.objects.create(name="Choir")
+		self.alice = User.objects.create_user("alice", email="alice@example.com", password="pw")
+
+	def totals(self):
+		return {
+			(row.fund.name, row.month): (row.total, row.entries)
+			for row in FundMonthTotal.objects.select_related("fund")
+		}
+
+	def test_import_posts_totals_and_skips_rows_already_recorded(self):
+		result = import_csv(io.StringIO(WEEKLY_CSV))
+		self.assertEqual((result.created, result.skipped, result.errors), (4, 0, []))
+		march = datetime.date(2025, 3, 1)
+		self.assertEqual(self.totals(), {
+			("General", march): (Decimal("90.00"), 3),
+			("Building", march): (Decimal("1000.00"), 1),
+		})
+		self.assertEqual(GroupMonthTotal.objects.get().total, Decimal("50.00"))
+
+		again = import_csv(io.StringIO(WEEKLY_CSV))
+		self.assertEqual((again.created, again.skipped), (0, 4))
+		self.assertEqual(LedgerEntry.objects.count(), 4)
+
+	def test_members_match_emails_stored_in_mixed_case(self):
+		grace = User.objects.create_user("grace", email="Grace@Example.com", password="pw")
+		result = import_csv(io.StringIO("date,fund,amount,member\n2025-03-02,General,10.00,grace@example.com\n"))
+		self.assertEqual(result.errors, [])
+		self.assertEqual(LedgerEntry.objects.get().member, grace)
+
+	def test_a_bad_row_records_nothing(self):
+		result = import_csv(io.StringIO(WEEKLY_CSV + "2025-03-09,Missions,5.00,,,,\n"))
+		self.assertEqual(result.errors, ["Line 6: unknown fund 'Missions'"])
+		self.assertFalse(LedgerEntry.objects.exists())
+
+	def test_reversal_cancels_the_entry_in_the_totals(self):
+		entry, = post_entries([LedgerEntry(
+			fund=self.general, amount=Decimal("75.00"), date=datetime.date(2025, 4, 6), group=self.choir,
+		)])
+		reverse_entry(entry, recorded_by=self.alice, reason="Counted twice")
+		self.assertEqual(self.totals()[("General", datetime.date(2025, 4, 1))], (Decimal("0.00"), 2))
+		self.assertEqual(entry.reversal.amount, Decimal("-75.00"))
+		before = self.totals()
+		rebuild_totals()
+		self.assertEqual(self.totals(), before)
+
+	def test_entries_are_append_only(self):
+		entry, = post_entries([LedgerEntry(fund=self.general, amount=Decimal("10.00"), date=datetime.date(2025, 1, 5))])
+		entry.amount = Decimal("1.00")
+		with self.assertRaises(ValueError):
+			entry.save()
+		with self.assertRaises(ValueError):
+			entry.delete()
+
+	def test_out_of_range_year_falls_back_to_this_year(self):
+		self.client.force_login(self.alice)
+		this_year = timezone.localdate().year
+		for year in ("10000", "0", "-5"):
+			response = self.client.get("/donations/", {"year": year, "format": "csv"})
+			self.assertEqual(response.status_code, 200)
+			self.assertIn(f"giving_{this_year}.csv", response["Content-Disposition"])
+
+	def test_admin_action_posts_reversals_once(self):
+		entry, = post_entries([LedgerEntry(fund=self.general, amount=Decimal("40.00"), date=datetime.date(2025, 5, 4))])
+		self.client.force_login(User.objects.create_superuser("treasurer", password="pw"))
+		url = reverse("admin:donations_ledgerentry_changelist")
+		self.client.post(url, {"action": "post_reversals", "_selected_action": [entry.pk]})
+		entry.refresh_from_db()
+		self.assertEqual(entry.reversal.amount, Decimal("-40.00"))
+		self.assertEqual(entry.reversal.recorded_by.username, "treasurer")
 
-# Create your tests here.
+		response = self.client.post(url, {"action": "post_reversals", "_selected_action": [entry.pk, entry.reversal.pk]}, follow=True)
+		self.assertContains(response, "Skipped 2 entries")
+		self.assertEqual(LedgerEntry.objects.count(), 2)
+		self.assertEqual(self.totals()[("General", datetime.date(2025, 5, 1))], (Decimal("0.00"), 2))
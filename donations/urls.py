@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = "donations"
+
+urlpatterns = [
+    path("", views.my_giving, name="my_giving"),
+    path("summary/", views.summary, name="summary"),
+    path("statements/", views.statements, name="statements"),
+    path("import/", views.import_entries, name="import"),
+]
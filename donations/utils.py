@@ -0,0 +1,88 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import FundMonthTotal, GroupMonthTotal, LedgerEntry
+
+
+def _month(day):
+	return day.replace(day=1)
+
+
+def _apply(model, key_field: str, deltas: dict) -> None:
+	"""Add each (key, month) -> [amount, count] delta to its summary row with F() updates."""
+	for (key, month), (amount, count) in deltas.items():
+		lookup = {key_field: key, "month": month}
+		updated = model.objects.filter(**lookup).update(total=F("total") + amount, entries=F("entries") + count)
+		if not updated:
+			row, created = model.objects.get_or_create(**lookup, defaults={"total": amount, "entries": count})
+			if not created:
+				# Created by a concurrent writer since the update above
+				model.objects.filter(pk=row.pk).update(total=F("total") + amount, entries=F("entries") + count)
+
+
+@transaction.atomic
+def post_entries(entries: list[LedgerEntry], batch_size: int = 1000) -> list[LedgerEntry]:
+	"""Insert ledger entries and fold them into the fund and group monthly totals.
+
+	The only supported way to write the ledger: the entries and the summary
+	rows change in one transaction, with one UPDATE per (fund, month) and
+	(group, month) touched however many entries there are.
+	"""
+	created = LedgerEntry.objects.bulk_create(entries, batch_size=batch_size)
+	by_fund = defaultdict(lambda: [Decimal("0"), 0])
+	by_group = defaultdict(lambda: [Decimal("0"), 0])
+	for entry in created:
+		month = _month(entry.date)
+		for deltas, key in ((by_fund, entry.fund_id), (by_group, entry.group_id)):
+			if key is None:
+				continue
+			deltas[key, month][0] += Decimal(entry.amount)
+			deltas[key, month][1] += 1
+	_apply(FundMonthTotal, "fund_id", by_fund)
+	_apply(GroupMonthTotal, "group_id", by_group)
+	return created
+
+
+def reverse_entry(entry: LedgerEntry, recorded_by, reason: str = "") -> LedgerEntry:
+	"""Cancel ``entry`` with an equal and opposite entry on the same date."""
+	reversal = LedgerEntry(
+		fund_id=entry.fund_id,
+		kind=entry.kind,
+		amount=-entry.amount,
+		date=entry.date,
+		member_id=entry.member_id,
+		group_id=entry.group_id,
+		activity_id=entry.activity_id,
+		event_id=entry.event_id,
+		reference=(reason or f"Reversal of #{entry.pk}")[:120],
+		reverses=entry,
+		recorded_by=recorded_by,
+	)
+	return post_entries([reversal])[0]
+
+
+@transaction.atomic
+def rebuild_totals() -> tuple[int, int]:
+	"""Recompute both summary tables from the ledger; returns the row counts."""
+	FundMonthTotal.objects.all().delete()
+	GroupMonthTotal.objects.all().delete()
+	month = TruncMonth("date")
+	funds = (
+		LedgerEntry.objects.annotate(m=month).values("fund_id", "m")
+		.annotate(total=Sum("amount"), n=Count("id")).order_by()
+	)
+	groups = (
+		LedgerEntry.objects.filter(group__isnull=False).annotate(m=month).values("group_id", "m")
+		.annotate(total=Sum("amount"), n=Count("id")).order_by()
+	)
+	fund_rows = FundMonthTotal.objects.bulk_create(
+		[FundMonthTotal(fund_id=r["fund_id"], month=r["m"], total=r["total"], entries=r["n"]) for r in funds]
+	)
+	group_rows = GroupMonthTotal.objects.bulk_create(
+		[GroupMonthTotal(group_id=r["group_id"], month=r["m"], total=r["total"], entries=r["n"]) for r in groups]
+	)
+	return len(fund_rows), len(group_rows)
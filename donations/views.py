@@ -1,3 +1,133 @@
-from django.shortcuts import render
+import datetime
+import io
+from collections import defaultdict
+from decimal import Decimal
 
-# Create your views here.
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from core.http import Echo
+from core.queries import query_budget
+from core.routers import use_replica
+from groups.views import is_admin_user
+from .forms import LedgerImportForm
+from .importer import import_csv
+from .models import FundMonthTotal, GroupMonthTotal, LedgerEntry
+
+STATEMENT_HEADER = ["Member", "Email", "Date", "Fund", "Kind", "Amount", "Reference"]
+
+
+def _year(request) -> int:
+	"""The ``?year=`` being reported on; the current year when it is missing or not a usable date year."""
+	try:
+		year = int(request.GET.get("year", ""))
+	except ValueError:
+		return timezone.localdate().year
+	return year if datetime.MINYEAR <= year <= datetime.MAXYEAR else timezone.localdate().year
+
+
+def _statement_rows(entries):
+	"""CSV lines for ``entries`` ordered by member, with a total after each member's rows."""
+	import csv
+	writer = csv.writer(Echo())
+	kinds = dict(LedgerEntry.Kind.choices)
+	yield writer.writerow(STATEMENT_HEADER)
+	current, name, subtotal = None, "", Decimal("0")
+	for member_id, username, first, last, email, day, fund, kind, amount, reference in entries.iterator(chunk_size=2000):
+		if member_id != current:
+			if current is not None:
+				yield writer.writerow([name, "", "", "", "Total", subtotal, ""])
+			current, name, subtotal = member_id, f"{first} {last}".strip() or username, Decimal("0")
+		subtotal += amount
+		yield writer.writerow([name, email, day.isoformat(), fund, kinds.get(kind, kind), amount, reference])
+	if current is not None:
+		yield writer.writerow([name, "", "", "", "Total", subtotal, ""])
+
+
+def _statement_response(entries, filename: str) -> StreamingHttpResponse:
+	rows = entries.values_list(
+		"member_id", "member__username", "member__first_name", "member__last_name", "member__email",
+		"date", "fund__name", "kind", "amount", "reference",
+	).order_by("member_id", "date", "id")
+	# Pin the alias chosen now: the rows are read after the view has returned
+	rows = rows.using(rows.db)
+	response = StreamingHttpResponse(_statement_rows(rows), content_type="text/csv")
+	response["Content-Disposition"] = f"attachment; filename={filename}"
+	return response
+
+
+@query_budget(6)
+@login_required
+def my_giving(request):
+	"""The signed-in member's own giving for a year, with a CSV statement."""
+	year = _year(request)
+	entries = LedgerEntry.objects.filter(member=request.user, date__year=year)
+	if request.GET.get("format") == "csv":
+		return _statement_response(entries, f"giving_{year}.csv")
+	rows = list(entries.select_related("fund").order_by("-date", "-id"))
+	return render(request, "donations/my_giving.html", {
+		"year": year,
+		"entries": rows,
+		"total": sum((e.amount for e in rows), Decimal("0")),
+		"currency": settings.DONATIONS_CURRENCY,
+	})
+
+
+@use_replica
+@login_required
+@user_passes_test(is_admin_user)
+def summary(request):
+	"""Totals by fund, month and group for a year, read from the summary tables only."""
+	year = _year(request)
+	fund_rows = FundMonthTotal.objects.filter(month__year=year).select_related("fund").order_by("fund__name", "month")
+	by_fund = defaultdict(lambda: [Decimal("0")] * 12)
+	month_totals = [Decimal("0")] * 12
+	for row in fund_rows:
+		by_fund[row.fund.name][row.month.month - 1] += row.total
+		month_totals[row.month.month - 1] += row.total
+	groups = (
+		GroupMonthTotal.objects.filter(month__year=year)
+		.values("group__name")
+		.annotate(total=Sum("total"), entries=Sum("entries"))
+		.order_by("-total")
+	)
+	return render(request, "donations/summary.html", {
+		"year": year,
+		"funds": [(name, months, sum(months)) for name, months in by_fund.items()],
+		"month_totals": month_totals,
+		"grand_total": sum(month_totals),
+		"groups": groups,
+		"currency": settings.DONATIONS_CURRENCY,
+	})
+
+
+@use_replica
+@login_required
+@user_passes_test(is_admin_user)
+def statements(request):
+	"""Year-end giving statements for every member as one streamed CSV."""
+	year = _year(request)
+	entries = LedgerEntry.objects.filter(date__year=year, member__isnull=False)
+	return _statement_response(entries, f"giving_statements_{year}.csv")
+
+
+@login_required
+@user_passes_test(is_admin_user)
+def import_entries(request):
+	result = None
+	if request.method == "POST":
+		form = LedgerImportForm(request.POST, request.FILES)
+		if form.is_valid():
+			upload = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig")
+			result = import_csv(upload, recorded_by=request.user, dry_run=form.cleaned_data["dry_run"])
+			if not result.errors and not form.cleaned_data["dry_run"]:
+				messages.success(request, f"Imported {result.created} entries ({result.skipped} already recorded).")
+				return redirect("donations:summary")
+	else:
+		form = LedgerImportForm()
+	return render(request, "donations/import.html", {"form": form, "result": result})
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.text import slugify
 
 from groups.models import Group
@@ -62,3 +65,10 @@ class EventImage(models.Model):
 
 	def __str__(self) -> str:
 		return f"Image for {self.event.title}"
+
+
+@receiver(post_save, sender=EventImage)
+@receiver(post_delete, sender=EventImage)
+def touch_event(sender, instance: EventImage, **kwargs):
+	# The gallery is part of the event page, so its ETag must move with it
+	Event.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
@@ -1,3 +1,39 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from groups.models import Group, GroupMembership
+from .models import Event
+
+
+# QueryInspectorMiddleware is sync-only; left on, it would run the chain in sync mode
+@override_settings(QUERY_INSPECTOR=False)
+class EventsApiTests(TestCase):
+	url = reverse("events:api_events")
+
+	def setUp(self):
+		self.member = User.objects.create_user("member", password="pw")
+		choir = Group.objects.create(name="Choir")
+		ushers = Group.objects.create(name="Ushers")
+		GroupMembership.objects.create(user=self.member, group=choir)
+		day = datetime.date(2026, 3, 1)
+		Event.objects.create(title="Picnic", start_date=day, is_global=True)
+		Event.objects.create(title="Rehearsal", start_date=day, start_time=datetime.time(18), group=choir)
+		Event.objects.create(title="Rota", start_date=day, group=ushers)
+		Event.objects.create(title="Retreat", start_date=datetime.date(2026, 6, 1), is_global=True)
+
+	async def test_anonymous_visitors_are_sent_to_login(self):
+		response = await self.async_client.get(self.url)
+		self.assertEqual(response.status_code, 302)
+		self.assertTrue(response["Location"].startswith(reverse("login")))
+
+	async def test_members_see_global_and_their_groups_events_in_range(self):
+		await self.async_client.aforce_login(self.member)
+		response = await self.async_client.get(self.url, {"start": "2026-02-01", "end": "2026-03-31"})
+		self.assertEqual(response.status_code, 200)
+		items = {item["title"]: item for item in response.json()}
+		self.assertEqual(set(items), {"Picnic · Global", "Rehearsal · Choir"})
+		self.assertTrue(items["Picnic · Global"]["allDay"])
+		self.assertEqual(items["Rehearsal · Choir"]["start"], "2026-03-01T18:00:00")
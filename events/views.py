@@ -1,6 +1,3 @@
-import calendar
-from datetime import date
-
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
@@ -9,7 +6,11 @@ from django.http import JsonResponse
 from django.urls import reverse
 from django.utils import timezone
 
+from core.conditional import conditional_page
+from core.queries import query_budget
+from core.routers import use_replica
 from groups.models import GroupMembership, Group
+from groups.utils import ais_admin_user
 from accounts.models import Profile
 from .models import Event, EventImage
 from .forms import EventForm, EventImageUploadForm
@@ -24,6 +25,7 @@ def _is_admin(user) -> bool:
 		return bool(user.is_authenticated and (user.is_superuser or user.is_staff))
 
 
+@query_budget(8)
 @login_required
 def calendar_view(request):
 	"""Overview calendar: upcoming events the user is allowed to see.
@@ -53,6 +55,7 @@ def calendar_view(request):
 
 
 @login_required
+@conditional_page(lambda request, slug: Event.objects.filter(slug=slug), related=("groups",))
 def event_detail(request, slug: str):
 	ev = get_object_or_404(Event, slug=slug)
 	# Visibility rules
@@ -120,12 +123,16 @@ def delete_event_image(request, image_id: int):
 	return redirect("events:edit", slug=ev.slug)
 
 
+@use_replica
 @login_required
-def api_events(request):
+async def api_events(request):
 	"""Return events as JSON for a given date range, for FullCalendar.
 
 	Query params: start, end (ISO dates); returns events the user can see.
+	Async so that under ASGI a burst of calendar fetches does not hold one
+	worker thread per request.
 	"""
+	user = await request.auser()
 	start = request.GET.get("start")
 	end = request.GET.get("end")
 	qs = Event.objects.all()
@@ -136,13 +143,13 @@ def api_events(request):
 			qs = qs.filter(Q(start_date__lte=end_d) & (Q(end_date__isnull=True, start_date__gte=start_d) | Q(end_date__gte=start_d)))
 		except Exception:
 			pass
-	if not _is_admin(request.user):
-		member_group_ids = list(GroupMembership.objects.filter(user=request.user).values_list("group_id", flat=True))
+	if not await ais_admin_user(user):
+		member_group_ids = [gid async for gid in GroupMembership.objects.filter(user_id=user.pk).values_list("group_id", flat=True)]
 		qs = qs.filter(Q(is_global=True) | Q(group_id__in=member_group_ids))
 	qs = qs.select_related("group").order_by("start_date", "start_time")
 
 	items = []
-	for ev in qs:
+	async for ev in qs.aiterator():
 		# Compose title with group/global tag
 		postfix = ""
 		if ev.group is not None:
@@ -1,3 +1,41 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from core.pagecache import PAGE_CACHE_HEADER
+from .models import Group
+
+
+# QueryInspectorMiddleware is sync-only; left on, it would run the chain in sync mode
+@override_settings(QUERY_INSPECTOR=False)
+class GroupsApiTests(TestCase):
+	url = reverse("groups:groups_api")
+
+	def setUp(self):
+		cache.clear()
+		for name in ("Admin", "Leaders", "Members", "Choir", "Ushers"):
+			Group.objects.create(name=name)
+
+	async def test_lists_selectable_groups_for_select2(self):
+		response = await self.async_client.get(self.url)
+		self.assertEqual(response.status_code, 200)
+		payload = response.json()
+		self.assertEqual([item["text"] for item in payload["results"]], ["Choir", "Ushers"])
+		self.assertEqual(payload["pagination"], {"more": False})
+
+		response = await self.async_client.get(self.url, {"q": "ush"})
+		self.assertEqual([item["text"] for item in response.json()["results"]], ["Ushers"])
+
+	async def test_anonymous_responses_come_from_the_page_cache(self):
+		self.assertEqual((await self.async_client.get(self.url))[PAGE_CACHE_HEADER], "MISS")
+		self.assertEqual((await self.async_client.get(self.url))[PAGE_CACHE_HEADER], "HIT")
+
+		await Group.objects.acreate(name="Band")
+		response = await self.async_client.get(self.url)
+		self.assertEqual(response[PAGE_CACHE_HEADER], "MISS")
+		self.assertIn("Band", [item["text"] for item in response.json()["results"]])
+
+	async def test_signed_in_visitors_bypass_the_cache(self):
+		await self.async_client.aforce_login(await User.objects.acreate_user("member", password="pw"))
+		self.assertEqual((await self.async_client.get(self.url))[PAGE_CACHE_HEADER], "BYPASS")
@@ -1,8 +1,16 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth.models import Group as AuthGroup, User
+from django.db.models import Q
 
 from accounts.models import Profile
 from .models import GroupMembership
 
+# user pk -> user, collected while role syncs are deferred
+_deferred_role_syncs: ContextVar = ContextVar("deferred_role_syncs", default=None)
+
 
 def _ensure_auth_group(name: str) -> AuthGroup:
     grp, _ = AuthGroup.objects.get_or_create(name=name)
@@ -19,6 +27,11 @@ def sync_user_role_groups(user: User) -> None:
     if not user or not isinstance(user, User):
         return
 
+    pending = _deferred_role_syncs.get()
+    if pending is not None:
+        pending[user.pk] = user
+        return
+
     members_auth = _ensure_auth_group("Members")
     leaders_auth = _ensure_auth_group("Leaders")
     admin_auth = _ensure_auth_group("Admin")
@@ -48,3 +61,58 @@ def sync_user_role_groups(user: User) -> None:
 
     # Save M2M updates
     user.save()
+
+
+@contextmanager
+def deferred_role_sync():
+    """Collapse every sync_user_role_groups call in the block into one per user.
+
+    Signals on User, Profile and GroupMembership each trigger a sync; batch
+    operations such as signup wrap their writes in this so the auth groups are
+    synced once, after the last write. Nested blocks defer to the outermost.
+    """
+    if _deferred_role_syncs.get() is not None:
+        yield
+        return
+    pending = {}
+    token = _deferred_role_syncs.set(pending)
+    try:
+        yield
+    finally:
+        _deferred_role_syncs.reset(token)
+    for user in pending.values():
+        sync_user_role_groups(user)
+
+
+async def ais_admin_user(user) -> bool:
+    """Async twin of groups.views.is_admin_user, in at most one query.
+
+    Reads only fields already on ``user`` and never touches lazy relations,
+    which would raise SynchronousOnlyOperation in an async view.
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser or user.is_staff:
+        return True
+    return await User.objects.filter(
+        Q(profile__role=Profile.Role.ADMIN) | Q(memberships__group__name="Admin"), pk=user.pk
+    ).aexists()
+
+
+def application_recipients(group_ids) -> dict[int, set[int]]:
+    """Map each group id to the users notified of applications to it: its leaders plus all Admins.
+
+    One query regardless of how many groups are asked for.
+    """
+    group_ids = set(group_ids)
+    rows = GroupMembership.objects.filter(
+        Q(group_id__in=group_ids, is_leader=True) | Q(group__name="Admin")
+    ).values_list("group_id", "user_id", "group__name")
+    admin_ids = set()
+    leaders = defaultdict(set)
+    for group_id, user_id, group_name in rows:
+        if group_name == "Admin":
+            admin_ids.add(user_id)
+        if group_id in group_ids:
+            leaders[group_id].add(user_id)
+    return {group_id: leaders[group_id] | admin_ids for group_id in group_ids}
@@ -2,18 +2,25 @@ from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test, login_required
 from django.contrib.auth.models import User
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import Prefetch, Sum
 from django.utils import timezone
 from django.http import JsonResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 
 from accounts.models import Profile
+from announcements.utils import sync_membership_audience
+from core.conditional import conditional_page
+from core.http import Echo
+from core.pagecache import cache_anonymous_page
+from core.queries import query_budget
+from core.routers import use_replica
 from .forms import ChurchGroupForm, PromoteToAdminForm, ChangeLeaderForm, GroupApplicationForm, GroupActivityForm
 from .models import Group, GroupMembership, GroupApplication, GroupActivity
-from .utils import sync_user_role_groups
+from .utils import application_recipients, sync_user_role_groups
 from notifications.models import Notification
+from notifications.utils import notify_many
 
 
 def is_admin_user(user) -> bool:
@@ -28,6 +35,11 @@ def is_admin_user(user) -> bool:
 		return bool(is_admin)
 	except Exception:
 		return bool(user.is_authenticated and (user.is_superuser or user.is_staff))
+
+
+@query_budget(10)
+@cache_anonymous_page
+@use_replica
 def groups_list(request):
 	# Show all groups to everyone; restrict actions/details separately
 	groups_qs = Group.objects.order_by("name")
@@ -67,6 +79,7 @@ def groups_list(request):
 	)
 
 
+@query_budget(8)
 @login_required
 def my_groups(request):
 	# Admins see all groups they belong to, including Members; others hide Members
@@ -76,12 +89,14 @@ def my_groups(request):
 		.order_by("group__name")
 	)
 	memberships = base_qs
-	if not is_admin_user(request.user):
+	admin = is_admin_user(request.user)
+	if not admin:
 		memberships = memberships.exclude(group__name__in=["Members", "Leaders", "Admin"])
 	items = [{"group": m.group, "is_leader": m.is_leader} for m in memberships]
-	return render(request, "groups/my_groups.html", {"items": items, "is_admin": is_admin_user(request.user)})
+	return render(request, "groups/my_groups.html", {"items": items, "is_admin": admin})
 
 
+@login_required
 def group_detail(request, pk: int):
 	group = get_object_or_404(Group, pk=pk)
 
@@ -100,6 +115,7 @@ def group_detail(request, pk: int):
 		"leaders": leader_members,
 		"is_admin": admin,
 		"is_leader": is_leader,
+		"is_member": is_member,
 	}
 	return render(request, "groups/detail.html", context)
 
@@ -128,16 +144,16 @@ def apply_to_group(request, pk: int):
 			)
 			if created:
 				# Notify group leaders and admins about new application
-				leader_ids = list(GroupMembership.objects.filter(group=group, is_leader=True).values_list("user_id", flat=True))
-				admin_ids = list(GroupMembership.objects.filter(group__name="Admin").values_list("user_id", flat=True))
-				recipients = set(leader_ids + admin_ids)
-				for rid in recipients:
-					Notification.objects.create(
+				recipients = application_recipients([group.pk])[group.pk]
+				notify_many([
+					Notification(
 						actor=request.user,
 						recipient_id=rid,
 						text=f"{request.user.get_username()} applied to join {group.name}",
 						url=reverse('groups:group_applications', kwargs={'group_pk': group.pk}),
 					)
+					for rid in recipients
+				])
 				messages.success(request, "Application submitted.")
 			else:
 				messages.info(request, "You already have a pending application.")
@@ -273,6 +289,7 @@ def member_detail(request, group_pk: int, user_pk: int):
 
 
 @login_required
+@conditional_page(lambda request, group_pk: GroupActivity.objects.filter(group_id=group_pk), related=("groups",))
 def activities_list(request, group_pk: int):
 	group = get_object_or_404(Group, pk=group_pk)
 	# Members of group and admins can view; leaders can manage
@@ -378,8 +395,29 @@ def activity_delete(request, activity_pk: int):
 	return render(request, "groups/confirm_activity_delete.html", {"group": group, "activity": act})
 
 
+def _activities_csv_rows(qs, total_attendance):
+	import csv
+	writer = csv.writer(Echo())
+	yield writer.writerow(["Date", "Kind", "Title", "Location", "Start", "End", "Attendance"])
+	for a in qs.iterator(chunk_size=500):
+		yield writer.writerow([
+			a.date.isoformat(),
+			a.kind,
+			a.title,
+			a.location or "",
+			a.start_time.isoformat() if a.start_time else "",
+			a.end_time.isoformat() if a.end_time else "",
+			a.attendance_count or 0,
+		])
+	# Summary row
+	yield writer.writerow([])
+	yield writer.writerow(["Totals", "", "", "", "", "", total_attendance])
+
+
+@use_replica
 @login_required
 @user_passes_test(is_admin_user)
+@conditional_page(lambda request, group_pk: GroupActivity.objects.filter(group_id=group_pk), related=("groups",))
 def activities_report(request, group_pk: int):
 	"""Admin-only activity report for a group, with optional CSV export.
 
@@ -413,34 +451,21 @@ def activities_report(request, group_pk: int):
 
 	qs = qs.order_by("date", "start_time")
 
-	# Aggregates
-	total_count = qs.count()
-	total_attendance = sum((a.attendance_count or 0) for a in qs)
-
 	# Format toggle
 	if request.GET.get("format") == "csv":
-		# CSV export
-		import csv
-		response = HttpResponse(content_type="text/csv")
+		# Streamed row by row so a long history never sits in memory; pinned to
+		# the alias picked now, as the rows are read after the view returns
+		qs = qs.using(qs.db)
+		total_attendance = qs.aggregate(total=Sum("attendance_count"))["total"] or 0
 		filename = f"activities_{group.pk}.csv"
+		response = StreamingHttpResponse(_activities_csv_rows(qs, total_attendance), content_type="text/csv")
 		response["Content-Disposition"] = f"attachment; filename={filename}"
-		writer = csv.writer(response)
-		writer.writerow(["Date", "Kind", "Title", "Location", "Start", "End", "Attendance"]) 
-		for a in qs:
-			writer.writerow([
-				a.date.isoformat(),
-				a.kind,
-				a.title,
-				a.location or "",
-				a.start_time.isoformat() if a.start_time else "",
-				a.end_time.isoformat() if a.end_time else "",
-				a.attendance_count or 0,
-			])
-		# Summary row
-		writer.writerow([])
-		writer.writerow(["Totals", "", "", "", "", "", total_attendance])
 		return response
 
+	# Aggregates
+	total_count = qs.count()
+	total_attendance = sum((a.attendance_count or 0) for a in qs)
+
 	kinds = [(k, v) for k, v in GroupActivity.Kind.choices]
 	context = {
 		"group": group,
@@ -484,6 +509,8 @@ def change_group_leader(request, pk: int):
 			for uid in prev_leader_ids:
 				if uid == new_leader.pk:
 					continue
+				# Bulk update above skipped signals; drop their leader-only announcements
+				sync_membership_audience(uid, group.pk)
 				try:
 					u = User.objects.get(pk=uid)
 					sync_user_role_groups(u)
@@ -518,20 +545,22 @@ def delete_group(request, pk: int):
 	return render(request, "groups/confirm_delete.html", {"group": group})
 
 
-def groups_api(request):
+@cache_anonymous_page
+async def groups_api(request):
 	# Select2 expects { results: [{id, text}], pagination: {more} }
+	# Async: signup-form autocomplete fires a request per keystroke
 	q = request.GET.get("q", "").strip()
 	page = int(request.GET.get("page", "1") or 1)
 	page_size = 20
 	qs = Group.objects.exclude(name__in=["Leaders", "Members", "Admin"])  # base groups not selectable at signup
 	if q:
 		qs = qs.filter(name__icontains=q)
-	total = qs.count()
+	total = await qs.acount()
 	start = (page - 1) * page_size
 	end = start + page_size
 	items = [
-		{"id": g.pk, "text": g.name}
-		for g in qs.order_by("name")[start:end]
+		{"id": pk, "text": name}
+		async for pk, name in qs.order_by("name").values_list("pk", "name")[start:end]
 	]
 	more = end < total
 	return JsonResponse({"results": items, "pagination": {"more": more}})
@@ -1,3 +1,27 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Notification
+
+
+# QueryInspectorMiddleware is sync-only; left on, it would run the chain in sync mode
+@override_settings(QUERY_INSPECTOR=False)
+class UnreadCountTests(TestCase):
+	url = reverse("notifications:unread_count")
+
+	async def test_anonymous_visitors_are_sent_to_login(self):
+		response = await self.async_client.get(self.url)
+		self.assertEqual(response.status_code, 302)
+		self.assertTrue(response["Location"].startswith(reverse("login")))
+
+	async def test_counts_only_the_users_unread_notifications(self):
+		user = await User.objects.acreate_user("member", password="pw")
+		other = await User.objects.acreate_user("other", password="pw")
+		await Notification.objects.acreate(recipient=user, text="New")
+		await Notification.objects.acreate(recipient=user, text="Seen", read=True)
+		await Notification.objects.acreate(recipient=other, text="Not mine")
+
+		await self.async_client.aforce_login(user)
+		response = await self.async_client.get(self.url)
+		self.assertEqual(response.json(), {"unread": 1})
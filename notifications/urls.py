@@ -5,5 +5,6 @@ app_name = "notifications"
 
 urlpatterns = [
     path("", views.notifications_list, name="list"),
+    path("unread-count/", views.unread_count, name="unread_count"),
     path("mark-read/<int:pk>/", views.mark_read, name="mark_read"),
 ]
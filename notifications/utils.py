@@ -0,0 +1,14 @@
+from core.caching import bump
+from .models import Notification
+
+
+def notify_many(notifications: list[Notification]) -> list[Notification]:
+	"""bulk_create notifications and invalidate each recipient's cached unread badge.
+
+	bulk_create sends no post_save, so the per-recipient "notifications" cache
+	namespace has to be bumped here.
+	"""
+	created = Notification.objects.bulk_create(notifications)
+	for recipient_id in {n.recipient_id for n in notifications}:
+		bump("notifications", recipient_id)
+	return created
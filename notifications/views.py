@@ -1,14 +1,26 @@
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+
+from core.queries import query_budget
 from .models import Notification
 
 
+@query_budget(6)
 @login_required
 def notifications_list(request):
 	notes = Notification.objects.filter(recipient=request.user).order_by('-created_at')[:200]
 	return render(request, 'notifications/list.html', { 'notifications': notes })
 
 
+@login_required
+async def unread_count(request):
+	"""Unread badge count as JSON, for polling without re-rendering a page."""
+	user = await request.auser()
+	count = await Notification.objects.filter(recipient_id=user.pk, read=False).acount()
+	return JsonResponse({"unread": count})
+
+
 @login_required
 def mark_read(request, pk: int):
 	note = get_object_or_404(Notification, pk=pk, recipient=request.user)
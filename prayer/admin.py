@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PrayerRequest
+
+
+@admin.register(PrayerRequest)
+class PrayerRequestAdmin(admin.ModelAdmin):
+	list_display = ("author", "visibility", "group", "prayed_count", "is_answered", "created_at")
+	list_filter = ("visibility", "is_answered")
+	list_select_related = ("author", "group")
+	search_fields = ("body", "author__username")
+	readonly_fields = ("scope", "prayed_count")
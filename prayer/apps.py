@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PrayerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'prayer'
+    def ready(self):
+        # Import signal handlers
+        from . import signals  # noqa: F401
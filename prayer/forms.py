@@ -0,0 +1,27 @@
+from django import forms
+
+from groups.models import Group
+from .models import PrayerRequest
+
+
+class PrayerRequestForm(forms.ModelForm):
+    class Meta:
+        model = PrayerRequest
+        fields = ["body", "visibility", "group", "is_anonymous"]
+        widgets = {
+            "body": forms.Textarea(attrs={"rows": 3, "placeholder": "What would you like the church to pray about?"}),
+        }
+        labels = {"body": "", "visibility": "Share with"}
+
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        profile = getattr(user, "profile", None)
+        groups = Group.objects.all() if profile and profile.is_admin else Group.objects.filter(memberships__user=user)
+        self.fields["group"].queryset = groups.order_by("name")
+        self.fields["group"].required = False
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get("visibility") != PrayerRequest.Visibility.PUBLIC and not cleaned.get("group"):
+            self.add_error("group", "Choose the group to share this with.")
+        return cleaned
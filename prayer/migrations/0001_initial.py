@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('groups', '0003_groupactivity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrayerRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('body', models.TextField(max_length=1000)),
+                ('is_anonymous', models.BooleanField(default=False, help_text='Hide your name from other members.')),
+                ('visibility', models.CharField(choices=[('PUBLIC', 'Public'), ('GROUP', 'Group-specific'), ('LEADER_ONLY', 'Leader-only')], default='PUBLIC', max_length=16)),
+                ('scope', models.CharField(editable=False, max_length=32)),
+                ('prayed_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('is_answered', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prayer_requests', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='prayer_requests', to='groups.group')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PrayedFor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prayed_for', to=settings.AUTH_USER_MODEL)),
+                ('prayer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prayed_by', to='prayer.prayerrequest')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='prayerrequest',
+            index=models.Index(fields=['scope', '-id'], name='prayer_scope_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='prayerrequest',
+            index=models.Index(fields=['author', '-id'], name='prayer_author_feed'),
+        ),
+        migrations.AddConstraint(
+            model_name='prayedfor',
+            constraint=models.UniqueConstraint(fields=('user', 'prayer'), name='prayed_for_unique'),
+        ),
+    ]
@@ -1,3 +1,69 @@
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+from announcements.models import Announcement
+from groups.models import Group
+
+
+class PrayerRequest(models.Model):
+	"""A request on the prayer wall.
+
+	Who may read it follows the announcement rules, but the rule is folded
+	into ``scope`` when the row is saved ("public", "group:<id>" or
+	"leaders:<id>"), so the feed is a single ``scope IN (...)`` lookup on
+	the viewer's scopes (see prayer.utils.scopes_for).
+	"""
+
+	Visibility = Announcement.Visibility
+
+	author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="prayer_requests")
+	body = models.TextField(max_length=1000)
+	is_anonymous = models.BooleanField(default=False, help_text="Hide your name from other members.")
+	visibility = models.CharField(max_length=16, choices=Visibility.choices, default=Visibility.PUBLIC)
+	group = models.ForeignKey(Group, on_delete=models.CASCADE, null=True, blank=True, related_name="prayer_requests")
+	scope = models.CharField(max_length=32, editable=False)
+	# Bumped with F() by prayer.utils.pray_for; never saved from an instance
+	prayed_count = models.PositiveIntegerField(default=0, editable=False)
+	is_answered = models.BooleanField(default=False)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		indexes = [
+			# The feed: newest first within each scope, keyset on id
+			models.Index(fields=["scope", "-id"], name="prayer_scope_feed"),
+			models.Index(fields=["author", "-id"], name="prayer_author_feed"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.author} ({self.scope}): {self.body[:40]}"
+
+	@classmethod
+	def scope_for(cls, visibility: str, group_id) -> str:
+		if visibility == cls.Visibility.GROUP and group_id:
+			return f"group:{group_id}"
+		if visibility == cls.Visibility.LEADER_ONLY and group_id:
+			return f"leaders:{group_id}"
+		return "public"
+
+	def save(self, *args, **kwargs):
+		if self.visibility == self.Visibility.PUBLIC:
+			self.group = None
+		self.scope = self.scope_for(self.visibility, self.group_id)
+		update_fields = kwargs.get("update_fields")
+		if update_fields is not None:
+			kwargs["update_fields"] = {*update_fields, "scope", "group"}
+		super().save(*args, **kwargs)
+
+
+class PrayedFor(models.Model):
+	"""One member praying for one request; counted once per member."""
+
+	prayer = models.ForeignKey(PrayerRequest, on_delete=models.CASCADE, related_name="prayed_by")
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="prayed_for")
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=["user", "prayer"], name="prayed_for_unique")]
+
+	def __str__(self) -> str:
+		return f"{self.user_id} -> {self.prayer_id}"
@@ -0,0 +1,18 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from core.caching import bump
+from .models import PrayerRequest
+
+# Saves and deletes bump the "prayer" cache namespace for the request's
+# scope (core.signals); a request moved to another scope must also leave
+# the cached page of the scope it was in.
+
+
+@receiver(pre_save, sender=PrayerRequest)
+def bump_previous_scope(sender, instance: PrayerRequest, **kwargs):
+    if instance._state.adding:
+        return
+    previous = PrayerRequest.objects.filter(pk=instance.pk).values_list("scope", flat=True).first()
+    if previous and previous != instance.scope:
+        bump("prayer", previous)
@@ -1,3 +1,60 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from groups.models import Group, GroupMembership
+from .models import PrayerRequest
+from .utils import PAGE_SIZE, feed, pray_for
+
+
+class PrayerWallTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.choir = Group.objects.create(name="Choir")
+		self.youth = Group.objects.create(name="Youth")
+		self.alice = User.objects.create_user("alice", password="pw")
+		self.bob = User.objects.create_user("bob", password="pw")
+		GroupMembership.objects.create(user=self.alice, group=self.choir, is_leader=True)
+		GroupMembership.objects.create(user=self.bob, group=self.choir)
+		Visibility = PrayerRequest.Visibility
+		self.public = PrayerRequest.objects.create(author=self.bob, body="For the harvest")
+		self.group = PrayerRequest.objects.create(author=self.bob, body="For our rehearsal", visibility=Visibility.GROUP, group=self.choir)
+		self.leaders = PrayerRequest.objects.create(author=self.bob, body="Private", visibility=Visibility.LEADER_ONLY, group=self.choir)
+		self.other = PrayerRequest.objects.create(author=self.alice, body="Camp", visibility=Visibility.GROUP, group=self.youth)
+
+	def test_feed_follows_visibility(self):
+		self.assertEqual([p.pk for p in feed(self.alice)], [self.leaders.pk, self.group.pk, self.public.pk])
+		self.assertEqual([p.pk for p in feed(self.bob)], [self.group.pk, self.public.pk])
+		self.assertEqual(self.leaders.scope, f"leaders:{self.choir.pk}")
+
+	def test_cached_first_page_sees_new_requests_and_live_counts(self):
+		feed(self.bob)
+		newer = PrayerRequest.objects.create(author=self.alice, body="New")
+		pray_for(self.public.pk, self.alice)
+		# Only the public page is rebuilt; the group page is still cached
+		with self.assertNumQueries(2):
+			rows = feed(self.bob)
+		self.assertEqual(rows[0].pk, newer.pk)
+		with self.assertNumQueries(1):
+			rows = feed(self.bob)
+		self.assertEqual({p.pk: p.prayed_count for p in rows}[self.public.pk], 1)
+
+	def test_praying_counts_each_member_once(self):
+		pray_for(self.public.pk, self.alice)
+		pray_for(self.public.pk, self.alice)
+		self.assertEqual(pray_for(self.public.pk, self.bob), 2)
+		self.assertTrue(next(p for p in feed(self.bob) if p.pk == self.public.pk).has_prayed)
+
+	def test_keyset_pages(self):
+		PrayerRequest.objects.bulk_create([PrayerRequest(author=self.bob, body=str(i), scope="public") for i in range(PAGE_SIZE)])
+		first = feed(self.bob)
+		second = feed(self.bob, before=first[-1].pk)
+		self.assertEqual(len(first), PAGE_SIZE)
+		self.assertEqual([p.pk for p in second], [self.group.pk, self.public.pk])
+
+	def test_hidden_requests_cannot_be_prayed_for(self):
+		self.client.force_login(self.bob)
+		self.assertEqual(self.client.post(f"/prayer/{self.other.pk}/pray/").status_code, 404)
+		self.client.force_login(self.alice)
+		response = self.client.post(f"/prayer/{self.leaders.pk}/pray/", headers={"Accept": "application/json"})
+		self.assertEqual(response.json(), {"prayed_count": 1})
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+app_name = "prayer"
+
+urlpatterns = [
+    path("", views.wall, name="wall"),
+    path("new/", views.create, name="create"),
+    path("<int:pk>/pray/", views.pray, name="pray"),
+    path("<int:pk>/answered/", views.mark_answered, name="answered"),
+    path("<int:pk>/delete/", views.delete, name="delete"),
+]
@@ -0,0 +1,95 @@
+import heapq
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+
+from core.caching import cached_queryset, get_or_set
+from groups.models import GroupMembership
+from .models import PrayedFor, PrayerRequest
+
+PAGE_SIZE = 20
+FIRST_PAGE_TIMEOUT = 300
+
+
+def _feed(qs):
+    return qs.select_related("author", "group").order_by("-id")
+
+
+def _member_scopes(user_id: int) -> list[str]:
+    scopes = ["public"]
+    for group_id, is_leader in GroupMembership.objects.filter(user_id=user_id).values_list("group_id", "is_leader"):
+        scopes.append(f"group:{group_id}")
+        if is_leader:
+            scopes.append(f"leaders:{group_id}")
+    return scopes
+
+
+def scopes_for(user) -> list[str] | None:
+    """Scopes whose requests ``user`` may read; None means all of them (admins)."""
+    profile = getattr(user, "profile", None)
+    if profile and profile.is_admin:
+        return None
+    # Memberships are in the "groups" namespace, so joining or leaving a group resets this
+    return get_or_set("groups", ("prayer.scopes", user.pk), lambda: _member_scopes(user.pk))
+
+
+def can_read(user, prayer: PrayerRequest) -> bool:
+    scopes = scopes_for(user)
+    return scopes is None or prayer.scope in scopes or prayer.author_id == user.pk
+
+
+@cached_queryset("prayer", timeout=FIRST_PAGE_TIMEOUT, scope=lambda scope: scope)
+def first_page(scope: str) -> list[PrayerRequest]:
+    """Newest requests of one scope. Cached until a request in that scope is saved or deleted."""
+    return _feed(PrayerRequest.objects.filter(scope=scope))[:PAGE_SIZE]
+
+
+def _with_live_counts(rows: list[PrayerRequest], user) -> list[PrayerRequest]:
+    """Overlay the current counters and the viewer's own "prayed" mark, in one query.
+
+    Counters change far more often than the requests themselves, so they are
+    not part of the cached page (pray_for does not invalidate it).
+    """
+    live = {
+        pk: (count, prayed)
+        for pk, count, prayed in PrayerRequest.objects.filter(pk__in=[p.pk for p in rows])
+        .annotate(prayed=Exists(PrayedFor.objects.filter(prayer=OuterRef("pk"), user_id=user.pk)))
+        .values_list("pk", "prayed_count", "prayed")
+    }
+    fresh = []
+    for prayer in rows:
+        if prayer.pk in live:  # Skip one deleted since it was cached
+            prayer.prayed_count, prayer.has_prayed = live[prayer.pk]
+            fresh.append(prayer)
+    return fresh
+
+
+def feed(user, before: int = 0) -> list[PrayerRequest]:
+    """A page of the wall as ``user`` sees it, newest first, older than ``before``."""
+    scopes = scopes_for(user)
+    if before or scopes is None:
+        qs = PrayerRequest.objects.all()
+        if scopes is not None:
+            qs = qs.filter(scope__in=scopes)
+        if before:
+            qs = qs.filter(id__lt=before)
+        rows = list(_feed(qs)[:PAGE_SIZE])
+    else:
+        # Each cached page is already newest first
+        pages = [first_page(scope) for scope in scopes]
+        rows = list(heapq.merge(*pages, key=lambda p: -p.pk))[:PAGE_SIZE]
+    return _with_live_counts(rows, user)
+
+
+def pray_for(prayer_id: int, user) -> int:
+    """Count ``user`` once towards a request; returns the new total."""
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                PrayedFor.objects.create(prayer_id=prayer_id, user=user)
+        except IntegrityError:
+            pass  # Already counted
+        else:
+            # A single UPDATE, so simultaneous taps are never lost
+            PrayerRequest.objects.filter(pk=prayer_id).update(prayed_count=F("prayed_count") + 1)
+    return PrayerRequest.objects.filter(pk=prayer_id).values_list("prayed_count", flat=True).get()
@@ -1,3 +1,87 @@
-from django.shortcuts import render
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
 
-# Create your views here.
+from core.http import int_param
+from core.queries import query_budget
+from .forms import PrayerRequestForm
+from .models import PrayerRequest
+from .utils import PAGE_SIZE, can_read, feed, pray_for
+
+MY_REQUESTS = 5
+
+
+def _can_manage(user, prayer: PrayerRequest) -> bool:
+	profile = getattr(user, "profile", None)
+	return prayer.author_id == user.pk or bool(profile and profile.is_admin)
+
+
+def _readable_or_404(user, pk: int) -> PrayerRequest:
+	prayer = get_object_or_404(PrayerRequest, pk=pk)
+	if not can_read(user, prayer):
+		raise Http404()
+	return prayer
+
+
+@query_budget(8)
+@login_required
+def wall(request, form=None):
+	"""The prayer wall: the newest requests the member may read, keyset-paginated on id."""
+	before = int_param(request.GET.get("before"))
+	prayers = feed(request.user, before)
+	mine = [] if before else list(
+		PrayerRequest.objects.filter(author=request.user).select_related("group").order_by("-id")[:MY_REQUESTS]
+	)
+	return render(request, "prayer/wall.html", {
+		"prayers": prayers,
+		"next_before": prayers[-1].pk if len(prayers) == PAGE_SIZE else None,
+		"mine": mine,
+		"form": form or PrayerRequestForm(user=request.user),
+	})
+
+
+@require_POST
+@login_required
+def create(request):
+	form = PrayerRequestForm(request.POST, user=request.user)
+	if not form.is_valid():
+		return wall(request, form=form)
+	prayer = form.save(commit=False)
+	prayer.author = request.user
+	prayer.save()
+	messages.success(request, "Your prayer request has been shared.")
+	return redirect("prayer:wall")
+
+
+@require_POST
+@login_required
+def pray(request, pk: int):
+	prayer = _readable_or_404(request.user, pk)
+	count = pray_for(prayer.pk, request.user)
+	if request.headers.get("Accept", "").startswith("application/json"):
+		return JsonResponse({"prayed_count": count})
+	return redirect("prayer:wall")
+
+
+@require_POST
+@login_required
+def mark_answered(request, pk: int):
+	prayer = get_object_or_404(PrayerRequest, pk=pk)
+	if not _can_manage(request.user, prayer):
+		raise Http404()
+	prayer.is_answered = not prayer.is_answered
+	prayer.save(update_fields=["is_answered"])
+	return redirect("prayer:wall")
+
+
+@require_POST
+@login_required
+def delete(request, pk: int):
+	prayer = get_object_or_404(PrayerRequest, pk=pk)
+	if not _can_manage(request.user, prayer):
+		raise Http404()
+	prayer.delete()
+	messages.success(request, "Prayer request removed.")
+	return redirect("prayer:wall")
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+	list_display = ("title", "kind", "scope", "group", "updated_at")
+	list_filter = ("kind", "scope")
+	search_fields = ("title",)
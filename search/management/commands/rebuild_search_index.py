@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.utils import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the site-wide search index from announcements, events, groups and activities."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents."))
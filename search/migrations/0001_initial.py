@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:01
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('groups', '0003_groupactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ANNOUNCEMENT', 'Announcement'), ('EVENT', 'Event'), ('GROUP', 'Group'), ('ACTIVITY', 'Group activity')], max_length=16)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(blank=True, max_length=255)),
+                ('scope', models.CharField(choices=[('PUBLIC', 'Everyone'), ('MEMBERS', 'Signed-in members'), ('GROUP', 'Group members'), ('LEADERS', 'Group leaders'), ('ADMIN', 'Admins only')], default='PUBLIC', max_length=16)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='groups.group')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scope', 'group'], name='search_document_scope_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+	"""One searchable row per indexed object, with the visibility scope it was indexed under.
+
+	The full-text index lives beside this table: an FTS5 virtual table on SQLite,
+	or `search_vector` with a GIN index on Postgres (see migration 0002).
+	"""
+
+	class Kind(models.TextChoices):
+		ANNOUNCEMENT = "ANNOUNCEMENT", "Announcement"
+		EVENT = "EVENT", "Event"
+		GROUP = "GROUP", "Group"
+		ACTIVITY = "ACTIVITY", "Group activity"
+
+	class Scope(models.TextChoices):
+		PUBLIC = "PUBLIC", "Everyone"
+		MEMBERS = "MEMBERS", "Signed-in members"
+		GROUP = "GROUP", "Group members"
+		LEADERS = "LEADERS", "Group leaders"
+		ADMIN = "ADMIN", "Admins only"
+
+	kind = models.CharField(max_length=16, choices=Kind.choices)
+	object_id = models.PositiveBigIntegerField()
+	title = models.CharField(max_length=255)
+	body = models.TextField(blank=True)
+	url = models.CharField(max_length=255, blank=True)
+	scope = models.CharField(max_length=16, choices=Scope.choices, default=Scope.PUBLIC)
+	group = models.ForeignKey('groups.Group', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+	search_vector = SearchVectorField(null=True, editable=False)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		unique_together = ("kind", "object_id")
+		indexes = [
+			models.Index(fields=["scope", "group"], name="search_document_scope_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.get_kind_display()}: {self.title}"
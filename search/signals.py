@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+
+from .utils import INDEXED_MODELS, index_instance, unindex_instance
+
+
+def update_search_document(sender, instance, **kwargs):
+    index_instance(instance)
+
+
+def remove_search_document(sender, instance, **kwargs):
+    unindex_instance(instance)
+
+
+for _model in INDEXED_MODELS:
+    post_save.connect(update_search_document, sender=_model, dispatch_uid=f"search_index_{_model.__name__}")
+    post_delete.connect(remove_search_document, sender=_model, dispatch_uid=f"search_unindex_{_model.__name__}")
@@ -0,0 +1,52 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase
+
+from announcements.models import Announcement
+from groups.models import Group, GroupMembership
+from .models import SearchDocument
+from .utils import rebuild_index, search
+
+
+class SearchTests(TestCase):
+	def setUp(self):
+		self.choir = Group.objects.create(name="Choir", description="Sings on Sundays")
+		self.member = User.objects.create_user("member", password="pw")
+		GroupMembership.objects.create(user=self.member, group=self.choir)
+
+	def titles(self, user, query):
+		return [doc.title for doc in search(user, query)]
+
+	def test_title_matches_rank_first_and_prefixes_match(self):
+		Announcement.objects.create(title="Picnic notice", body="Bring a rehearsal schedule")
+		Announcement.objects.create(title="Rehearsal moved", body="Now at six")
+		self.assertEqual(self.titles(self.member, "rehears")[:2], ["Rehearsal moved", "Picnic notice"])
+
+	def test_results_follow_visibility(self):
+		Announcement.objects.create(title="Choir rota", body="...", visibility=Announcement.Visibility.GROUP, group=self.choir)
+		self.assertEqual(self.titles(self.member, "rota"), ["Choir rota"])
+		self.assertEqual(self.titles(AnonymousUser(), "rota"), [])
+		self.assertEqual(self.titles(User.objects.create_user("outsider", password="pw"), "rota"), [])
+
+	def test_query_syntax_is_not_interpreted(self):
+		Announcement.objects.create(title="Choir or band near the hall", body="...")
+		self.assertEqual(self.titles(self.member, 'choir" OR NEAR(*'), ["Choir or band near the hall"])
+		self.assertEqual(self.titles(self.member, '"*'), [])
+
+	def test_index_follows_saves_deletes_and_rebuilds(self):
+		notice = Announcement.objects.create(title="Harvest", body="...")
+		notice.title = "Thanksgiving"
+		notice.save()
+		self.assertEqual(self.titles(self.member, "harvest"), [])
+		self.assertEqual(self.titles(self.member, "thanksgiving"), ["Thanksgiving"])
+
+		self.assertEqual(rebuild_index(), SearchDocument.objects.count())
+		self.assertEqual(self.titles(self.member, "thanksgiving"), ["Thanksgiving"])
+		notice.delete()
+		self.assertEqual(self.titles(self.member, "thanksgiving"), [])
+
+	def test_announcements_link_to_their_group_or_the_home_feed(self):
+		notice = Announcement.objects.create(title="Picnic", body="...")
+		rota = Announcement.objects.create(title="Choir rota", body="...", visibility=Announcement.Visibility.GROUP, group=self.choir)
+		self.assertEqual(search(self.member, "picnic")[0].url, f"/#announcement-{notice.pk}")
+		self.assertEqual(search(self.member, "rota")[0].url, f"/groups/{self.choir.pk}/")
+		self.assertContains(self.client.get("/"), f'id="announcement-{notice.pk}"')
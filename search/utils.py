@@ -0,0 +1,174 @@
+import re
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.urls import reverse
+
+from announcements.models import Announcement
+from events.models import Event
+from groups.models import Group, GroupActivity, GroupMembership
+from .models import SearchDocument
+
+FTS_TABLE = "search_searchdocument_fts"
+SEARCH_CONFIG = "english"
+BASE_GROUP_NAMES = ("Admin", "Leaders", "Members")
+PAGE_SIZE = 20
+
+_ANNOUNCEMENT_SCOPES = {
+    Announcement.Visibility.PUBLIC: SearchDocument.Scope.PUBLIC,
+    Announcement.Visibility.GROUP: SearchDocument.Scope.GROUP,
+    Announcement.Visibility.LEADER_ONLY: SearchDocument.Scope.LEADERS,
+}
+
+
+def _announcement_document(ann: Announcement) -> dict:
+    scope = _ANNOUNCEMENT_SCOPES.get(ann.visibility, SearchDocument.Scope.ADMIN)
+    if scope != SearchDocument.Scope.PUBLIC and not ann.group_id:
+        scope = SearchDocument.Scope.ADMIN
+    # No page of their own: group notices link to the group, the rest to their card on the home feed
+    if ann.group_id:
+        url = reverse("groups:detail", args=[ann.group_id])
+    else:
+        url = f"{reverse('home')}#announcement-{ann.pk}"
+    return {"title": ann.title, "body": ann.body, "url": url, "scope": scope, "group_id": ann.group_id}
+
+
+def _event_document(ev: Event) -> dict:
+    # Mirrors events.views: global events for any member, group events for that group
+    if ev.is_global:
+        scope = SearchDocument.Scope.MEMBERS
+    elif ev.group_id:
+        scope = SearchDocument.Scope.GROUP
+    else:
+        scope = SearchDocument.Scope.ADMIN
+    body = "\n".join(part for part in (ev.body, ev.location) if part)
+    return {"title": ev.title, "body": body, "url": reverse("events:detail", args=[ev.slug]), "scope": scope, "group_id": ev.group_id}
+
+
+def _group_document(group: Group) -> dict:
+    # Everyone sees the group list, except the base role groups
+    scope = SearchDocument.Scope.ADMIN if group.name in BASE_GROUP_NAMES else SearchDocument.Scope.PUBLIC
+    return {"title": group.name, "body": group.description, "url": reverse("groups:list"), "scope": scope, "group_id": group.pk}
+
+
+def _activity_document(act: GroupActivity) -> dict:
+    return {
+        "title": act.title,
+        "body": act.notes,
+        "url": reverse("groups:activities_list", kwargs={"group_pk": act.group_id}),
+        "scope": SearchDocument.Scope.GROUP,
+        "group_id": act.group_id,
+    }
+
+
+INDEXED_MODELS = {
+    Announcement: (SearchDocument.Kind.ANNOUNCEMENT, _announcement_document),
+    Event: (SearchDocument.Kind.EVENT, _event_document),
+    Group: (SearchDocument.Kind.GROUP, _group_document),
+    GroupActivity: (SearchDocument.Kind.ACTIVITY, _activity_document),
+}
+
+
+def _vendor(using: str = "default") -> str:
+    return connections[using].vendor
+
+
+def _update_search_vectors(qs) -> None:
+    if _vendor(qs.db) == "postgresql":
+        qs.update(
+            search_vector=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+        )
+
+
+def index_instance(instance) -> None:
+    """Create or refresh the search document for a model instance.
+
+    On SQLite the FTS5 table is kept in step by triggers; on Postgres the
+    tsvector column is recomputed here.
+    """
+    kind, build = INDEXED_MODELS[type(instance)]
+    doc, _ = SearchDocument.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=build(instance))
+    _update_search_vectors(SearchDocument.objects.filter(pk=doc.pk))
+
+
+def unindex_instance(instance) -> None:
+    kind, _ = INDEXED_MODELS[type(instance)]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def rebuild_index() -> int:
+    """Drop and recreate every search document; returns the number indexed."""
+    SearchDocument.objects.all().delete()
+    total = 0
+    for model, (kind, build) in INDEXED_MODELS.items():
+        docs = [SearchDocument(kind=kind, object_id=obj.pk, **build(obj)) for obj in model.objects.all().iterator()]
+        SearchDocument.objects.bulk_create(docs, batch_size=500)
+        total += len(docs)
+    _update_search_vectors(SearchDocument.objects.all())
+    if _vendor() == "sqlite":
+        with connections["default"].cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return total
+
+
+def visible_documents(user: User):
+    """Documents the user may see, following the same rules as the source views."""
+    from groups.views import is_admin_user
+
+    qs = SearchDocument.objects.all()
+    if not user.is_authenticated:
+        return qs.filter(scope=SearchDocument.Scope.PUBLIC)
+    if is_admin_user(user):
+        return qs
+    member_group_ids = []
+    leader_group_ids = []
+    for group_id, is_leader in GroupMembership.objects.filter(user=user).values_list("group_id", "is_leader"):
+        member_group_ids.append(group_id)
+        if is_leader:
+            leader_group_ids.append(group_id)
+    return qs.filter(
+        Q(scope__in=[SearchDocument.Scope.PUBLIC, SearchDocument.Scope.MEMBERS])
+        | Q(scope=SearchDocument.Scope.GROUP, group_id__in=member_group_ids)
+        | Q(scope=SearchDocument.Scope.LEADERS, group_id__in=leader_group_ids)
+    )
+
+
+def _fts5_match(query: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 syntax; prefix-match each
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
+
+
+def ranked_documents(user: User, query: str):
+    """Visible documents matching `query`, best match first."""
+    qs = visible_documents(user)
+    vendor = _vendor(qs.db)
+    if vendor == "sqlite":
+        match = _fts5_match(query)
+        if not match:
+            return qs.none()
+        return qs.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = search_searchdocument.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            select={"rank": f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+        ).order_by("rank", "-updated_at")
+    if vendor == "postgresql":
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            qs.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-updated_at")
+        )
+    # Other backends: unranked substring match
+    return qs.filter(Q(title__icontains=query) | Q(body__icontains=query)).order_by("-updated_at")
+
+
+def search(user: User, query: str, page=1):
+    """Return a paginator page of ranked, visibility-filtered results."""
+    query = (query or "").strip()
+    qs = ranked_documents(user, query) if query else SearchDocument.objects.none()
+    return Paginator(qs, PAGE_SIZE).get_page(page)
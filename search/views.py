@@ -0,0 +1,11 @@
+from django.shortcuts import render
+
+from core.queries import query_budget
+from .utils import search
+
+
+@query_budget(8)
+def search_view(request):
+	q = request.GET.get("q", "").strip()
+	page_obj = search(request.user, q, request.GET.get("page", 1))
+	return render(request, "search/results.html", {"q": q, "page_obj": page_obj, "results": page_obj.object_list})
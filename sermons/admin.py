@@ -1,3 +1,39 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Sermon, SermonUpload
+from .uploads import discard_upload
+
+
+@admin.register(Sermon)
+class SermonAdmin(admin.ModelAdmin):
+	list_display = ("title", "preacher", "preached_on", "content_type", "size", "is_published")
+	list_filter = ("is_published",)
+	search_fields = ("title", "preacher", "scripture")
+	date_hierarchy = "preached_on"
+	readonly_fields = ("content_type", "size")
+
+	def save_model(self, request, obj, form, change):
+		# Large recordings are better sent from the sermon page's resumable uploader
+		if "media" in form.changed_data and obj.media:
+			upload = form.cleaned_data["media"]
+			obj.content_type = getattr(upload, "content_type", "") or obj.content_type
+			obj.size = upload.size
+		if not change:
+			obj.created_by = request.user
+		super().save_model(request, obj, form, change)
+
+
+@admin.register(SermonUpload)
+class SermonUploadAdmin(admin.ModelAdmin):
+	list_display = ("filename", "sermon", "received", "size", "created_by", "updated_at")
+	list_select_related = ("sermon", "created_by")
+
+	def has_add_permission(self, request):
+		return False
+
+	def delete_model(self, request, obj):
+		discard_upload(obj)
+
+	def delete_queryset(self, request, queryset):
+		for upload in queryset:
+			discard_upload(upload)
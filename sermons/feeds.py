@@ -0,0 +1,67 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Enclosure, Rss201rev2Feed
+
+from core.caching import get_or_set
+from .models import Sermon
+
+PODCAST_SIZE = 100
+
+
+class PodcastFeed(Rss201rev2Feed):
+	"""RSS 2.0 with the iTunes tags podcast apps look for."""
+
+	def rss_attributes(self):
+		attrs = super().rss_attributes()
+		attrs["xmlns:itunes"] = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+		return attrs
+
+	def add_root_elements(self, handler):
+		super().add_root_elements(handler)
+		handler.addQuickElement("itunes:author", self.feed["author_name"])
+		handler.addQuickElement("itunes:explicit", "false")
+
+	def add_item_elements(self, handler, item):
+		super().add_item_elements(handler, item)
+		handler.addQuickElement("itunes:author", item["author_name"])
+		if item.get("duration"):
+			handler.addQuickElement("itunes:duration", str(item["duration"]))
+
+
+def build_podcast(base_url: str) -> bytes:
+	feed = PodcastFeed(
+		title=settings.PODCAST_TITLE,
+		link=base_url + reverse("sermons:list"),
+		description=f"Sermons from {settings.PODCAST_AUTHOR}",
+		language="en",
+		author_name=settings.PODCAST_AUTHOR,
+		feed_url=base_url + reverse("sermons:podcast"),
+	)
+	sermons = Sermon.objects.filter(is_published=True).exclude(media="").order_by("-preached_on", "-id")[:PODCAST_SIZE]
+	for sermon in sermons:
+		link = base_url + reverse("sermons:detail", args=[sermon.slug])
+		feed.add_item(
+			title=sermon.title,
+			link=link,
+			description=sermon.description or sermon.scripture,
+			unique_id=link,
+			pubdate=timezone.make_aware(datetime.datetime.combine(sermon.preached_on, datetime.time(9))),
+			author_name=sermon.preacher,
+			enclosures=[Enclosure(base_url + reverse("sermons:media", args=[sermon.slug]), str(sermon.size), sermon.content_type)],
+			duration=sermon.duration_seconds,
+		)
+	return feed.writeString("utf-8").encode("utf-8")
+
+
+def podcast(base_url: str) -> tuple[bytes, str]:
+	"""The feed and its ETag, cached until a sermon changes."""
+
+	def build():
+		body = build_podcast(base_url)
+		return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+	return get_or_set("sermons", ("podcast", base_url), build, settings.PODCAST_CACHE_SECONDS)
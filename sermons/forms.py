@@ -0,0 +1,20 @@
+from django import forms
+from django.conf import settings
+
+
+class UploadStartForm(forms.Form):
+    filename = forms.CharField(max_length=255)
+    size = forms.IntegerField(min_value=1)
+    content_type = forms.CharField(max_length=100)
+
+    def clean_size(self):
+        size = self.cleaned_data["size"]
+        if size > settings.SERMON_UPLOAD_MAX_SIZE:
+            raise forms.ValidationError("File is larger than SERMON_UPLOAD_MAX_SIZE.")
+        return size
+
+    def clean_content_type(self):
+        content_type = self.cleaned_data["content_type"].split(";", 1)[0].strip().lower()
+        if not content_type.startswith(("audio/", "video/")):
+            raise forms.ValidationError("Only audio and video files can be uploaded.")
+        return content_type
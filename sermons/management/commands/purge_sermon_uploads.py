@@ -0,0 +1,21 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sermons.models import SermonUpload
+from sermons.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = "Delete unfinished sermon uploads (and their part files) that have not moved for a while."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=48, help="Idle time before an upload is abandoned (default 48).")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(hours=options["hours"])
+        stale = list(SermonUpload.objects.filter(updated_at__lt=cutoff))
+        for upload in stale:
+            discard_upload(upload)
+        self.stdout.write(self.style.SUCCESS(f"Removed {len(stale)} abandoned upload(s)."))
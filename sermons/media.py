@@ -0,0 +1,134 @@
+"""Serving sermon media with byte ranges.
+
+Players seek by asking for byte ranges, so every response advertises
+``Accept-Ranges: bytes`` and a single ``Range: bytes=...`` gets a 206. The
+bytes go out one of three ways, per SERMON_MEDIA_OFFLOAD:
+
+- ``x-accel``: an empty response with X-Accel-Redirect to
+  SERMON_ACCEL_PREFIX + the file name; nginx sends the file, ranges included.
+- ``x-sendfile``: X-Sendfile with the absolute path, for Apache/lighttpd.
+- otherwise a FileResponse. A whole file is handed to the server's
+  ``wsgi.file_wrapper`` (sendfile where the server has it); a range is read
+  from its offset in blocks, so no file is ever held in memory.
+
+Storage without local paths (S3 and the like) gets a redirect to the
+storage URL, whose server answers ranges itself.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+	pass
+
+
+def parse_range(header: str, size: int):
+	"""(start, end), inclusive, for a single byte range; None to send the whole file.
+
+	Malformed and multi-range headers are ignored, as RFC 9110 allows.
+	"""
+	match = RANGE_RE.match(header.strip()) if header else None
+	if not match or match.groups() == ("", ""):
+		return None
+	first, last = match.groups()
+	if not first:
+		# Suffix range: the last N bytes
+		if int(last) == 0 or size == 0:
+			raise RangeNotSatisfiable()
+		return max(size - int(last), 0), size - 1
+	start = int(first)
+	if last and int(last) < start:
+		return None
+	if start >= size:
+		raise RangeNotSatisfiable()
+	return start, min(int(last), size - 1) if last else size - 1
+
+
+class _RangeFile:
+	"""Read-only view of ``length`` bytes of an open file from ``start``.
+
+	It has no fileno(), so servers do not sendfile() past the end of the
+	range; they read it in FileResponse.block_size pieces instead.
+	"""
+
+	def __init__(self, fh, start: int, length: int):
+		fh.seek(start)
+		self.fh = fh
+		self.remaining = length
+
+	def read(self, size: int = -1) -> bytes:
+		if self.remaining <= 0:
+			return b""
+		size = self.remaining if size < 0 else min(size, self.remaining)
+		data = self.fh.read(size)
+		self.remaining -= len(data)
+		return data
+
+	def close(self) -> None:
+		self.fh.close()
+
+
+def serve(request, field, content_type: str, version: str = "") -> HttpResponse:
+	"""Send the file in ``field`` (a FieldFile), honouring Range and conditional headers.
+
+	``version`` is folded into the ETag, so a change to the owning row (such
+	as unpublishing) invalidates cached copies as a new file would.
+	"""
+	storage = field.storage
+	try:
+		path = storage.path(field.name)
+	except NotImplementedError:
+		return HttpResponseRedirect(storage.url(field.name))
+
+	offload = settings.SERMON_MEDIA_OFFLOAD
+	if offload == "x-accel":
+		response = HttpResponse(content_type=content_type)
+		response["X-Accel-Redirect"] = settings.SERMON_ACCEL_PREFIX.rstrip("/") + "/" + quote(field.name)
+		return response
+	if offload == "x-sendfile":
+		response = HttpResponse(content_type=content_type)
+		response["X-Sendfile"] = path
+		return response
+
+	try:
+		stat = os.stat(path)
+	except FileNotFoundError:
+		return HttpResponse(status=404)
+	size = stat.st_size
+	etag = f'"{size:x}-{int(stat.st_mtime):x}{"-" + version if version else ""}"'
+	last_modified = http_date(stat.st_mtime)
+	response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+	if response is not None:
+		return response
+
+	byte_range = None
+	if_range = request.headers.get("If-Range")
+	# A stale If-Range means the client's partial copy is of another file: send it all
+	if "Range" in request.headers and if_range in (None, etag, last_modified):
+		try:
+			byte_range = parse_range(request.headers["Range"], size)
+		except RangeNotSatisfiable:
+			response = HttpResponse(status=416)
+			response["Content-Range"] = f"bytes */{size}"
+			return response
+
+	fh = open(path, "rb")
+	if byte_range is None:
+		response = FileResponse(fh, content_type=content_type)
+	else:
+		start, end = byte_range
+		response = FileResponse(_RangeFile(fh, start, end - start + 1), content_type=content_type, status=206)
+		response["Content-Length"] = end - start + 1
+		response["Content-Range"] = f"bytes {start}-{end}/{size}"
+	response["Accept-Ranges"] = "bytes"
+	response["ETag"] = etag
+	response["Last-Modified"] = last_modified
+	return response
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:54
+
+import django.db.models.deletion
+import sermons.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sermon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(blank=True, max_length=220, unique=True)),
+                ('preacher', models.CharField(max_length=120)),
+                ('scripture', models.CharField(blank=True, help_text='e.g. John 3:1-21', max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('preached_on', models.DateField()),
+                ('media', models.FileField(blank=True, max_length=255, upload_to=sermons.models.sermon_media_upload_to)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('duration_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('is_published', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sermons', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-preached_on', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SermonUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.PositiveBigIntegerField()),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sermon_uploads', to=settings.AUTH_USER_MODEL)),
+                ('sermon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='sermons.sermon')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='sermon',
+            index=models.Index(fields=['is_published', '-preached_on'], name='sermon_published_idx'),
+        ),
+    ]
@@ -1,3 +1,84 @@
+import os
+import uuid
+
+from django.conf import settings
 from django.db import models
+from django.contrib.auth.models import User
+from django.utils.text import slugify
+
+
+def sermon_media_upload_to(instance, filename: str) -> str:
+	ext = os.path.splitext(filename)[1].lower()
+	return f"sermons/{instance.preached_on:%Y}/{instance.slug}{ext}"
+
+
+class Sermon(models.Model):
+	"""A preached sermon with its audio or video recording."""
+
+	title = models.CharField(max_length=200)
+	slug = models.SlugField(max_length=220, unique=True, blank=True)
+	preacher = models.CharField(max_length=120)
+	scripture = models.CharField(max_length=200, blank=True, help_text="e.g. John 3:1-21")
+	description = models.TextField(blank=True)
+	preached_on = models.DateField()
+
+	media = models.FileField(upload_to=sermon_media_upload_to, blank=True, max_length=255)
+	content_type = models.CharField(max_length=100, blank=True)
+	size = models.PositiveBigIntegerField(default=0)
+	duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+
+	is_published = models.BooleanField(default=False)
+	created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="sermons")
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		ordering = ["-preached_on", "-id"]
+		indexes = [
+			models.Index(fields=["is_published", "-preached_on"], name="sermon_published_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.title} ({self.preacher}, {self.preached_on})"
+
+	@property
+	def is_video(self) -> bool:
+		return self.content_type.startswith("video/")
+
+	def save(self, *args, **kwargs):
+		if not self.slug:
+			base = slugify(self.title)[:50]
+			slug_candidate = base
+			i = 2
+			while Sermon.objects.filter(slug=slug_candidate).exclude(pk=self.pk).exists():
+				slug_candidate = f"{base}-{i}"
+				i += 1
+			self.slug = slug_candidate
+		super().save(*args, **kwargs)
+
+
+class SermonUpload(models.Model):
+	"""A resumable upload in progress.
+
+	Chunks are appended to ``part_path`` at ``received``; the client asks
+	for ``received`` after a dropped connection and carries on from there.
+	When the last byte arrives the file is moved into storage as the
+	sermon's media and this row is deleted.
+	"""
+
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	sermon = models.ForeignKey(Sermon, on_delete=models.CASCADE, related_name="uploads")
+	filename = models.CharField(max_length=255)
+	content_type = models.CharField(max_length=100)
+	size = models.PositiveBigIntegerField()
+	received = models.PositiveBigIntegerField(default=0)
+	created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="sermon_uploads")
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self) -> str:
+		return f"{self.filename} ({self.received}/{self.size})"
 
-# Create your models here.
+	@property
+	def part_path(self) -> str:
+		return os.path.join(settings.SERMON_UPLOAD_DIR, f"{self.pk}.part")
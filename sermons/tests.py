@@ -1,3 +1,135 @@
-from django.test import TestCase
+import datetime
+import io
+import os
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+
+from core.testing import TemporaryMediaMixin
+
+from .media import RangeNotSatisfiable, parse_range
+from .models import Sermon, SermonUpload
+from .uploads import append_chunk, finish_upload, start_upload
+
+AUDIO = bytes(range(256)) * 40  # 10 KiB
+
+
+class CopyingStorage(FileSystemStorage):
+	"""Local storage that copies like a remote backend would, instead of moving temporary files."""
+
+	def _save(self, name, content):
+		return super()._save(name, ContentFile(content.read()))
+
+
+class SermonMediaTests(TemporaryMediaMixin, TestCase):
+	def setUp(self):
+		super().setUp()
+		cache.clear()
+		self.enterContext(self.settings(SERMON_UPLOAD_DIR=self.tmp / "partial", SERMON_UPLOAD_CHUNK_SIZE=4096))
+		self.sermon = Sermon.objects.create(
+			title="The Sower", preacher="Rev. Mensah", preached_on=datetime.date(2025, 5, 4), is_published=True,
+		)
+		self.sermon.media.save("sower.mp3", ContentFile(AUDIO), save=False)
+		self.sermon.content_type, self.sermon.size = "audio/mpeg", len(AUDIO)
+		self.sermon.save()
+		self.url = f"/sermons/{self.sermon.slug}/media/"
+
+	def test_parse_range(self):
+		self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+		self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+		self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+		self.assertEqual(parse_range("bytes=500-5000", 1000), (500, 999))
+		self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+		self.assertIsNone(parse_range("bytes=9-3", 1000))
+		with self.assertRaises(RangeNotSatisfiable):
+			parse_range("bytes=1000-", 1000)
+
+	def test_byte_ranges(self):
+		response = self.client.get(self.url, headers={"Range": "bytes=100-199"})
+		self.assertEqual(response.status_code, 206)
+		self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(AUDIO)}")
+		self.assertEqual(response["Content-Length"], "100")
+		self.assertEqual(b"".join(response.streaming_content), AUDIO[100:200])
+
+		whole = self.client.get(self.url)
+		self.assertEqual((whole.status_code, whole["Accept-Ranges"]), (200, "bytes"))
+		self.assertEqual(b"".join(whole.streaming_content), AUDIO)
+		self.assertEqual(self.client.get(self.url, headers={"If-None-Match": whole["ETag"]}).status_code, 304)
+
+		stale = self.client.get(self.url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+		self.assertEqual(stale.status_code, 200)
+		stale.close()
+		unsatisfiable = self.client.get(self.url, headers={"Range": f"bytes={len(AUDIO)}-"})
+		self.assertEqual((unsatisfiable.status_code, unsatisfiable["Content-Range"]), (416, f"bytes */{len(AUDIO)}"))
+
+	def test_unpublishing_invalidates_cached_media(self):
+		response = self.client.get(self.url)
+		response.close()
+		self.assertIn(f"max-age={settings.SERMON_MEDIA_MAX_AGE}", response["Cache-Control"])
+		Sermon.objects.filter(pk=self.sermon.pk).update(updated_at=self.sermon.updated_at + datetime.timedelta(seconds=5))
+		revalidated = self.client.get(self.url, headers={"If-None-Match": response["ETag"]})
+		revalidated.close()
+		self.assertEqual(revalidated.status_code, 200)
+		self.sermon.refresh_from_db()
+		self.sermon.is_published = False
+		self.sermon.save()
+		self.assertEqual(self.client.get(self.url).status_code, 404)
+
+	@override_settings(SERMON_MEDIA_OFFLOAD="x-accel")
+	def test_accel_offload(self):
+		response = self.client.get(self.url)
+		self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.sermon.media.name}")
+		self.assertEqual(response.content, b"")
+
+	def test_resumable_upload(self):
+		admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+		self.client.force_login(admin)
+		recording = os.urandom(10000)
+		started = self.client.post(f"/sermons/{self.sermon.slug}/upload/start/", {
+			"filename": "sower.m4a", "size": len(recording), "content_type": "audio/mp4",
+		})
+		self.assertEqual(started.status_code, 201)
+		url = started["Location"]
+
+		def patch(offset, data):
+			return self.client.patch(url, data, content_type="application/offset+octet-stream", headers={"Upload-Offset": str(offset)})
+
+		self.assertEqual(patch(0, recording[:4096]).json()["offset"], 4096)
+		# A retried chunk the server already has is refused with the real offset
+		conflict = patch(0, recording[:4096])
+		self.assertEqual((conflict.status_code, conflict.json()["offset"]), (409, 4096))
+		self.assertEqual(patch(4096, recording[4096:8200]).status_code, 413)
+		self.assertEqual(self.client.get(url).json()["offset"], 4096)
+		patch(4096, recording[4096:8192])
+		self.assertTrue(patch(8192, recording[8192:]).json()["complete"])
+
+		self.sermon.refresh_from_db()
+		self.assertEqual((self.sermon.content_type, self.sermon.size), ("audio/mp4", len(recording)))
+		with self.sermon.media.open("rb") as fh:
+			self.assertEqual(fh.read(), recording)
+		self.assertFalse(SermonUpload.objects.exists())
+		self.assertEqual(os.listdir(self.tmp / "partial"), [])
+
+	def test_part_file_is_removed_when_storage_copies(self):
+		storages = {**settings.STORAGES, "default": {"BACKEND": "sermons.tests.CopyingStorage"}}
+		with self.settings(STORAGES=storages):
+			upload = start_upload(self.sermon, "copy.mp3", "audio/mpeg", len(AUDIO), user=None)
+			part_path = upload.part_path
+			append_chunk(upload, 0, io.BytesIO(AUDIO), len(AUDIO))
+			sermon = finish_upload(upload)
+			with sermon.media.open("rb") as fh:
+				self.assertEqual(fh.read(), AUDIO)
+		self.assertFalse(os.path.exists(part_path))
+
+	def test_podcast_feed_is_cached_until_a_sermon_changes(self):
+		feed = self.client.get("/sermons/podcast.xml")
+		self.assertContains(feed, f'<enclosure length="{len(AUDIO)}" type="audio/mpeg"')
+		with self.assertNumQueries(0):
+			self.assertEqual(self.client.get("/sermons/podcast.xml", headers={"If-None-Match": feed["ETag"]}).status_code, 304)
+		self.sermon.title = "The Parable of the Sower"
+		self.sermon.save()
+		self.assertNotEqual(self.client.get("/sermons/podcast.xml")["ETag"], feed["ETag"])
@@ -0,0 +1,100 @@
+"""Resumable chunked uploads for sermon media.
+
+1. POST filename, size and content type: a SermonUpload row and an empty
+   part file are created.
+2. PATCH each chunk with an ``Upload-Offset`` header. The body is copied
+   from the request stream to the part file at that offset in small
+   blocks, so neither a chunk nor the file is held in memory.
+3. After a dropped connection, GET the upload for its offset and resume.
+   Bytes that arrived before the drop are kept.
+
+When the last byte is in, the part file is moved into storage (a rename
+on the same filesystem) and becomes the sermon's media.
+"""
+import os
+
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Sermon, SermonUpload
+
+COPY_BLOCK = 64 * 1024
+
+
+class OffsetMismatch(Exception):
+	"""The client's offset is not where the upload stands; ``offset`` is."""
+
+	def __init__(self, offset: int):
+		super().__init__(offset)
+		self.offset = offset
+
+
+class _PartFile(File):
+	# FileSystemStorage moves a file that has a temporary path instead of copying it
+	def temporary_file_path(self) -> str:
+		return self.name
+
+
+def start_upload(sermon: Sermon, filename: str, content_type: str, size: int, user) -> SermonUpload:
+	upload = SermonUpload.objects.create(
+		sermon=sermon, filename=os.path.basename(filename), content_type=content_type, size=size, created_by=user,
+	)
+	os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+	open(upload.part_path, "wb").close()
+	return upload
+
+
+def append_chunk(upload: SermonUpload, offset: int, stream, length: int) -> int:
+	"""Copy ``length`` bytes from ``stream`` to the part file at ``offset``; returns the new offset."""
+	if offset != upload.received:
+		raise OffsetMismatch(upload.received)
+	if offset + length > upload.size:
+		raise ValueError("Chunk runs past the declared size.")
+	written = 0
+	with open(upload.part_path, "r+b") as fh:
+		fh.seek(offset)
+		try:
+			while written < length:
+				block = stream.read(min(COPY_BLOCK, length - written))
+				if not block:
+					break
+				fh.write(block)
+				written += len(block)
+		except OSError:
+			pass  # Client went away; keep what arrived and let it resume
+	# Only one writer can move the offset on from where it stood
+	moved = SermonUpload.objects.filter(pk=upload.pk, received=offset).update(
+		received=offset + written, updated_at=timezone.now(),
+	)
+	if not moved:
+		upload.refresh_from_db(fields=["received"])
+		raise OffsetMismatch(upload.received)
+	upload.received = offset + written
+	return upload.received
+
+
+@transaction.atomic
+def finish_upload(upload: SermonUpload) -> Sermon:
+	"""Make the completed part file the sermon's media, replacing any earlier file."""
+	sermon = upload.sermon
+	previous = sermon.media.name
+	# Read before delete(), which clears the pk the path is built from
+	part_path = upload.part_path
+	with open(part_path, "rb") as fh:
+		sermon.media.save(upload.filename, _PartFile(fh, name=part_path), save=False)
+	sermon.content_type = upload.content_type
+	sermon.size = upload.size
+	sermon.save()
+	upload.delete()
+	if os.path.exists(part_path):
+		os.remove(part_path)  # Copied rather than moved (another filesystem or storage)
+	if previous and previous != sermon.media.name:
+		transaction.on_commit(lambda: sermon.media.storage.delete(previous))
+	return sermon
+
+
+def discard_upload(upload: SermonUpload) -> None:
+	if os.path.exists(upload.part_path):
+		os.remove(upload.part_path)
+	upload.delete()
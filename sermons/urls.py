@@ -0,0 +1,14 @@
+from django.urls import path
+from . import views
+
+app_name = "sermons"
+
+urlpatterns = [
+    path("", views.sermon_list, name="list"),
+    path("podcast.xml", views.podcast, name="podcast"),
+    path("<slug:slug>/", views.sermon_detail, name="detail"),
+    path("<slug:slug>/media/", views.media, name="media"),
+    path("<slug:slug>/upload/", views.upload_page, name="upload"),
+    path("<slug:slug>/upload/start/", views.upload_start, name="upload_start"),
+    path("uploads/<uuid:upload_id>/", views.upload_chunk, name="upload_chunk"),
+]
@@ -1,3 +1,133 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_http_methods, require_POST
 
-# Create your views here.
+from core.queries import query_budget
+from groups.views import is_admin_user
+from . import feeds, media as sermon_media
+from .forms import UploadStartForm
+from .models import Sermon, SermonUpload
+from .uploads import OffsetMismatch, append_chunk, finish_upload, start_upload
+
+PAGE_SIZE = 20
+
+
+def _visible_sermon_or_404(request, slug: str) -> Sermon:
+	sermon = get_object_or_404(Sermon, slug=slug)
+	if not sermon.is_published and not is_admin_user(request.user):
+		raise Http404()
+	return sermon
+
+
+def _upload_state(upload: SermonUpload) -> JsonResponse:
+	response = JsonResponse({"id": str(upload.pk), "offset": upload.received, "size": upload.size})
+	response["Upload-Offset"] = upload.received
+	response["Cache-Control"] = "no-store"
+	return response
+
+
+@query_budget(6)
+def sermon_list(request):
+	sermons = Sermon.objects.all() if is_admin_user(request.user) else Sermon.objects.filter(is_published=True)
+	page = Paginator(sermons.order_by("-preached_on", "-id"), PAGE_SIZE).get_page(request.GET.get("page"))
+	return render(request, "sermons/list.html", {"page": page, "sermons": page.object_list})
+
+
+@query_budget(6)
+def sermon_detail(request, slug: str):
+	sermon = _visible_sermon_or_404(request, slug)
+	return render(request, "sermons/detail.html", {"sermon": sermon, "is_admin": is_admin_user(request.user)})
+
+
+def media(request, slug: str):
+	"""The recording, with byte ranges so players can seek (see sermons.media)."""
+	sermon = _visible_sermon_or_404(request, slug)
+	if not sermon.media:
+		raise Http404()
+	response = sermon_media.serve(
+		request, sermon.media, sermon.content_type or "application/octet-stream",
+		version=f"{int(sermon.updated_at.timestamp()):x}",
+	)
+	if sermon.is_published:
+		# Short, so unpublishing or replacing the file reaches shared caches
+		# soon; after that a revalidation is a 304 on the ETag
+		patch_cache_control(response, public=True, max_age=settings.SERMON_MEDIA_MAX_AGE)
+	else:
+		patch_cache_control(response, private=True, no_cache=True)
+	return response
+
+
+def podcast(request):
+	base_url = request.build_absolute_uri("/").rstrip("/")
+	body, etag = feeds.podcast(base_url)
+	response = get_conditional_response(request, etag=etag)
+	if response is None:
+		response = HttpResponse(body, content_type="application/rss+xml; charset=utf-8")
+	response["ETag"] = etag
+	patch_cache_control(response, public=True, max_age=settings.PODCAST_CACHE_SECONDS)
+	return response
+
+
+@login_required
+@user_passes_test(is_admin_user)
+def upload_page(request, slug: str):
+	sermon = get_object_or_404(Sermon, slug=slug)
+	return render(request, "sermons/upload.html", {
+		"sermon": sermon,
+		"chunk_size": settings.SERMON_UPLOAD_CHUNK_SIZE,
+		"max_size": settings.SERMON_UPLOAD_MAX_SIZE,
+	})
+
+
+@require_POST
+@login_required
+@user_passes_test(is_admin_user)
+def upload_start(request, slug: str):
+	sermon = get_object_or_404(Sermon, slug=slug)
+	form = UploadStartForm(request.POST)
+	if not form.is_valid():
+		return JsonResponse({"errors": form.errors}, status=400)
+	upload = start_upload(sermon, user=request.user, **form.cleaned_data)
+	response = _upload_state(upload)
+	response.status_code = 201
+	response["Location"] = reverse("sermons:upload_chunk", args=[upload.pk])
+	return response
+
+
+@require_http_methods(["GET", "HEAD", "PATCH"])
+@login_required
+@user_passes_test(is_admin_user)
+def upload_chunk(request, upload_id):
+	"""GET: where the upload stands. PATCH: append the body at ``Upload-Offset``.
+
+	The body is read straight from the request stream (never request.body,
+	which would buffer it), SERMON_UPLOAD_CHUNK_SIZE bytes at most per call.
+	"""
+	upload = get_object_or_404(SermonUpload.objects.select_related("sermon"), pk=upload_id)
+	if request.method != "PATCH":
+		return _upload_state(upload)
+	try:
+		offset = int(request.headers["Upload-Offset"])
+		length = int(request.headers["Content-Length"])
+	except (KeyError, ValueError):
+		return JsonResponse({"error": "Upload-Offset and Content-Length headers are required."}, status=400)
+	if length > settings.SERMON_UPLOAD_CHUNK_SIZE:
+		return JsonResponse({"error": f"Chunks are limited to {settings.SERMON_UPLOAD_CHUNK_SIZE} bytes."}, status=413)
+	try:
+		append_chunk(upload, offset, request, length)
+	except OffsetMismatch as exc:
+		upload.received = exc.offset
+		response = _upload_state(upload)
+		response.status_code = 409
+		return response
+	except ValueError as exc:
+		return JsonResponse({"error": str(exc)}, status=400)
+	if upload.received < upload.size:
+		return _upload_state(upload)
+	sermon = finish_upload(upload)
+	return JsonResponse({"offset": upload.size, "size": upload.size, "complete": True, "media_url": reverse("sermons:media", args=[sermon.slug])})